@@ -0,0 +1,34 @@
+"""
+Benchmark GenericBillParser over a corpus of synthetic bill texts.
+
+Usage:
+    python -m benchmarks.bench_bill_parser --bills 5000 [--single-pass]
+"""
+
+import argparse
+import time
+
+from benchmarks.corpus import load_corpus
+from src.utils.convert_data import GenericBillParser
+
+
+def run(bills: int, single_pass: bool = False) -> float:
+    """Parse ``bills`` texts, one parser per bill as production does."""
+    corpus = load_corpus(bills)
+    start = time.perf_counter()
+    for text in corpus:
+        GenericBillParser(single_pass=single_pass).parse(text)
+    elapsed = time.perf_counter() - start
+    print(
+        f"parsed {bills} bills in {elapsed:.3f}s "
+        f"({bills / elapsed:.1f} bills/s, {elapsed / bills * 1000:.3f} ms/bill)"
+    )
+    return elapsed
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--bills", type=int, default=5000)
+    arg_parser.add_argument("--single-pass", action="store_true")
+    args = arg_parser.parse_args()
+    run(args.bills, args.single_pass)
@@ -0,0 +1,134 @@
+"""
+Synthetic bill corpus shared by the benchmarks.
+
+Texts come from the anonymized fixture bills, one per provider format (gas,
+electricity, water, FTTH). PDFs are generated from the same texts with a
+minimal single-font writer, so no PDF tooling is needed to build them.
+"""
+
+import random
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "bills"
+
+# A4 in points, with the text block inside a 40pt margin
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842
+MARGIN = 40
+FONT_SIZE = 9
+LEADING = 11
+LINES_PER_PAGE = (PAGE_HEIGHT - 2 * MARGIN) // LEADING
+
+
+def load_templates() -> Dict[str, str]:
+    """Return the fixture bill text of every provider format, by provider."""
+    return {path.stem: path.read_text() for path in sorted(FIXTURES_DIR.glob("*.txt"))}
+
+
+def load_provider_corpus(size: int, seed: int = 0) -> List[Tuple[str, str]]:
+    """
+    Build ``size`` (provider, text) pairs cycling through the provider formats.
+
+    Years are randomized so every text is distinct while keeping the layout
+    the patterns target.
+    """
+    templates = list(load_templates().items())
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(size):
+        provider, text = templates[i % len(templates)]
+        corpus.append((provider, text.replace("2024", str(rng.randint(2015, 2030)))))
+    return corpus
+
+
+def load_corpus(size: int, seed: int = 0) -> List[str]:
+    """Build a corpus of ``size`` bill texts from the fixture templates."""
+    return [text for _, text in load_provider_corpus(size, seed)]
+
+
+def _escape(line: str) -> bytes:
+    encoded = line.encode("cp1252", errors="replace")
+    return encoded.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def render_pdf(text: str) -> bytes:
+    """
+    Render a bill text as a PDF with one Helvetica text line per text line.
+
+    Args:
+        text: Bill text; characters outside Windows-1252 become "?"
+
+    Returns:
+        The PDF document
+    """
+    lines = text.splitlines()
+    pages = [
+        lines[i : i + LINES_PER_PAGE] for i in range(0, len(lines), LINES_PER_PAGE)
+    ] or [[]]
+
+    # Objects 1-3 are the catalog, page tree and font; then a page and its
+    # content stream per page
+    objects: List[bytes] = [
+        b"",
+        b"",
+        b"<< /Type /Font /Subtype /Type1 "
+        b"/BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    page_ids = []
+    for page_lines in pages:
+        stream = b"BT /F1 %d Tf %d TL %d %d Td\n" % (
+            FONT_SIZE,
+            LEADING,
+            MARGIN,
+            PAGE_HEIGHT - MARGIN,
+        )
+        stream += b"".join(b"(" + _escape(line) + b") Tj T*\n" for line in page_lines)
+        stream += b"ET"
+        content_id = len(objects) + 2
+        page_ids.append(len(objects) + 1)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % (PAGE_WIDTH, PAGE_HEIGHT, content_id)
+        )
+        objects.append(
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        )
+
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % page_id for page_id in page_ids),
+        len(page_ids),
+    )
+
+    document = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(document))
+        document += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(document)
+    document += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    document += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    document += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return bytes(document)
+
+
+def build_pdf_corpus(
+    directory: Path, size: int, seed: int = 0
+) -> List[Tuple[str, Path]]:
+    """
+    Write ``size`` bill PDFs to ``directory``.
+
+    Returns:
+        (provider, path) pairs of the written PDFs
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    corpus = []
+    for i, (provider, text) in enumerate(load_provider_corpus(size, seed)):
+        path = directory / f"{i:05d}_{provider}.pdf"
+        path.write_bytes(render_pdf(text))
+        corpus.append((provider, path))
+    return corpus
@@ -0,0 +1,243 @@
+"""
+End-to-end scrape benchmark against a local portal and a fake backend.
+
+Runs N ``WebScrapService.search`` jobs, a few at a time, against
+``PortalServer`` with ``BACKEND_URL`` pointing at ``FakeBackend``, once per
+browser. It reports jobs/minute, p50/p99 job latency and the time spent per
+scraping stage and sequence action. Nothing leaves the machine.
+
+Chrome jobs use the portal's login form. Firefox jobs take the service's
+captcha path, which is how the service picks Firefox, with the stub solver.
+Both browsers are launched locally: leave ENDPOINT_PROXY empty and install
+them with ``playwright install chromium firefox``, or point
+CHROME_EXECUTABLE_PATH at a system Chromium. Without Redis the site limiter
+lets every job through.
+
+Usage:
+    python -m benchmarks.e2e_scrape [--jobs 20] [--concurrency 4] [--bills 6]
+        [--browsers chrome,firefox]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from prometheus_client import REGISTRY
+
+from benchmarks.fixture_servers import FakeBackend, PortalServer
+from benchmarks.suite import percentile
+from src.core.config import Config
+from src.core.cpu_executor import set_cpu_executor
+from src.core.redis_client import close_redis
+from src.services.browser_pool import close_browser_pool
+from src.services.captcha_solver import close_captcha_pool
+from src.services.http_client import close_shared_client
+from src.services.web_scrap_service import WebScrapService
+
+SERVICE_ID = 9001
+
+# Browsers of the run matrix
+BROWSERS = ("chrome", "firefox")
+
+# Histograms read before and after the run, with the label naming the step
+STAGE_HISTOGRAMS = (
+    ("scrap_stage_seconds", "stage"),
+    ("scrap_action_seconds", "element_type"),
+)
+
+
+def _histogram_totals() -> Dict[Tuple[str, str], List[float]]:
+    """Return (histogram, step) -> [count, sum] of this benchmark's service."""
+    totals: Dict[Tuple[str, str], List[float]] = {}
+    for metric in REGISTRY.collect():
+        for name, step_label in STAGE_HISTOGRAMS:
+            if metric.name != name:
+                continue
+            for sample in metric.samples:
+                if sample.labels.get("service_id") != str(SERVICE_ID):
+                    continue
+                key = (name, sample.labels[step_label])
+                entry = totals.setdefault(key, [0.0, 0.0])
+                if sample.name.endswith("_count"):
+                    entry[0] += sample.value
+                elif sample.name.endswith("_sum"):
+                    entry[1] += sample.value
+    return totals
+
+
+def job_data(portal_url: str, index: int, browser: str = "chrome") -> Dict[str, Any]:
+    """Input of ``WebScrapService.search`` for the ``index``-th customer."""
+    user_service_id = index + 1
+    return {
+        "browser": browser,
+        "service": {
+            "id": SERVICE_ID,
+            "scraping_config": PortalServer.scraping_config(portal_url, browser),
+        },
+        "user_service": {
+            "id": user_service_id,
+            "user_id": user_service_id,
+            "service_id": SERVICE_ID,
+            "customer_number": f"{user_service_id:08d}",
+            "created_at": "2024-01-01T00:00:00",
+            "updated_at": "2024-01-01T00:00:00",
+        },
+    }
+
+
+async def run_jobs(
+    portal_url: str, jobs: int, concurrency: int, browser: str = "chrome"
+) -> Tuple[List[float], List[str], float]:
+    """
+    Run the scrape jobs with at most ``concurrency`` at once.
+
+    Returns:
+        Latencies of successful jobs (s), errors of failed ones and the wall
+        time of the run (s)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    errors: List[str] = []
+
+    async def run_one(index: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                async with WebScrapService() as service:
+                    await service.search(job_data(portal_url, index, browser))
+                latencies.append(time.perf_counter() - started)
+            except Exception as e:
+                errors.append(str(e))
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(run_one(index) for index in range(jobs)))
+    finally:
+        await close_browser_pool()
+        await close_captcha_pool()
+        await close_shared_client()
+        await close_redis()
+    return latencies, errors, time.perf_counter() - started
+
+
+def run(
+    jobs: int,
+    concurrency: int,
+    bills: int,
+    portal_latency_ms: float = 0,
+    backend_latency_ms: float = 0,
+    browser: str = "chrome",
+) -> Dict[str, Any]:
+    """Start the fixture servers, run the jobs and summarize the run."""
+    portal = PortalServer(bills=bills, latency_ms=portal_latency_ms).start()
+    backend = FakeBackend(service_id=SERVICE_ID, latency_ms=backend_latency_ms).start()
+    Config.BACKEND_URL = backend.url
+    Config.ENDPOINT_PROXY = ""
+    Config.CAPTCHA_SOLVER = "stub"
+    before = _histogram_totals()
+
+    try:
+        latencies, errors, wall = asyncio.run(
+            run_jobs(portal.url, jobs, concurrency, browser)
+        )
+    finally:
+        set_cpu_executor(None)
+        portal.stop()
+        backend.stop()
+
+    stages = {}
+    for key, (count, total) in sorted(_histogram_totals().items()):
+        count -= before.get(key, [0.0, 0.0])[0]
+        total -= before.get(key, [0.0, 0.0])[1]
+        if count:
+            name, step = key
+            kind = "stage" if name == "scrap_stage_seconds" else "action"
+            stages[f"{kind}:{step}"] = {
+                "count": int(count),
+                "mean_ms": round(total / count * 1000, 1),
+                "total_s": round(total, 3),
+            }
+
+    return {
+        "browser": browser,
+        "jobs": jobs,
+        "concurrency": concurrency,
+        "bills_per_job": bills,
+        "succeeded": len(latencies),
+        "failed": len(errors),
+        "errors": sorted(set(errors))[:5],
+        "wall_s": round(wall, 3),
+        "jobs_per_minute": round(len(latencies) / wall * 60, 1) if wall else 0.0,
+        "p50_s": round(percentile(latencies, 50), 3),
+        "p99_s": round(percentile(latencies, 99), 3),
+        "portal_requests": portal.requests,
+        "backend_requests": backend.requests,
+        "bills_saved": sum(
+            len(data.get("bills_url", [])) for data in backend.scrapped_data.values()
+        ),
+        "stages": stages,
+    }
+
+
+def print_summary(summary: Dict[str, Any]) -> None:
+    print(
+        f"{summary['browser']}: "
+        f"{summary['succeeded']}/{summary['jobs']} jobs in {summary['wall_s']}s "
+        f"(concurrency {summary['concurrency']}): "
+        f"{summary['jobs_per_minute']} jobs/min, "
+        f"p50 {summary['p50_s']}s, p99 {summary['p99_s']}s, "
+        f"{summary['bills_saved']} bills saved"
+    )
+    for step, timing in summary["stages"].items():
+        print(
+            f"  {step:<28} {timing['count']:>6}x  mean {timing['mean_ms']:>8.1f} ms  "
+            f"total {timing['total_s']:>8.3f} s"
+        )
+    for error in summary["errors"]:
+        print(f"  error: {error}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--jobs", type=int, default=20)
+    arg_parser.add_argument("--concurrency", type=int, default=4)
+    arg_parser.add_argument("--bills", type=int, default=6)
+    arg_parser.add_argument("--portal-latency-ms", type=float, default=0)
+    arg_parser.add_argument("--backend-latency-ms", type=float, default=0)
+    arg_parser.add_argument(
+        "--browsers",
+        default=",".join(BROWSERS),
+        help="Comma separated browsers to run, out of " + ", ".join(BROWSERS),
+    )
+    arg_parser.add_argument(
+        "--json", type=Path, help="Write the summaries, per browser, to a file"
+    )
+    args = arg_parser.parse_args(argv)
+
+    browsers = [browser.strip() for browser in args.browsers.split(",") if browser]
+    unknown = set(browsers) - set(BROWSERS)
+    if unknown:
+        arg_parser.error(f"unknown browsers: {', '.join(sorted(unknown))}")
+
+    summaries = {}
+    for browser in browsers:
+        summaries[browser] = run(
+            args.jobs,
+            args.concurrency,
+            args.bills,
+            args.portal_latency_ms,
+            args.backend_latency_ms,
+            browser,
+        )
+        print_summary(summaries[browser])
+    if args.json:
+        args.json.write_text(json.dumps(summaries, indent=2) + "\n")
+    return 1 if any(summary["failed"] for summary in summaries.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
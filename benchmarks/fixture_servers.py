@@ -0,0 +1,280 @@
+"""
+Local stand-ins for a utility portal and the main backend.
+
+``PortalServer`` serves the pages in ``benchmarks/portal`` (search form, bill
+table with per-bill forms and download buttons) and renders the bill PDFs
+from the synthetic corpus. ``FakeBackend`` implements the ``BACKEND_URL``
+endpoints used by ``MainServiceClient`` with an in-memory store. Both run
+on a background thread and need no network access.
+"""
+
+import json
+import re
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.corpus import load_provider_corpus, render_pdf
+
+PORTAL_DIR = Path(__file__).resolve().parent / "portal"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Request handler delegating to the owning server, without access logs."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(
+        self,
+        status: int,
+        body: bytes = b"",
+        content_type: str = "text/plain",
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _dispatch(self) -> None:
+        self.body = self._read_body()
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.server.requests += 1
+        self._send(*self.server.respond(self.command, self.path, self))
+
+    do_GET = do_POST = do_PATCH = _dispatch
+
+
+class _FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency_ms: float = 0, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _Handler)
+        self.latency = latency_ms / 1000
+        self.requests = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def respond(self, method: str, path: str, handler: _Handler) -> Tuple:
+        raise NotImplementedError
+
+    def start(self) -> "_FixtureServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class PortalServer(_FixtureServer):
+    """
+    Utility portal serving a search form and a page of downloadable bills.
+
+    Args:
+        bills: Bills listed per customer, half as table forms and half as
+            download buttons
+        latency_ms: Delay added to every response
+    """
+
+    def __init__(self, bills: int = 6, latency_ms: float = 0, **kwargs):
+        super().__init__(latency_ms, **kwargs)
+        self.bills = bills
+        self.pdfs = [render_pdf(text) for _, text in load_provider_corpus(bills)]
+
+    def _bills_page(self) -> bytes:
+        forms = (self.bills + 1) // 2
+        rows = "\n".join(
+            f'<tr><td class="factura"><form id="factura-{n}" '
+            f'action="/descargar/{n}" method="post">'
+            f'<button type="submit">Factura {n}</button></form></td></tr>'
+            for n in range(forms)
+        )
+        buttons = "\n".join(
+            f'<a class="boton-pdf" href="/descargar/{n}">Descargar factura {n}</a>'
+            for n in range(forms, self.bills)
+        )
+        page = (PORTAL_DIR / "facturas.html").read_text()
+        return page.replace("{rows}", rows).replace("{buttons}", buttons).encode()
+
+    def respond(self, method: str, path: str, handler: _Handler) -> Tuple:
+        path = path.split("?", 1)[0]
+        if path in ("/", "/index.html"):
+            return HTTPStatus.OK, (PORTAL_DIR / "index.html").read_bytes(), "text/html"
+        if path == "/facturas.html":
+            return HTTPStatus.OK, self._bills_page(), "text/html"
+
+        match = re.fullmatch(r"/descargar/(\d+)", path)
+        if match and int(match.group(1)) < self.bills:
+            n = int(match.group(1))
+            return (
+                HTTPStatus.OK,
+                self.pdfs[n],
+                "application/pdf",
+                {"Content-Disposition": f'attachment; filename="factura-{n}.pdf"'},
+            )
+
+        # Assets the resource profiles may block
+        if path.startswith("/static/"):
+            return HTTPStatus.OK, b"", "application/octet-stream"
+        return HTTPStatus.NOT_FOUND, b"not found"
+
+    @staticmethod
+    def scraping_config(url: str, browser: str = "chrome") -> Dict[str, Any]:
+        """
+        Scraping config of a service pointing at the portal at ``url``.
+
+        The service runs Firefox for portals with a captcha sequence, so the
+        "firefox" config logs in through the portal's captcha widget instead of
+        the login steps. Solve it with ``CAPTCHA_SOLVER=stub``.
+        """
+        config = {
+            "url": f"{url}/index.html",
+            "captcha": False,
+            "rate_limit": 0,
+            "max_concurrency": 1000,
+            "resource_profile": "lean",
+            "sequence": [
+                {
+                    "element_type": "input",
+                    "component_type": "id",
+                    "content": "cliente",
+                    "login": True,
+                },
+                {
+                    "element_type": "button",
+                    "component_type": "id",
+                    "content": "buscar",
+                    "login": True,
+                    "wait": {"for": "load", "timeout": 10000},
+                },
+                {
+                    "element_type": "p",
+                    "component_type": "class",
+                    "content": "estado-deuda",
+                    "debt": True,
+                    "no_debt_text": "no registra deuda",
+                },
+                {
+                    "element_type": "td",
+                    "component_type": "class",
+                    "content": "factura",
+                    "query": True,
+                    "form": True,
+                },
+                {
+                    "element_type": "buttons",
+                    "component_type": "class",
+                    "content": "boton-pdf",
+                },
+            ],
+        }
+        if browser == "firefox":
+            config["captcha"] = True
+            config["captcha_sequence"] = [
+                {"component_type": "id", "content": "cliente"},
+                {"content": ".g-recaptcha"},
+                {"captcha_button_content": "#buscar"},
+            ]
+            config["sequence"] = [
+                action for action in config["sequence"] if not action.get("login")
+            ]
+        return config
+
+
+class FakeBackend(_FixtureServer):
+    """
+    In-memory main backend for the endpoints used by ``MainServiceClient``.
+
+    Any user service ID exists and belongs to ``service_id``; scrapped data
+    is created on the first save and appended to or replaced afterwards.
+    Appends answer 409 when ``expected_count`` does not match the stored
+    bills.
+    """
+
+    def __init__(self, service_id: int = 1, latency_ms: float = 0, **kwargs):
+        super().__init__(latency_ms, **kwargs)
+        self.service_id = service_id
+        self.scrapped_data: Dict[int, Dict[str, Any]] = {}
+        self.calls: List[Tuple[str, str]] = []
+        self._lock = threading.Lock()
+
+    def _user_service(self, user_service_id: int) -> Dict[str, Any]:
+        return {
+            "id": user_service_id,
+            "user_id": user_service_id,
+            "service_id": self.service_id,
+            "customer_number": f"{user_service_id:08d}",
+            "created_at": "2024-01-01T00:00:00",
+            "updated_at": "2024-01-01T00:00:00",
+        }
+
+    def _by_id(self, scrapped_data_id: int) -> Optional[Dict[str, Any]]:
+        for data in self.scrapped_data.values():
+            if data["id"] == scrapped_data_id:
+                return data
+        return None
+
+    def _json(self, handler: _Handler) -> Dict[str, Any]:
+        return json.loads(handler.body or b"{}")
+
+    def respond(self, method: str, path: str, handler: _Handler) -> Tuple:
+        path = path.split("?", 1)[0].rstrip("/")
+        self.calls.append((method, path))
+        with self._lock:
+            status, payload = self._respond(method, path, handler)
+        return status, json.dumps(payload).encode(), "application/json"
+
+    def _respond(self, method: str, path: str, handler: _Handler) -> Tuple:
+        if match := re.fullmatch(r"/user-service/(\d+)", path):
+            return HTTPStatus.OK, self._user_service(int(match.group(1)))
+        if match := re.fullmatch(r"/scrapped-data/user-service/(\d+)", path):
+            data = self.scrapped_data.get(int(match.group(1)))
+            if data is None:
+                return HTTPStatus.NOT_FOUND, {"detail": "Not found"}
+            return HTTPStatus.OK, data
+        if method == "POST" and path == "/scrapped-data":
+            payload = self._json(handler)
+            data = {"id": len(self.scrapped_data) + 1, **payload}
+            self.scrapped_data[payload["user_service_id"]] = data
+            return HTTPStatus.CREATED, data
+        if method == "POST" and (
+            match := re.fullmatch(r"/scrapped-data/(\d+)/bills", path)
+        ):
+            data = self._by_id(int(match.group(1)))
+            if data is None:
+                return HTTPStatus.NOT_FOUND, {"detail": "Not found"}
+            payload = self._json(handler)
+            bills = data.setdefault("bills_url", [])
+            if payload.get("expected_count", len(bills)) != len(bills):
+                return HTTPStatus.CONFLICT, {"detail": "Bills changed"}
+            bills.extend(payload["bills_url"])
+            if payload.get("debt") is not None:
+                data["debt"] = payload["debt"]
+            return HTTPStatus.OK, {"id": data["id"], "count": len(bills)}
+        if method == "PATCH" and (match := re.fullmatch(r"/scrapped-data/(\d+)", path)):
+            data = self._by_id(int(match.group(1)))
+            if data is None:
+                return HTTPStatus.NOT_FOUND, {"detail": "Not found"}
+            data.update(self._json(handler))
+            return HTTPStatus.OK, data
+        return HTTPStatus.NOT_FOUND, {"detail": "Not found"}
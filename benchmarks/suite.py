@@ -0,0 +1,265 @@
+"""
+Bill processing benchmark suite with a regression gate.
+
+Measures ``GenericBillParser.parse``, ``convert_data_to_json`` and
+``process_utility_bill_pdf`` over the synthetic corpus and reports bills/s,
+p50/p99 latency per bill and peak traced memory per bill. With ``--check``
+the results are compared against ``baseline.json`` and the command exits
+with status 1 on a regression.
+
+Usage:
+    python -m benchmarks.suite [--bills 2000] [--pdfs 40] [--check]
+    python -m benchmarks.suite --update-baseline
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from benchmarks.corpus import build_pdf_corpus, load_provider_corpus
+from src.core.cpu_executor import CpuExecutor, set_cpu_executor
+from src.utils.convert_data import GenericBillParser, convert_data_to_json
+from src.utils.process_utility_bill_pdf import process_utility_bill_pdf
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+# Metric -> True when higher is better
+GATED_METRICS = {
+    "bills_per_sec": True,
+    "p50_ms": False,
+    "p99_ms": False,
+    "peak_kib": False,
+}
+# Tail latency is noisier than the median, give it more room
+TOLERANCE_FACTOR = {"p99_ms": 2.0}
+
+# Bills measured again under tracemalloc, which slows them down
+MEMORY_SAMPLE = 50
+
+
+def percentile(samples: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of ``samples``, ``q`` in [0, 100]."""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+@dataclass
+class BenchmarkResult:
+    """Throughput, latency and memory of one benchmark."""
+
+    name: str
+    bills: int
+    seconds: float
+    p50_ms: float
+    p99_ms: float
+    peak_kib: float
+    p50_ms_by_provider: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def bills_per_sec(self) -> float:
+        return self.bills / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["bills_per_sec"] = round(self.bills_per_sec, 1)
+        return data
+
+    def summary(self) -> str:
+        return (
+            f"{self.name:<24} {self.bills:>6} bills  {self.bills_per_sec:>9.1f} bills/s  "
+            f"p50 {self.p50_ms:>7.3f} ms  p99 {self.p99_ms:>7.3f} ms  "
+            f"peak {self.peak_kib:>8.1f} KiB"
+        )
+
+
+def measure(
+    name: str, func: Callable[[Any], Any], inputs: List[Tuple[str, Any]]
+) -> BenchmarkResult:
+    """
+    Benchmark ``func`` over (provider, input) pairs.
+
+    Latency is timed on every input first, then peak memory is traced on a
+    sample of them so tracemalloc does not distort the timings.
+    """
+    func(inputs[0][1])  # warm up pattern and font caches
+
+    latencies: List[float] = []
+    by_provider: Dict[str, List[float]] = {}
+    started = time.perf_counter()
+    for provider, item in inputs:
+        item_started = time.perf_counter()
+        func(item)
+        elapsed = (time.perf_counter() - item_started) * 1000
+        latencies.append(elapsed)
+        by_provider.setdefault(provider, []).append(elapsed)
+    seconds = time.perf_counter() - started
+
+    peak = 0
+    tracemalloc.start()
+    try:
+        for _, item in inputs[:MEMORY_SAMPLE]:
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            func(item)
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(
+        name=name,
+        bills=len(inputs),
+        seconds=round(seconds, 4),
+        p50_ms=round(percentile(latencies, 50), 4),
+        p99_ms=round(percentile(latencies, 99), 4),
+        peak_kib=round(peak / 1024, 1),
+        p50_ms_by_provider={
+            provider: round(percentile(samples, 50), 4)
+            for provider, samples in sorted(by_provider.items())
+        },
+    )
+
+
+def run_suite(
+    bills: int, pdfs: int, executor: str = "thread", only: Optional[List[str]] = None
+) -> List[BenchmarkResult]:
+    """
+    Run the benchmarks.
+
+    Args:
+        bills: Bill texts parsed by the text benchmarks
+        pdfs: Generated PDFs processed by the PDF benchmark
+        executor: CPU executor kind used by the async entry points; "thread"
+            keeps the work in this process so tracemalloc can see it
+        only: Names of the benchmarks to run, all by default
+    """
+    texts = load_provider_corpus(bills)
+    loop = asyncio.new_event_loop()
+    set_cpu_executor(CpuExecutor(kind=executor, max_workers=1))
+    results = []
+
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            benchmarks = {
+                "parser": lambda: measure(
+                    "parser", lambda text: GenericBillParser().parse(text), texts
+                ),
+                "convert_data_to_json": lambda: measure(
+                    "convert_data_to_json",
+                    lambda text: loop.run_until_complete(convert_data_to_json(text)),
+                    texts,
+                ),
+                "process_utility_bill_pdf": lambda: measure(
+                    "process_utility_bill_pdf",
+                    lambda path: loop.run_until_complete(
+                        process_utility_bill_pdf(str(path))
+                    ),
+                    build_pdf_corpus(Path(directory), pdfs),
+                ),
+            }
+            for name, benchmark in benchmarks.items():
+                if only and name not in only:
+                    continue
+                results.append(benchmark())
+                print(results[-1].summary())
+    finally:
+        set_cpu_executor(None)
+        loop.close()
+
+    return results
+
+
+def compare(
+    results: List[BenchmarkResult],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float,
+) -> List[str]:
+    """
+    Compare results against a baseline.
+
+    Returns:
+        A message per metric that regressed by more than ``tolerance``
+    """
+    regressions = []
+    for result in results:
+        expected = baseline.get(result.name)
+        if not expected:
+            continue
+        current = result.as_dict()
+        for metric, higher_is_better in GATED_METRICS.items():
+            if metric not in expected:
+                continue
+            allowed = tolerance * TOLERANCE_FACTOR.get(metric, 1.0)
+            if higher_is_better:
+                limit = expected[metric] * (1 - allowed)
+                failed = current[metric] < limit
+            else:
+                limit = expected[metric] * (1 + allowed)
+                failed = current[metric] > limit
+            if failed:
+                regressions.append(
+                    f"{result.name}.{metric}: {current[metric]} "
+                    f"(baseline {expected[metric]}, limit {limit:.3f})"
+                )
+    return regressions
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> Dict[str, Dict[str, float]]:
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def save_baseline(results: List[BenchmarkResult], path: Path = BASELINE_PATH) -> None:
+    """Store the gated metrics of ``results``, keeping other benchmarks."""
+    baseline = load_baseline(path)
+    for result in results:
+        current = result.as_dict()
+        baseline[result.name] = {metric: current[metric] for metric in GATED_METRICS}
+    path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--bills", type=int, default=2000)
+    arg_parser.add_argument("--pdfs", type=int, default=40)
+    arg_parser.add_argument(
+        "--executor", choices=("thread", "process"), default="thread"
+    )
+    arg_parser.add_argument(
+        "--only", action="append", help="Benchmark to run, may be repeated"
+    )
+    arg_parser.add_argument("--check", action="store_true")
+    arg_parser.add_argument("--tolerance", type=float, default=0.3)
+    arg_parser.add_argument("--update-baseline", action="store_true")
+    arg_parser.add_argument("--json", type=Path, help="Write the results to a file")
+    args = arg_parser.parse_args(argv)
+
+    results = run_suite(args.bills, args.pdfs, args.executor, args.only)
+
+    if args.json:
+        args.json.write_text(
+            json.dumps([result.as_dict() for result in results], indent=2) + "\n"
+        )
+    if args.update_baseline:
+        save_baseline(results)
+        print(f"Baseline written to {BASELINE_PATH}")
+    if args.check:
+        regressions = compare(results, load_baseline(), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("No regressions against the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,6 +16,92 @@ class Settings(BaseSettings):
     REDIS_URL: str
     PROCESSOR_ID: str
     GOOGLE_APPLICATION_CREDENTIALS: str
+
+    # Local Chromium used when ENDPOINT_PROXY is empty; empty = Playwright's own
+    CHROME_EXECUTABLE_PATH: str = ""
+
+    # Browser pool
+    BROWSER_POOL_MAX_BROWSERS: int = 2
+    BROWSER_POOL_MAX_CONTEXTS: int = 4
+    BROWSER_POOL_MAX_USES: int = 50
+
+    # CPU executor for PDF extraction and parsing ("process" or "thread")
+    CPU_EXECUTOR_KIND: str = "process"
+    CPU_EXECUTOR_WORKERS: int = 0  # 0 = CPU quota split between pool processes
+    CPU_EXECUTOR_MAX_PENDING: int = 16
+    CPU_EXECUTOR_TIMEOUT: float = 60.0
+
+    # Celery lanes (src/workers/lanes.py): queue and worker processes of each
+    QUEUE_INTERACTIVE: str = "scrap.interactive"
+    QUEUE_BATCH: str = "scrap.batch"
+    QUEUE_EXTRACTION: str = "scrap.extraction"
+    WORKER_INTERACTIVE_CONCURRENCY: int = 2
+    WORKER_BATCH_CONCURRENCY: int = 1
+    WORKER_EXTRACTION_CONCURRENCY: int = 1
+
+    # Asyncio worker (src/workers/async_worker.py): jobs at once per process
+    ASYNC_WORKER_CONCURRENCY: int = 24
+    # New jobs wait while this fraction of the memory limit is in use
+    ASYNC_WORKER_MEMORY_HIGH_WATER: float = 0.8
+    ASYNC_WORKER_MEMORY_POLL_INTERVAL: float = 1.0
+
+    # Batch scraping fan-out
+    SCRAP_BATCH_CONCURRENCY: int = 4
+    # Jobs per portal host at once, also enforced across workers via Redis
+    SCRAP_SITE_CONCURRENCY: int = 4
+    # Downloads processed at the same time within one scraping job
+    SCRAP_DOWNLOAD_PARALLELISM: int = 4
+    # Read element attributes with one evaluation instead of one call each
+    SCRAP_BULK_SNAPSHOT: bool = True
+
+    # Captcha solving ("anticaptcha" or "stub")
+    CAPTCHA_SOLVER: str = "anticaptcha"
+    CAPTCHA_MAX_CONCURRENT: int = 4
+    CAPTCHA_TIMEOUT: float = 180.0
+    CAPTCHA_POLL_INTERVAL: float = 3.0
+
+    # /scrap requests collapse onto the queued or running job of a user service
+    SCRAP_DEDUP_ENABLED: bool = True
+    SCRAP_DEDUP_BY_CONFIG: bool = True  # also key on the scraping config
+    SCRAP_DEDUP_LEASE: int = 900  # s, frees keys of jobs that never ended
+
+    # Per-portal rate limiting shared through Redis
+    SITE_RATE_LIMIT: float = 2.0  # navigations/submits/downloads per second
+    SITE_RATE_BURST: int = 5
+    SITE_SLOT_TTL: int = 120  # s, refreshed while held; frees crashed workers' slots
+    SITE_SLOT_WAIT_TIMEOUT: float = 600.0
+    SITE_LIMITER_POLL_INTERVAL: float = 0.25
+
+    # Cached portal sessions (Playwright storage state in Redis)
+    SESSION_CACHE_ENABLED: bool = True
+    SESSION_CACHE_TTL: int = 1800
+    SESSION_PROBE_TIMEOUT: int = 3000  # ms
+
+    # Saving new bills: "replace" sends the full list, "append" only new bills
+    # (needs POST scrapped-data/{id}/bills; falls back to replace without it)
+    BILL_SAVE_MODE: str = "replace"
+
+    # Seconds backend reads are shared across the jobs of a worker; 0 = per job
+    BACKEND_CACHE_TTL: float = 0.0
+    # Scrapped data and user service reads shared by all workers through Redis
+    BACKEND_SNAPSHOT_CACHE_ENABLED: bool = True
+    BACKEND_SNAPSHOT_TTL: int = 60
+
+    # Shared HTTP client for the main backend
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 20
+    HTTP_CLIENT_MAX_KEEPALIVE: int = 10
+    # Below uvicorn's default 5s keep-alive so idle sockets are not reused late
+    HTTP_CLIENT_KEEPALIVE_EXPIRY: float = 4.0
+    HTTP_CLIENT_HTTP2: bool = False
+
+    # Tracing: exporter "none", "jsonl" or "otlp" (OTLP/HTTP JSON)
+    TRACE_EXPORTER: str = "none"
+    TRACE_SAMPLE_RATE: float = 0.05
+    TRACE_FILE: str = "logs/traces.jsonl"
+    TRACE_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+
+    # Prometheus exporter of worker pool processes (port + process index)
+    WORKER_METRICS_PORT: int = 9808
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 
@@ -25,3 +111,14 @@ Config = Settings()
 broker_url = Config.REDIS_URL
 result_backend = Config.REDIS_URL
 broker_connection_retry_on_startup = True
+
+task_default_queue = Config.QUEUE_INTERACTIVE
+task_routes = {
+    "src.workers.tasks.scrap_task": {"queue": Config.QUEUE_INTERACTIVE},
+    "src.workers.tasks.scrap_all_user_service_by_service_task": {
+        "queue": Config.QUEUE_BATCH
+    },
+    "src.workers.tasks.extract_task": {"queue": Config.QUEUE_EXTRACTION},
+}
+# Scraping tasks run for minutes; a busy process must not hold queued ones
+worker_prefetch_multiplier = 1
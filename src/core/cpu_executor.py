@@ -0,0 +1,307 @@
+import asyncio
+import functools
+import logging
+import os
+import time
+import threading
+import weakref
+from concurrent.futures import (
+    Executor,
+    Future,
+    InvalidStateError,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import current_process, get_context
+from typing import Any, Callable, Optional, Set, Tuple
+
+import billiard
+from billiard.exceptions import WorkerLostError
+
+from src.core.config import Config
+from src.core.errors import DocumentProcessingError
+from src.core.metrics import CPU_TASK_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+def cpu_quota() -> int:
+    """Return the CPU quota of the container, falling back to the host CPU count."""
+    try:
+        # cgroup v2: "<quota> <period>" or "max <period>"
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return max(1, int(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+
+    try:
+        # cgroup v1
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0:
+            return max(1, quota // period)
+    except (OSError, ValueError):
+        pass
+
+    return os.cpu_count() or 1
+
+
+# Processes of the Celery pool sharing this container's CPU quota
+_pool_processes = 1
+
+
+def set_pool_processes(processes: int) -> None:
+    """
+    Share the CPU quota between the ``processes`` pool processes of a worker.
+
+    Called in the worker's main process before it forks its pool, so every
+    child sizes its executor to its own share of the quota.
+    """
+    global _pool_processes
+    _pool_processes = max(1, processes)
+
+
+def _timed(func: Callable[..., Any], *args: Any) -> Tuple[float, Any]:
+    """Run ``func`` in the worker and report how long it took."""
+    started = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - started, result
+
+
+# Seconds billiard waits for the result of a dead worker before failing its job
+LOST_WORKER_TIMEOUT = 1.0
+
+
+class BilliardPoolExecutor(Executor):
+    """
+    ``Executor`` over a billiard process pool.
+
+    Daemonic processes, such as Celery prefork children, may not start
+    ``multiprocessing`` children; billiard, the library behind the prefork
+    pool, allows it. A worker that dies fails its future with
+    BrokenProcessPool and is replaced by the pool.
+    """
+
+    def __init__(self, max_workers: int):
+        self._pool = billiard.get_context("spawn").Pool(
+            max_workers, lost_worker_timeout=LOST_WORKER_TIMEOUT
+        )
+        self._futures: Set[Future] = set()
+        self._lock = threading.Lock()
+
+    def _settle(self, future: Future, result: Any = None, error: Any = None) -> None:
+        # Called from the pool's result thread, which must not raise
+        with self._lock:
+            self._futures.discard(future)
+        if error is not None:
+            # ExceptionInfo -> ExceptionWithTraceback -> raised exception
+            error = getattr(error, "exception", error)
+            error = getattr(error, "exc", error)
+            if isinstance(error, WorkerLostError):
+                error = BrokenProcessPool(str(error))
+        try:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            pass  # cancelled meanwhile
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        future: Future = Future()
+        future.set_running_or_notify_cancel()
+        with self._lock:
+            self._futures.add(future)
+        self._pool.apply_async(
+            fn,
+            args,
+            kwargs,
+            callback=functools.partial(self._settle, future),
+            error_callback=lambda error: self._settle(future, error=error),
+        )
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """Wait for the queued work, or kill the workers if ``wait`` is False."""
+        if wait and not cancel_futures:
+            self._pool.close()
+            self._pool.join()
+            return
+        self._pool.terminate()
+        with self._lock:
+            futures, self._futures = self._futures, set()
+        for future in futures:
+            self._settle(future, error=BrokenProcessPool("Process pool terminated"))
+
+
+class CpuExecutor:
+    """
+    Run CPU-bound work (PDF text extraction, bill parsing) off the event loop.
+
+    Work is sent to a process pool sized to this process's share of the
+    container CPU quota. The number of documents queued or running is bounded,
+    every document has a timeout and a crashed or hung worker only fails its
+    own document: the pool is rebuilt and the service keeps running. Daemonic
+    processes, such as Celery prefork children, use a billiard pool.
+
+    Threads cannot be stopped: with ``kind="thread"`` a document that timed
+    out keeps its queue slot until its thread returns.
+    """
+
+    def __init__(
+        self,
+        kind: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.kind = kind or Config.CPU_EXECUTOR_KIND
+        self.max_workers = (
+            max_workers
+            or Config.CPU_EXECUTOR_WORKERS
+            or max(1, cpu_quota() // _pool_processes)
+        )
+        self.max_pending = max_pending or Config.CPU_EXECUTOR_MAX_PENDING
+        self.timeout = timeout or Config.CPU_EXECUTOR_TIMEOUT
+        self._pool: Optional[Executor] = None
+        self._slots: (
+            "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]"
+        ) = weakref.WeakKeyDictionary()
+
+    def _create_pool(self) -> Executor:
+        """Create the underlying executor, falling back to threads if needed."""
+        if self.kind == "process":
+            try:
+                if current_process().daemon:
+                    return BilliardPoolExecutor(self.max_workers)
+                return ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=get_context("spawn")
+                )
+            except Exception as e:
+                logger.warning(f"Process pool unavailable, using threads: {str(e)}")
+                self.kind = "thread"
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="cpu-executor"
+        )
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            self._pool = self._create_pool()
+        return self._pool
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        """Return the queue depth limiter of the running event loop."""
+        loop = asyncio.get_running_loop()
+        slots = self._slots.get(loop)
+        if slots is None:
+            slots = self._slots[loop] = asyncio.Semaphore(self.max_pending)
+        return slots
+
+    def _restart(self, pool: Executor) -> None:
+        """Tear down a broken or hung pool so the next call gets a fresh one."""
+        if self._pool is not pool:
+            return
+        self._pool = None
+        if isinstance(pool, ProcessPoolExecutor):
+            # Hung workers never finish on their own
+            for process in list((pool._processes or {}).values()):
+                process.terminate()
+        # Kills the workers of a BilliardPoolExecutor
+        pool.shutdown(wait=False, cancel_futures=True)
+        logger.warning("CPU executor pool restarted")
+
+    async def run(
+        self, func: Callable[..., Any], *args: Any, timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Run ``func(*args)`` on the executor.
+
+        Args:
+            func: Module-level (picklable) function to run
+            *args: Positional arguments for ``func``
+            timeout: Seconds allowed for this document, defaults to the executor timeout
+
+        Returns:
+            The value returned by ``func``
+
+        Raises:
+            DocumentProcessingError: If the work times out or its worker crashes
+        """
+        slots = self._get_slots()
+        await slots.acquire()
+        loop = asyncio.get_running_loop()
+        # Timed inside the worker: metrics of spawned processes are not exported
+        call = functools.partial(_timed, func, *args)
+        running: Optional[Future] = None
+
+        try:
+            for attempt in range(2):
+                pool = self._get_pool()
+                try:
+                    future = pool.submit(call)
+                    if isinstance(pool, ThreadPoolExecutor):
+                        running = future
+                    elapsed, result = await asyncio.wait_for(
+                        asyncio.wrap_future(future), timeout or self.timeout
+                    )
+                    CPU_TASK_SECONDS.labels(func.__name__).observe(elapsed)
+                    return result
+                except asyncio.TimeoutError:
+                    if running is None:
+                        self._restart(pool)
+                    raise DocumentProcessingError(
+                        f"{func.__name__} timed out after {timeout or self.timeout}s"
+                    )
+                except BrokenProcessPool:
+                    # Retry once when the pool was torn down by another document
+                    crashed_here = self._pool is pool
+                    self._restart(pool)
+                    if crashed_here or attempt:
+                        raise DocumentProcessingError(
+                            f"{func.__name__} crashed its worker process"
+                        )
+        finally:
+            if running is not None and not running.done():
+                # The thread keeps running: free its slot only once it returns
+                running.add_done_callback(lambda _: _release_threadsafe(loop, slots))
+            else:
+                slots.release()
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+def _release_threadsafe(
+    loop: asyncio.AbstractEventLoop, slots: asyncio.Semaphore
+) -> None:
+    try:
+        loop.call_soon_threadsafe(slots.release)
+    except RuntimeError:
+        pass  # loop closed, and its semaphore with it
+
+
+_executor: Optional[CpuExecutor] = None
+
+
+def get_cpu_executor() -> CpuExecutor:
+    """Return the process-wide CPU executor."""
+    global _executor
+    if _executor is None:
+        _executor = CpuExecutor()
+    return _executor
+
+
+def set_cpu_executor(executor: Optional[CpuExecutor]) -> None:
+    """Replace the process-wide CPU executor (e.g. with a thread-based one)."""
+    global _executor
+    if _executor is not None and _executor is not executor:
+        _executor.shutdown()
+    _executor = executor
@@ -35,3 +35,9 @@ class ScrapingError(WebScrapingError):
     """Raised when there's an error during the scraping process"""
 
     pass
+
+
+class DocumentProcessingError(Exception):
+    """Raised when CPU-bound document processing fails or times out"""
+
+    pass
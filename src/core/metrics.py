@@ -0,0 +1,131 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+from prometheus_client import Counter, Histogram, start_http_server
+from prometheus_client.core import REGISTRY, GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN = "unknown"
+
+# Browser work ranges from milliseconds to a couple of minutes (captchas)
+STAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 60, 120, 300)
+FAST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+SCRAP_STAGE_SECONDS = Histogram(
+    "scrap_stage_seconds",
+    "Duration of scraping stages (browser_acquire, page_goto, captcha_solve, "
+    "download, pdf_extract)",
+    ["stage", "service_id", "browser"],
+    buckets=STAGE_BUCKETS,
+)
+SCRAP_ACTION_SECONDS = Histogram(
+    "scrap_action_seconds",
+    "Duration of scraping sequence actions by element type",
+    ["element_type", "service_id", "browser"],
+    buckets=STAGE_BUCKETS,
+)
+CPU_TASK_SECONDS = Histogram(
+    "cpu_task_seconds",
+    "Time spent inside CPU executor tasks (PDF extraction, bill parsing)",
+    ["task"],
+    buckets=FAST_BUCKETS,
+)
+BACKEND_REQUEST_SECONDS = Histogram(
+    "backend_request_seconds",
+    "Duration of main backend calls",
+    ["method", "endpoint", "status"],
+    buckets=FAST_BUCKETS,
+)
+BACKEND_BYTES_TOTAL = Counter(
+    "backend_bytes_total",
+    "Body bytes exchanged with the main backend",
+    ["method", "endpoint", "direction"],
+)
+QUEUE_WAIT_SECONDS = Histogram(
+    "celery_queue_wait_seconds",
+    "Time tasks waited in their lane's queue before a worker started them",
+    ["lane", "task"],
+    buckets=STAGE_BUCKETS,
+)
+RETRIES_TOTAL = Counter(
+    "scrap_retries_total", "Retried calls of with_retry functions", ["operation"]
+)
+ERRORS_TOTAL = Counter(
+    "scrap_errors_total",
+    "Failed scraping jobs by error type",
+    ["error_type", "service_id", "browser"],
+)
+BILLS_SAVED_TOTAL = Counter(
+    "bills_saved_total", "Bills sent to the main backend", ["service_id"]
+)
+
+
+@contextmanager
+def time_stage(
+    stage: str, service_id: Any = UNKNOWN, browser: str = UNKNOWN
+) -> Iterator[None]:
+    """Observe the duration of the wrapped block as a scraping stage."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        SCRAP_STAGE_SECONDS.labels(stage, str(service_id), browser).observe(
+            time.perf_counter() - started
+        )
+
+
+class _ComponentStatsCollector(Collector):
+    """Expose the counters dicts kept by pools and caches as gauges."""
+
+    def __init__(self):
+        self.sources: List[Tuple[str, Callable[[], Dict[str, Any]]]] = []
+
+    def collect(self):
+        gauge = GaugeMetricFamily(
+            "scrap_component_stat",
+            "Counters reported by pools and caches of this process",
+            labels=["component", "stat"],
+        )
+        for component, getter in self.sources:
+            try:
+                stats = getter()
+            except Exception as e:
+                logger.warning(f"Could not collect {component} stats: {str(e)}")
+                continue
+            for name, value in stats.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    gauge.add_metric([component, name], value)
+        yield gauge
+
+
+_component_stats = _ComponentStatsCollector()
+REGISTRY.register(_component_stats)
+
+
+def register_component_stats(
+    component: str, getter: Callable[[], Dict[str, Any]]
+) -> None:
+    """Publish the numeric values of ``getter()`` as ``scrap_component_stat``."""
+    _component_stats.sources.append((component, getter))
+
+
+def start_worker_exporter(port: int, index: int = 0) -> None:
+    """
+    Serve the metrics of a worker process over HTTP.
+
+    Args:
+        port: Base port, 0 disables the exporter
+        index: Index of the pool process, added to ``port`` so every child
+            process of a worker gets its own endpoint
+    """
+    if not port:
+        return
+    try:
+        start_http_server(port + index)
+        logger.info(f"Worker metrics exporter listening on :{port + index}")
+    except OSError as e:
+        logger.warning(f"Worker metrics exporter not started: {str(e)}")
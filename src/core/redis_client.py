@@ -0,0 +1,28 @@
+import asyncio
+import weakref
+
+import redis.asyncio as redis
+
+from src.core.config import Config
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, redis.Redis]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_redis() -> redis.Redis:
+    """Return the async Redis client bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = redis.Redis.from_url(
+            Config.REDIS_URL, decode_responses=True
+        )
+    return client
+
+
+async def close_redis() -> None:
+    """Close the Redis client bound to the running event loop, if any."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -1,6 +1,8 @@
 import asyncio
 from functools import wraps
 
+from src.core.metrics import RETRIES_TOTAL
+
 
 def with_retry(max_retries: int = 3, delay: float = 1.0):
     def decorator(func):
@@ -13,6 +15,7 @@ def with_retry(max_retries: int = 3, delay: float = 1.0):
                 except Exception as e:
                     last_exception = e
                     if attempt < max_retries - 1:
+                        RETRIES_TOTAL.labels(func.__qualname__).inc()
                         await asyncio.sleep(delay * (attempt + 1))
                     continue
             raise last_exception
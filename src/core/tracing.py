@@ -0,0 +1,346 @@
+import atexit
+import functools
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from src.core.config import Config
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "ss-webscraping-ms"
+TRACEPARENT_HEADER = "traceparent"
+_TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    """Identity of a span, enough to continue its trace elsewhere."""
+
+    trace_id: str
+    span_id: str
+    sampled: bool
+
+    @property
+    def traceparent(self) -> str:
+        """W3C ``traceparent`` header value."""
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    @classmethod
+    def from_traceparent(cls, value: Optional[str]) -> Optional["SpanContext"]:
+        """Parse a ``traceparent`` header, returning None if it is invalid."""
+        match = _TRACEPARENT_RE.match((value or "").strip().lower())
+        if match is None:
+            return None
+        trace_id, span_id, flags = match.groups()
+        return cls(trace_id, span_id, bool(int(flags, 16) & 1))
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace."""
+
+    name: str
+    context: SpanContext
+    parent_id: Optional[str] = None
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.update(
+            trace_id=self.context.trace_id,
+            span_id=self.context.span_id,
+            duration_ms=round(self.duration_ms, 3),
+        )
+        del data["context"]
+        return data
+
+
+# Innermost span of the running task, or the remote parent of a continued trace
+_current: ContextVar[Optional[Union[Span, SpanContext]]] = ContextVar(
+    "current_span", default=None
+)
+
+
+def _current_context() -> Optional[SpanContext]:
+    current = _current.get()
+    return current.context if isinstance(current, Span) else current
+
+
+def current_traceparent() -> Optional[str]:
+    """Return the ``traceparent`` of the active span, if any."""
+    context = _current_context()
+    return context.traceparent if context else None
+
+
+def current_trace_id() -> Optional[str]:
+    context = _current_context()
+    return context.trace_id if context else None
+
+
+def _should_sample() -> bool:
+    if get_exporter().kind == "none":
+        return False
+    return random.random() < Config.TRACE_SAMPLE_RATE
+
+
+def start_span(name: str, **attributes: Any) -> Span:
+    """
+    Create a span under the active one, or a new sampled/unsampled root.
+
+    The span is not made current; use ``span`` for that.
+    """
+    parent = _current_context()
+    if parent is None:
+        context = SpanContext(
+            os.urandom(16).hex(), os.urandom(8).hex(), _should_sample()
+        )
+    else:
+        context = SpanContext(parent.trace_id, os.urandom(8).hex(), parent.sampled)
+    return Span(
+        name=name,
+        context=context,
+        parent_id=parent.span_id if parent else None,
+        attributes=attributes,
+    )
+
+
+def end_span(span: Span, error: Optional[BaseException] = None) -> None:
+    """Close a span and export it if its trace is sampled."""
+    span.end_ns = time.time_ns()
+    if error is not None:
+        span.error = f"{type(error).__name__}: {error}"
+    if span.context.sampled:
+        get_exporter().export(span)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """Run the wrapped block inside a new current span."""
+    current = start_span(name, **attributes)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        end_span(current, e)
+        raise
+    else:
+        end_span(current)
+    finally:
+        _current.reset(token)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorate a coroutine function so every call runs in its own span."""
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(span_name):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def attach(traceparent: Optional[str]) -> Token:
+    """Continue a remote trace in the current context; undo with ``detach``."""
+    return _current.set(SpanContext.from_traceparent(traceparent))
+
+
+def activate(span: Span) -> Token:
+    """Make a span started with ``start_span`` current; undo with ``detach``."""
+    return _current.set(span)
+
+
+def detach(token: Token) -> None:
+    _current.reset(token)
+
+
+class SpanExporter:
+    """
+    Background exporter writing finished spans as JSON lines or OTLP/JSON.
+
+    Spans are queued from the caller and written by a daemon thread in batches,
+    so exporting never blocks the event loop. Spans are dropped when the queue
+    is full.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        path: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        batch_size: int = 256,
+        interval: float = 1.0,
+    ):
+        self.kind = kind
+        self.path = path
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+        self.interval = interval
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[Span]]" = queue.Queue(maxsize=10_000)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        if self.kind == "none":
+            return
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_thread(self) -> None:
+        # Checked per process: threads do not survive a fork
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._thread = threading.Thread(
+                        target=self._run, name="span-exporter", daemon=True
+                    )
+                    self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            batch: List[Span] = []
+            stop = False
+            try:
+                item = self._queue.get(timeout=self.interval)
+                while True:
+                    if item is None:
+                        stop = True
+                        break
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            if batch:
+                self._write(batch)
+            if stop:
+                return
+
+    def _write(self, batch: List[Span]) -> None:
+        try:
+            if self.kind == "jsonl":
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, "a") as f:
+                    for item in batch:
+                        f.write(json.dumps(item.as_dict(), default=str) + "\n")
+            elif self.kind == "otlp":
+                request = urllib.request.Request(
+                    self.endpoint,
+                    data=json.dumps(to_otlp(batch), default=str).encode(),
+                    headers={"Content-Type": "application/json"},
+                    method="POST",
+                )
+                urllib.request.urlopen(request, timeout=5).close()
+        except Exception as e:
+            self.dropped += len(batch)
+            logger.warning(f"Could not export {len(batch)} spans: {str(e)}")
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Write queued spans and stop the exporter thread."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def to_otlp(spans: List[Span]) -> Dict[str, Any]:
+    """Encode spans as an OTLP/HTTP JSON ``ExportTraceServiceRequest``."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": _otlp_value(SERVICE_NAME)}
+                    ]
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": __name__},
+                        "spans": [
+                            {
+                                "traceId": item.context.trace_id,
+                                "spanId": item.context.span_id,
+                                "parentSpanId": item.parent_id or "",
+                                "name": item.name,
+                                "kind": 1,
+                                "startTimeUnixNano": str(item.start_ns),
+                                "endTimeUnixNano": str(item.end_ns),
+                                "attributes": [
+                                    {"key": key, "value": _otlp_value(value)}
+                                    for key, value in item.attributes.items()
+                                ],
+                                "status": (
+                                    {"code": 2, "message": item.error}
+                                    if item.error
+                                    else {"code": 1}
+                                ),
+                            }
+                            for item in spans
+                        ],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+_exporter: Optional[SpanExporter] = None
+
+
+def get_exporter() -> SpanExporter:
+    """Return the process-wide span exporter configured by ``TRACE_*`` settings."""
+    global _exporter
+    if _exporter is None:
+        _exporter = SpanExporter(
+            Config.TRACE_EXPORTER,
+            path=Config.TRACE_FILE,
+            endpoint=Config.TRACE_OTLP_ENDPOINT,
+        )
+        atexit.register(_exporter.flush)
+    return _exporter
+
+
+def set_exporter(exporter: Optional[SpanExporter]) -> None:
+    """Replace the process-wide span exporter (e.g. in tests)."""
+    global _exporter
+    _exporter = exporter
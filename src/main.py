@@ -1,12 +1,33 @@
-from fastapi import FastAPI
+import uuid
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from src.core.config import Config
+from src.core.redis_client import close_redis
+from src.core.tracing import span
+from src.services.http_client import close_shared_client
+from src.services.inflight_jobs import InflightJobs, job_key
 from src.workers.tasks import scrap_task
 
+inflight_jobs = InflightJobs()
+
 description = """
 SmartServices API helps you do awesome stuff. 🚀
 """
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared resources on startup and release them on shutdown."""
+    yield
+    await close_shared_client()
+    await close_redis()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     root_path="/api/v1",
     title="SmartService API - WEBSCRAPING MS",
     description=description,
@@ -32,6 +53,29 @@ app.add_middleware(
 async def scrap(data: dict):
     """
     Scrap data from a website.
+
+    A request for a user service that already has a job queued or running
+    returns that job's task ID instead of enqueuing another one.
+    """
+    with span("api.scrap"):
+        task_id = str(uuid.uuid4())
+        key = job_key(data) if Config.SCRAP_DEDUP_ENABLED else None
+        if key is not None:
+            running = await inflight_jobs.claim(key, task_id)
+            if running is not None:
+                return {"status": "success", "task_id": running, "duplicate": True}
+        try:
+            scrap_task.apply_async((data,), task_id=task_id)
+        except Exception:
+            if key is not None:
+                await inflight_jobs.release(key, task_id)
+            raise
+    return {"status": "success", "task_id": task_id, "duplicate": False}
+
+
+@app.get("/metrics", tags=["metrics"], include_in_schema=False)
+async def metrics():
+    """
+    Prometheus metrics of the API process.
     """
-    scrap_task.delay(data)
-    return {"status": "success"}
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,191 @@
+import asyncio
+import logging
+import math
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    Optional,
+    Set,
+)
+
+from src.core.config import Config
+from src.core.metrics import register_component_stats
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BackendCacheMetrics:
+    """Counters of the backend read caches in this process."""
+
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    invalidations: int = 0
+
+
+_metrics = BackendCacheMetrics()
+
+
+def get_backend_cache_metrics() -> Dict[str, Any]:
+    """Return the backend read cache counters of this process."""
+    return asdict(_metrics)
+
+
+register_component_stats("backend_cache", get_backend_cache_metrics)
+
+
+@dataclass
+class _Entry:
+    future: "asyncio.Future[Any]"
+    expires_at: float
+    tags: Set[str] = field(default_factory=set)
+
+
+class BackendCache:
+    """
+    Read-through cache of backend lookups with single-flight loading.
+
+    Concurrent reads of the same key share one in-flight request. Failed
+    loads are not cached. Entries are dropped by ``invalidate`` with any of
+    their tags, or after ``ttl`` seconds when one is given. Cached values are
+    shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        self.ttl = ttl
+        self._entries: Dict[Hashable, _Entry] = {}
+
+    def _expiry(self) -> float:
+        if self.ttl is None:
+            return math.inf
+        return asyncio.get_running_loop().time() + self.ttl
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        tags: Iterable[str] = (),
+        tags_of: Optional[Callable[[Any], Iterable[str]]] = None,
+    ) -> Any:
+        """
+        Return the cached value of ``key``, loading it once if needed.
+
+        Args:
+            key: Cache key of the lookup
+            loader: Coroutine function performing the backend call
+            tags: Tags the entry is invalidated by
+            tags_of: Extra tags derived from the loaded value
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at > asyncio.get_running_loop().time():
+            if entry.future.done():
+                _metrics.hits += 1
+            else:
+                _metrics.coalesced += 1
+            return await asyncio.shield(entry.future)
+
+        _metrics.misses += 1
+        entry = _Entry(asyncio.ensure_future(loader()), self._expiry(), set(tags))
+        self._entries[key] = entry
+
+        def on_done(future: "asyncio.Future[Any]") -> None:
+            if future.cancelled() or future.exception() is not None:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            elif tags_of is not None:
+                entry.tags.update(tags_of(future.result()))
+
+        entry.future.add_done_callback(on_done)
+        return await asyncio.shield(entry.future)
+
+    def invalidate(self, tag: str) -> None:
+        """Drop every entry carrying ``tag``."""
+        stale = [key for key, entry in self._entries.items() if tag in entry.tags]
+        for key in stale:
+            del self._entries[key]
+        _metrics.invalidations += len(stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Cache of the job running in the current context, see ``backend_job_cache``
+_job_cache: ContextVar[Optional[BackendCache]] = ContextVar(
+    "backend_job_cache", default=None
+)
+
+_shared_caches: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, BackendCache]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_shared_backend_cache() -> Optional[BackendCache]:
+    """
+    Return the worker-wide cache bound to the running event loop.
+
+    Returns:
+        The cache, or None when BACKEND_CACHE_TTL disables sharing
+    """
+    if Config.BACKEND_CACHE_TTL <= 0:
+        return None
+    loop = asyncio.get_running_loop()
+    cache = _shared_caches.get(loop)
+    if cache is None:
+        cache = _shared_caches[loop] = BackendCache(ttl=Config.BACKEND_CACHE_TTL)
+    return cache
+
+
+@contextmanager
+def backend_job_cache() -> Iterator[BackendCache]:
+    """Memoize backend reads made in the wrapped block, i.e. one job."""
+    cache = BackendCache()
+    token = _job_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _job_cache.reset(token)
+
+
+async def cached_read(
+    key: Hashable,
+    loader: Callable[[], Awaitable[Any]],
+    tags: Iterable[str] = (),
+    tags_of: Optional[Callable[[Any], Iterable[str]]] = None,
+) -> Any:
+    """
+    Read through the job cache and the worker-wide cache, when enabled.
+
+    Outside a job and with sharing disabled ``loader`` is simply awaited.
+    """
+    tags = tuple(tags)
+    shared = get_shared_backend_cache()
+
+    async def load() -> Any:
+        if shared is None:
+            return await loader()
+        return await shared.get_or_load(key, loader, tags, tags_of)
+
+    job = _job_cache.get()
+    if job is None:
+        return await load()
+    return await job.get_or_load(key, load, tags, tags_of)
+
+
+def invalidate(tag: str) -> None:
+    """Drop entries tagged ``tag`` from the job cache and the worker-wide cache."""
+    job = _job_cache.get()
+    if job is not None:
+        job.invalidate(tag)
+    shared = _shared_caches.get(asyncio.get_running_loop())
+    if shared is not None:
+        shared.invalidate(tag)
@@ -0,0 +1,112 @@
+import asyncio
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from src.core.config import Config
+from src.core.logging_config import setup_logging
+from src.core.tracing import span
+from src.services.backend_cache import backend_job_cache
+from src.services.extract_data_service import ExtractDataService
+from src.services.site_limiter import PRIORITY_BATCH
+from src.services.web_scrap_service import WebScrapService
+
+
+@dataclass
+class BatchProgress:
+    """Progress of a batch run."""
+
+    service_id: Any
+    total: int
+    done: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    errors: List[Dict[str, Any]] = field(default_factory=list)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class BatchScrapService:
+    """
+    Scrape every user service of a service with bounded concurrency.
+
+    Up to ``concurrency`` user services run at once, each one on its own pooled
+    browser context and with its own job state. Jobs against the same portal
+    are capped across workers by the site limiter of ``WebScrapService``.
+    """
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        scrap_service: Optional[WebScrapService] = None,
+    ):
+        self.concurrency = concurrency or Config.SCRAP_BATCH_CONCURRENCY
+        self.scrap_service = scrap_service or WebScrapService()
+        self.logger = setup_logging("batch_scrap_service")
+
+    async def _run_one(
+        self,
+        service: Dict[str, Any],
+        user_service: Dict[str, Any],
+        progress: BatchProgress,
+        on_progress: Optional[Callable[[BatchProgress], Awaitable[None]]],
+    ) -> None:
+        """Scrape and extract a single user service."""
+        data = {
+            "browser": Config.BROWSER,
+            "user_service": user_service,
+            "service": service,
+        }
+        try:
+            with span(
+                "batch.user_service", user_service_id=user_service.get("id")
+            ), backend_job_cache():
+                result = await self.scrap_service.search(data, priority=PRIORITY_BATCH)
+                if result.get("should_extract", True):
+                    await ExtractDataService().process_bills(data)
+            progress.succeeded += 1
+        except Exception as e:
+            self.logger.error(
+                f"Batch job failed for user service {user_service.get('id')}: {str(e)}"
+            )
+            progress.failed += 1
+            progress.errors.append(
+                {"user_service_id": user_service.get("id"), "error": str(e)}
+            )
+        finally:
+            progress.done += 1
+            self.logger.info(
+                f"Batch progress for service {progress.service_id}: "
+                f"{progress.done}/{progress.total} ({progress.failed} failed)"
+            )
+            if on_progress:
+                await on_progress(progress)
+
+    async def run(
+        self,
+        service: Dict[str, Any],
+        users_service: List[Dict[str, Any]],
+        on_progress: Optional[Callable[[BatchProgress], Awaitable[None]]] = None,
+    ) -> BatchProgress:
+        """
+        Scrape all the given user services of a service.
+
+        Args:
+            service: Service data, including its scraping configuration
+            users_service: User services to scrape
+            on_progress: Awaited after every finished user service
+
+        Returns:
+            BatchProgress with the final counters
+        """
+        progress = BatchProgress(service_id=service.get("id"), total=len(users_service))
+        batch_slots = asyncio.Semaphore(self.concurrency)
+
+        async def run_limited(user_service: Dict[str, Any]) -> None:
+            async with batch_slots:
+                await self._run_one(service, user_service, progress, on_progress)
+
+        await asyncio.gather(
+            *(run_limited(user_service) for user_service in users_service)
+        )
+        return progress
@@ -1,14 +1,45 @@
 import os, tempfile, asyncio, logging
-from typing import List, Dict, Optional
+from dataclasses import asdict, dataclass
+from typing import Any, List, Dict, Optional, Set, Tuple
 import httpx
+from src.core.config import Config
 from src.core.errors import HTTPClientError
+from src.core.metrics import BILLS_SAVED_TOTAL, UNKNOWN, register_component_stats
 from src.services.http_client import MainServiceClient
+from src.utils.bill_digest import DIGEST_KEY, bill_digest
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class BillSaveMetrics:
+    """How new bills reached the backend in this process."""
+
+    appends: int = 0
+    replacements: int = 0
+    conflicts: int = 0
+    append_unsupported: int = 0
+
+
+_metrics = BillSaveMetrics()
+
+# Backend answers that mean it has no append endpoint
+APPEND_UNSUPPORTED_STATUSES = (404, 405, 501)
+
+# Set once the backend rejected an append as unsupported
+_append_unsupported = False
+
+
+def get_bill_save_metrics() -> Dict[str, Any]:
+    """Return the bill save counters of this process."""
+    return asdict(_metrics)
+
+
+register_component_stats("bill_service", get_bill_save_metrics)
+
+
 class BillService:
     """Service for handling bill-related operations."""
 
@@ -17,32 +48,25 @@ class BillService:
 
     def _deduplicate_bills(self, bills: List[Dict]) -> List[Dict]:
         """
-        Remove duplicate bills based on content or url.
+        Remove duplicate bills based on their content or url digest.
 
         Args:
             bills: List of bill dictionaries with content or url
 
         Returns:
-            List of unique bills
+            List of unique bills, each carrying its digest
         """
         unique_bills = []
-        seen_contents = set()
-        seen_urls = set()
+        seen_digests = set()
 
         for bill in bills:
             if not isinstance(bill, dict):
                 continue
 
-            # Check content-based bills
-            if "content" in bill:
-                if bill["content"] not in seen_contents:
-                    seen_contents.add(bill["content"])
-                    unique_bills.append(bill)
-            # Check URL-based bills
-            elif "url" in bill:
-                if bill["url"] not in seen_urls:
-                    seen_urls.add(bill["url"])
-                    unique_bills.append(bill)
+            digest = bill_digest(bill)
+            if digest is not None and digest not in seen_digests:
+                seen_digests.add(digest)
+                unique_bills.append({**bill, DIGEST_KEY: digest})
 
         return unique_bills
 
@@ -72,6 +96,12 @@ class BillService:
                     "new_bills_saved": False,
                 }
 
+            service_id = (
+                str(user_service.get("service_id", UNKNOWN))
+                if isinstance(user_service, dict)
+                else UNKNOWN
+            )
+
             # Deduplicate incoming bills
             unique_bills = self._deduplicate_bills(bills)
             logger.info(f"After deduplication: {len(unique_bills)} unique bills")
@@ -88,6 +118,7 @@ class BillService:
                     result = await self.client.create_scrapped_data(
                         user_service_id=user_service_id, bills=unique_bills, debt=debt
                     )
+                    BILLS_SAVED_TOTAL.labels(service_id).inc(len(unique_bills))
                     return {
                         "success": True,
                         "message": "New scrapped data created with bills",
@@ -111,32 +142,27 @@ class BillService:
                 current_bills = data.get("bills_url", [])
                 if not isinstance(current_bills, list):
                     current_bills = []
-
-                # Create sets for existing content and URLs
-                existing_contents = {
-                    bill.get("content") for bill in current_bills if bill.get("content")
-                }
-                existing_urls = {
-                    bill.get("url") for bill in current_bills if bill.get("url")
-                }
-
+                # Copied as the cached response is shared with other readers
+                current_bills = [
+                    dict(bill) if isinstance(bill, dict) else bill
+                    for bill in current_bills
+                ]
+
+                # Stored without digest: stamped below, persisted by a replace
+                legacy = any(
+                    isinstance(bill, dict) and not bill.get(DIGEST_KEY)
+                    for bill in current_bills
+                )
                 # Only add bills that don't already exist
-                new_bills = []
-                for bill in unique_bills:
-                    if "content" in bill and bill["content"] not in existing_contents:
-                        new_bills.append(bill)
-                        existing_contents.add(bill["content"])
-                    elif "url" in bill and bill["url"] not in existing_urls:
-                        new_bills.append(bill)
-                        existing_urls.add(bill["url"])
+                new_bills = self._new_bills(unique_bills, current_bills)
 
                 if new_bills:
-                    updated_bills = current_bills + new_bills
-                    result = await self.client.update_scrapped_data(
-                        scrapped_data_id=data["id"], bills=updated_bills, debt=debt
+                    result, saved = await self._store_new_bills(
+                        user_service_id, data, current_bills, new_bills, debt, legacy
                     )
-                    if result:
+                    if result and saved:
                         new_bills_saved = True
+                        BILLS_SAVED_TOTAL.labels(service_id).inc(saved)
 
             return {
                 "success": True,
@@ -152,6 +178,117 @@ class BillService:
                 "new_bills_saved": False,
             }
 
+    def _new_bills(self, bills: List[Dict], current_bills: List[Dict]) -> List[Dict]:
+        """
+        Return the bills whose digest is not among the stored ones.
+
+        Stored bills carry their digest; older ones get it stamped here so it
+        is persisted by the next full replacement.
+        """
+        existing_digests: Set[str] = set()
+        for bill in current_bills:
+            if not isinstance(bill, dict):
+                continue
+            if not bill.get(DIGEST_KEY):
+                digest = bill_digest(bill)
+                if digest is None:
+                    continue
+                bill[DIGEST_KEY] = digest
+            existing_digests.add(bill[DIGEST_KEY])
+
+        new_bills = []
+        for bill in bills:
+            if bill[DIGEST_KEY] not in existing_digests:
+                new_bills.append(bill)
+                existing_digests.add(bill[DIGEST_KEY])
+        return new_bills
+
+    async def _store_new_bills(
+        self,
+        user_service_id: int,
+        data: Dict,
+        current_bills: List[Dict],
+        new_bills: List[Dict],
+        debt: bool,
+        legacy: bool = False,
+    ) -> Tuple[Dict, int]:
+        """
+        Send new bills to existing scrapped data.
+
+        In append mode only the new bills are sent. If the stored bills
+        changed since they were read the backend answers 409; the data is then
+        read again and the merged list replaces it. Stored bills without a
+        digest, and backends without the append endpoint, also get a full
+        replacement, which persists the digests stamped by ``_new_bills``.
+
+        Args:
+            legacy: Some stored bills had no digest before ``_new_bills``
+
+        Returns:
+            Backend response and number of bills added
+        """
+        global _append_unsupported
+        if Config.BILL_SAVE_MODE == "append" and not legacy and not _append_unsupported:
+            try:
+                result = await self.client.append_scrapped_bills(
+                    scrapped_data_id=data["id"],
+                    bills=new_bills,
+                    expected_count=len(current_bills),
+                    debt=debt,
+                )
+                _metrics.appends += 1
+                return result, len(new_bills)
+            except HTTPClientError as e:
+                if e.status_code in APPEND_UNSUPPORTED_STATUSES:
+                    _append_unsupported = True
+                    _metrics.append_unsupported += 1
+                    logger.warning(
+                        f"Backend does not support appending bills "
+                        f"(HTTP {e.status_code}), replacing them instead"
+                    )
+                    return await self._replace_bills(
+                        data, current_bills, new_bills, debt
+                    )
+                if e.status_code != 409:
+                    raise
+                _metrics.conflicts += 1
+                logger.info(
+                    f"Scrapped data {data['id']} changed while saving, replacing it"
+                )
+                current_bills = await self._reload_bills(user_service_id, data["id"])
+                new_bills = self._new_bills(new_bills, current_bills)
+                if not new_bills:
+                    return {}, 0
+
+        return await self._replace_bills(data, current_bills, new_bills, debt)
+
+    async def _replace_bills(
+        self, data: Dict, current_bills: List[Dict], new_bills: List[Dict], debt: bool
+    ) -> Tuple[Dict, int]:
+        """Replace the stored bills with the merged list."""
+        _metrics.replacements += 1
+        result = await self.client.update_scrapped_data(
+            scrapped_data_id=data["id"], bills=current_bills + new_bills, debt=debt
+        )
+        return result, len(new_bills)
+
+    async def _reload_bills(
+        self, user_service_id: int, scrapped_data_id: int
+    ) -> List[Dict]:
+        """Read the current bills of one scrapped data entry again."""
+        scrapped_data = await self.client.get_scrapped_data(user_service_id)
+        if isinstance(scrapped_data, dict):
+            scrapped_data = [scrapped_data]
+        for data in scrapped_data:
+            if isinstance(data, dict) and data.get("id") == scrapped_data_id:
+                bills = data.get("bills_url", [])
+                if not isinstance(bills, list):
+                    return []
+                return [
+                    dict(bill) if isinstance(bill, dict) else bill for bill in bills
+                ]
+        return []
+
     async def download_pdfs(self, bills: List[Dict]) -> List[str]:
         """
         Download PDFs from bill URLs in parallel.
@@ -14,6 +14,16 @@ class Browser(ABC):
         """
         pass
 
+    @abstractmethod
+    def launch(self, playwright) -> PlaywrightBrowser:
+        """
+        Método abstracto para lanzar el navegador sobre un driver ya iniciado
+
+        param:
+            - playwright: Driver de Playwright compartido
+        """
+        pass
+
     @abstractmethod
     def navigate_to_page(self, url: str):
         """
@@ -1,4 +1,8 @@
-from playwright.async_api import async_playwright, Browser as PlaywrightBrowser
+from playwright.async_api import (
+    async_playwright,
+    Browser as PlaywrightBrowser,
+    Playwright,
+)
 from src.services.browser import Browser
 from src.core.config import Config
 
@@ -12,14 +16,25 @@ class ChromeBrowser(Browser):
         self.playwright = None
         self.browser = None
 
-    async def _get_browser(self) -> PlaywrightBrowser:
-        self.playwright = await async_playwright().start()
+    async def launch(self, playwright: Playwright) -> PlaywrightBrowser:
+        """
+        Conecta un navegador Chromium usando un driver de Playwright ya iniciado.
+        Sin ENDPOINT_PROXY lanza un Chromium local (p. ej. en un equipo sin red).
+
+        param:
+            - playwright: Driver de Playwright
+        """
         endpoint_url = Config.ENDPOINT_PROXY
 
-        # self.browser = await self.playwright.firefox.launch()
-        self.browser = await self.playwright.chromium.connect_over_cdp(
-            endpoint_url=endpoint_url
-        )
+        if not endpoint_url:
+            return await playwright.chromium.launch(
+                executable_path=Config.CHROME_EXECUTABLE_PATH or None
+            )
+        return await playwright.chromium.connect_over_cdp(endpoint_url=endpoint_url)
+
+    async def _get_browser(self) -> PlaywrightBrowser:
+        self.playwright = await async_playwright().start()
+        self.browser = await self.launch(self.playwright)
         return self.browser
 
     async def navigate_to_page(self, url: str):
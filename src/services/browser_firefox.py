@@ -1,4 +1,4 @@
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, Playwright
 from src.services.browser import Browser
 
 
@@ -7,14 +7,23 @@ class FirefoxBrowser(Browser):
         self.playwright = None
         self.browser = None
 
-    async def _get_browser(self):
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.firefox.launch(
+    async def launch(self, playwright: Playwright):
+        """
+        Lanza un navegador Firefox usando un driver de Playwright ya iniciado
+
+        param:
+            - playwright: Driver de Playwright
+        """
+        return await playwright.firefox.launch(
             # headless=False,
             # proxy={
             # "server": "rpc.proxyrotator.com:6969",
             # }
         )
+
+    async def _get_browser(self):
+        self.playwright = await async_playwright().start()
+        self.browser = await self.launch(self.playwright)
         return self.browser
 
     async def navigate_to_page(self, url: str):
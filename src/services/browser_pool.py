@@ -0,0 +1,273 @@
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional
+
+from playwright.async_api import (
+    async_playwright,
+    Browser as PlaywrightBrowser,
+    BrowserContext,
+    CDPSession,
+    Page,
+    Playwright,
+)
+
+from src.core.config import Config
+from src.core.errors import BrowserError
+from src.core.logging_config import setup_logging
+from src.utils.browser_invoker import InvokerBrowser
+
+
+@dataclass
+class PooledBrowser:
+    """A long-lived browser owned by the pool."""
+
+    browser_type: str
+    browser: PlaywrightBrowser
+    uses: int = 0
+    active_leases: int = 0
+    retired: bool = False
+
+    def is_healthy(self) -> bool:
+        """Check whether the browser can still accept new contexts."""
+        return not self.retired and self.browser.is_connected()
+
+
+@dataclass
+class BrowserLease:
+    """Isolated browser context handed to a single scraping job."""
+
+    browser_type: str
+    context: BrowserContext
+    page: Page
+    client: Optional[CDPSession] = None
+
+
+class BrowserPool:
+    """
+    Worker-level pool of Playwright browsers.
+
+    A single Playwright driver is started lazily and kept alive together with
+    the browsers it launches. Every job gets its own ``BrowserContext`` through
+    ``lease``, so cookies and storage never leak between customers. Browsers
+    are recycled after ``max_uses`` leases or as soon as they disconnect.
+    """
+
+    def __init__(
+        self,
+        max_browsers: Optional[int] = None,
+        max_contexts: Optional[int] = None,
+        max_uses: Optional[int] = None,
+    ):
+        self.max_browsers = max_browsers or Config.BROWSER_POOL_MAX_BROWSERS
+        self.max_contexts = max_contexts or Config.BROWSER_POOL_MAX_CONTEXTS
+        self.max_uses = max_uses or Config.BROWSER_POOL_MAX_USES
+        self.logger = setup_logging("browser_pool")
+        self._playwright: Optional[Playwright] = None
+        self._browsers: Dict[str, List[PooledBrowser]] = {}
+        # Launches in progress per browser type
+        self._launching: Dict[str, int] = {}
+        self._available = asyncio.Condition()
+        self._driver_lock = asyncio.Lock()
+        self._closed = False
+
+    async def _ensure_driver(self) -> Playwright:
+        """Start the shared Playwright driver if it is not running yet."""
+        async with self._driver_lock:
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+        return self._playwright
+
+    async def _launch(self, browser_type: str) -> PooledBrowser:
+        """Launch a new browser of the given type on the shared driver."""
+        try:
+            playwright = await self._ensure_driver()
+            launcher = InvokerBrowser().get_command(browser_type)
+            browser = await launcher.launch(playwright)
+        except Exception as e:
+            self.logger.error(f"Browser launch failed: {str(e)}")
+            raise BrowserError(f"Browser launch failed: {str(e)}")
+
+        self.logger.info(f"Launched pooled {browser_type} browser")
+        return PooledBrowser(browser_type=browser_type, browser=browser)
+
+    async def _close_browser(self, pooled: PooledBrowser) -> None:
+        """Close a browser that left the pool."""
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            self.logger.warning(f"Error closing pooled browser: {str(e)}")
+
+    def _prune(self, browser_type: str) -> List[PooledBrowser]:
+        """Drop idle browsers that are retired or no longer connected."""
+        browsers = self._browsers.setdefault(browser_type, [])
+        pruned = []
+        for pooled in list(browsers):
+            if pooled.active_leases == 0 and not pooled.is_healthy():
+                browsers.remove(pooled)
+                self.logger.info(
+                    f"Recycling {browser_type} browser after {pooled.uses} uses"
+                )
+                pruned.append(pooled)
+        return pruned
+
+    def _take(self, pooled: PooledBrowser) -> PooledBrowser:
+        """Count a new lease on ``pooled``, retiring it after ``max_uses``."""
+        pooled.uses += 1
+        pooled.active_leases += 1
+        if pooled.uses >= self.max_uses:
+            pooled.retired = True
+        return pooled
+
+    async def _acquire(self, browser_type: str) -> PooledBrowser:
+        """
+        Pick the least busy healthy browser, launching one if allowed.
+
+        Browsers still in the pool count against ``max_browsers``, including
+        retired ones until their last lease closes, and so do launches in
+        progress. A launch slot is reserved under the lock but the browser is
+        launched and pruned ones closed outside it, so other jobs can lease
+        and release meanwhile.
+        """
+        pruned: List[PooledBrowser] = []
+        try:
+            async with self._available:
+                while True:
+                    if self._closed:
+                        raise BrowserError("Browser pool is closed")
+
+                    pruned += self._prune(browser_type)
+                    browsers = self._browsers[browser_type]
+                    candidates = [
+                        pooled
+                        for pooled in browsers
+                        if pooled.is_healthy()
+                        and pooled.active_leases < self.max_contexts
+                    ]
+
+                    if candidates:
+                        return self._take(
+                            min(candidates, key=lambda b: b.active_leases)
+                        )
+                    launching = self._launching.get(browser_type, 0)
+                    if len(browsers) + launching < self.max_browsers:
+                        self._launching[browser_type] = launching + 1
+                        break
+                    await self._available.wait()
+        finally:
+            for pooled in pruned:
+                await self._close_browser(pooled)
+
+        return await self._launch_reserved(browser_type)
+
+    async def _launch_reserved(self, browser_type: str) -> PooledBrowser:
+        """Launch a browser in a reserved slot and lease it to the caller."""
+        try:
+            pooled = await self._launch(browser_type)
+        except BaseException:
+            async with self._available:
+                self._launching[browser_type] -= 1
+                self._available.notify_all()
+            raise
+
+        async with self._available:
+            self._launching[browser_type] -= 1
+            if not self._closed:
+                self._browsers.setdefault(browser_type, []).append(pooled)
+                # Its other contexts are free for waiting jobs
+                self._available.notify_all()
+                return self._take(pooled)
+
+        await self._close_browser(pooled)
+        raise BrowserError("Browser pool is closed")
+
+    async def _release(self, pooled: PooledBrowser) -> None:
+        """Return a browser to the pool and wake up waiting jobs."""
+        async with self._available:
+            pooled.active_leases -= 1
+            pruned = self._prune(pooled.browser_type)
+            self._available.notify_all()
+        for retired in pruned:
+            await self._close_browser(retired)
+
+    @asynccontextmanager
+    async def lease(
+        self, browser_type: str, **context_options
+    ) -> AsyncIterator[BrowserLease]:
+        """
+        Lease an isolated context and page from a pooled browser.
+
+        Args:
+            browser_type: Browser to use ("chrome" or "firefox")
+            **context_options: Extra options for ``Browser.new_context``
+
+        Yields:
+            BrowserLease with a fresh context, page and (for chrome) CDP session
+
+        Raises:
+            BrowserError: If no browser context could be created
+        """
+        pooled = await self._acquire(browser_type)
+        context = None
+        try:
+            try:
+                context = await pooled.browser.new_context(
+                    accept_downloads=True, **context_options
+                )
+                page = await context.new_page()
+                client = (
+                    await context.new_cdp_session(page)
+                    if browser_type == "chrome"
+                    else None
+                )
+            except Exception as e:
+                pooled.retired = True
+                self.logger.error(f"Browser context creation failed: {str(e)}")
+                raise BrowserError(f"Browser context creation failed: {str(e)}")
+
+            yield BrowserLease(
+                browser_type=browser_type, context=context, page=page, client=client
+            )
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception as e:
+                    pooled.retired = True
+                    self.logger.warning(f"Error closing browser context: {str(e)}")
+            await self._release(pooled)
+
+    async def close(self) -> None:
+        """Close every pooled browser and stop the Playwright driver."""
+        async with self._available:
+            self._closed = True
+            for browsers in self._browsers.values():
+                for pooled in browsers:
+                    await self._close_browser(pooled)
+            self._browsers.clear()
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+            self._available.notify_all()
+
+
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, BrowserPool]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the browser pool bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = _pools[loop] = BrowserPool()
+    return pool
+
+
+async def close_browser_pool() -> None:
+    """Close the browser pool bound to the running event loop, if any."""
+    pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.close()
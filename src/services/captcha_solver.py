@@ -0,0 +1,277 @@
+import asyncio
+import logging
+import weakref
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict, Optional
+
+import httpx
+
+from src.core.config import Config
+from src.core.errors import CaptchaError
+from src.core.metrics import register_component_stats
+
+logger = logging.getLogger(__name__)
+
+ANTICAPTCHA_API_URL = "https://api.anti-captcha.com"
+
+
+@dataclass
+class CaptchaSolution:
+    """Token returned by a solver together with what it cost."""
+
+    token: str
+    cost: float = 0.0
+
+
+@dataclass
+class CaptchaStats:
+    """Counters of the captcha solver pool."""
+
+    submitted: int = 0
+    solved: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    in_flight: int = 0
+    cost: float = 0.0
+    solve_seconds: float = 0.0
+
+
+class CaptchaSolver(ABC):
+    """Asynchronous reCAPTCHA v2 solver."""
+
+    @abstractmethod
+    async def solve(self, website_url: str, website_key: str) -> CaptchaSolution:
+        """
+        Solve the captcha of a page without blocking the event loop.
+
+        Args:
+            website_url: URL of the page showing the captcha
+            website_key: reCAPTCHA sitekey of the page
+
+        Returns:
+            CaptchaSolution with the g-recaptcha-response token
+
+        Raises:
+            CaptchaError: If the captcha could not be solved
+        """
+        pass
+
+    async def close(self) -> None:
+        """Release the resources of the solver."""
+        pass
+
+
+class AntiCaptchaSolver(CaptchaSolver):
+    """
+    Solver backed by the anti-captcha.com JSON API.
+
+    A task is created with ``createTask`` and polled with ``getTaskResult``;
+    the waits between polls are ``asyncio.sleep`` so other jobs keep running.
+    Unless a client is given the solver opens its own, so slow polling does
+    not hold connections of the backend client or skew its metrics.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        poll_interval: Optional[float] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        api_url: str = ANTICAPTCHA_API_URL,
+    ):
+        self.api_key = api_key or Config.KEY_ANTICAPTCHA
+        self.poll_interval = poll_interval or Config.CAPTCHA_POLL_INTERVAL
+        self.client = client
+        self.api_url = api_url
+        self._own_client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self.client is not None:
+            return self.client
+        if self._own_client is None or self._own_client.is_closed:
+            # One connection per solve in flight
+            self._own_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=Config.CAPTCHA_MAX_CONCURRENT)
+            )
+        return self._own_client
+
+    async def close(self) -> None:
+        """Close the client opened by the solver, if any."""
+        if self._own_client is not None:
+            await self._own_client.aclose()
+            self._own_client = None
+
+    async def _call(self, method: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Call an API method and raise on API level errors."""
+        client = self._get_client()
+        try:
+            response = await client.post(
+                f"{self.api_url}/{method}",
+                json={"clientKey": self.api_key, **payload},
+                timeout=30.0,
+            )
+            response.raise_for_status()
+            data = response.json()
+        except httpx.HTTPError as e:
+            raise CaptchaError(f"Anti-captcha {method} request failed: {str(e)}")
+
+        if data.get("errorId"):
+            raise CaptchaError(
+                f"Anti-captcha {method} failed: {data.get('errorCode')} "
+                f"{data.get('errorDescription', '')}".strip()
+            )
+        return data
+
+    async def solve(self, website_url: str, website_key: str) -> CaptchaSolution:
+        task = await self._call(
+            "createTask",
+            {
+                "task": {
+                    "type": "RecaptchaV2TaskProxyless",
+                    "websiteURL": website_url,
+                    "websiteKey": website_key,
+                }
+            },
+        )
+        task_id = task["taskId"]
+        logger.info(f"Anti-captcha task {task_id} created")
+
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            result = await self._call("getTaskResult", {"taskId": task_id})
+            if result.get("status") == "ready":
+                return CaptchaSolution(
+                    token=result["solution"]["gRecaptchaResponse"],
+                    cost=float(result.get("cost", 0) or 0),
+                )
+
+
+class StubCaptchaSolver(CaptchaSolver):
+    """Local solver for tests and offline runs; returns a fixed token."""
+
+    def __init__(self, token: str = "stub-captcha-token", delay: float = 0.0):
+        self.token = token
+        self.delay = delay
+        self.calls = 0
+
+    async def solve(self, website_url: str, website_key: str) -> CaptchaSolution:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return CaptchaSolution(token=self.token)
+
+
+class CaptchaSolverPool:
+    """
+    Bounded pool of concurrent captcha solves.
+
+    ``max_concurrent`` is the global budget of captchas in flight within the
+    worker; extra requests wait for a free slot. Every solve is bounded by
+    ``timeout`` seconds and accounted in ``stats``.
+    """
+
+    def __init__(
+        self,
+        solver: CaptchaSolver,
+        max_concurrent: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.solver = solver
+        self.max_concurrent = max_concurrent or Config.CAPTCHA_MAX_CONCURRENT
+        self.timeout = timeout or Config.CAPTCHA_TIMEOUT
+        self.stats = CaptchaStats()
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+
+    async def solve(self, website_url: str, website_key: str) -> str:
+        """
+        Solve a captcha once a slot of the budget is free.
+
+        Args:
+            website_url: URL of the page showing the captcha
+            website_key: reCAPTCHA sitekey of the page
+
+        Returns:
+            The g-recaptcha-response token
+
+        Raises:
+            CaptchaError: If the solve fails or exceeds the timeout
+        """
+        async with self._slots:
+            self.stats.submitted += 1
+            self.stats.in_flight += 1
+            started = asyncio.get_running_loop().time()
+            try:
+                solution = await asyncio.wait_for(
+                    self.solver.solve(website_url, website_key), self.timeout
+                )
+            except asyncio.TimeoutError:
+                self.stats.timed_out += 1
+                raise CaptchaError(f"Captcha not solved within {self.timeout}s")
+            except Exception as e:
+                self.stats.failed += 1
+                if isinstance(e, CaptchaError):
+                    raise
+                raise CaptchaError(f"Captcha solving failed: {str(e)}")
+            finally:
+                self.stats.in_flight -= 1
+                self.stats.solve_seconds += asyncio.get_running_loop().time() - started
+
+            self.stats.solved += 1
+            self.stats.cost += solution.cost
+            return solution.token
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return the counters of this pool."""
+        return asdict(self.stats)
+
+    async def close(self) -> None:
+        """Close the solver of this pool."""
+        await self.solver.close()
+
+
+def create_captcha_solver() -> CaptchaSolver:
+    """Create the solver selected by ``CAPTCHA_SOLVER``."""
+    if Config.CAPTCHA_SOLVER == "stub":
+        return StubCaptchaSolver()
+    return AntiCaptchaSolver()
+
+
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, CaptchaSolverPool]" = (
+    weakref.WeakKeyDictionary()
+)
+# Counters of the pools already closed in this process
+_closed_stats = CaptchaStats()
+
+
+def get_captcha_metrics() -> Dict[str, Any]:
+    """Return the captcha solver counters of this process, over all pools."""
+    totals = asdict(_closed_stats)
+    for pool in list(_pools.values()):
+        for field in fields(CaptchaStats):
+            totals[field.name] += getattr(pool.stats, field.name)
+    return totals
+
+
+register_component_stats("captcha_solver", get_captcha_metrics)
+
+
+def get_captcha_pool() -> CaptchaSolverPool:
+    """Return the captcha solver pool bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = _pools[loop] = CaptchaSolverPool(create_captcha_solver())
+    return pool
+
+
+async def close_captcha_pool() -> None:
+    """Close the captcha pool bound to the running event loop, logging its stats."""
+    pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        logger.info(f"Captcha solver stats: {pool.get_stats()}")
+        for field in fields(CaptchaStats):
+            setattr(
+                _closed_stats,
+                field.name,
+                getattr(_closed_stats, field.name) + getattr(pool.stats, field.name),
+            )
+        await pool.close()
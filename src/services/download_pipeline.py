@@ -0,0 +1,116 @@
+import asyncio
+import contextvars
+import hashlib
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+from playwright.async_api import Download
+from playwright._impl._errors import TargetClosedError
+
+from src.core.metrics import time_stage
+
+logger = logging.getLogger(__name__)
+
+# Called with the local path and suggested filename of every unique download
+DownloadHandler = Callable[[str, str], Awaitable[None]]
+
+
+def file_digest(path: str, chunk_size: int = 64 * 1024) -> str:
+    """Return the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DownloadPipeline:
+    """
+    Per-job pipeline that processes page downloads concurrently.
+
+    Downloads may be submitted from several places (the page ``download``
+    listener, button loops, form submissions); each ``Download`` object is
+    handled once and files with identical content are handed to the handler
+    only the first time. At most ``max_parallel`` downloads are in flight;
+    producers call ``wait_for_capacity`` before triggering a new one.
+    Downloads that fail are logged and recorded in ``failures``.
+    """
+
+    def __init__(
+        self,
+        handler: DownloadHandler,
+        max_parallel: int,
+        metric_labels: Optional[Dict[str, str]] = None,
+    ):
+        self.handler = handler
+        self.max_parallel = max(1, max_parallel)
+        self.metric_labels = metric_labels or {}
+        # Downloads are reported from Playwright callbacks; run them in the
+        # job's context so they keep its trace
+        self._context = contextvars.copy_context()
+        self._tasks: Set[asyncio.Task] = set()
+        self._submitted: Set[Download] = set()
+        self._digests: Set[str] = set()
+        self.duplicates = 0
+        self.failures: List[Dict[str, str]] = []
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    async def wait_for_capacity(self) -> None:
+        """Block until fewer than ``max_parallel`` downloads are in flight."""
+        while len(self._tasks) >= self.max_parallel:
+            await asyncio.wait(set(self._tasks), return_when=asyncio.FIRST_COMPLETED)
+
+    def submit(self, download: Download) -> Optional[asyncio.Task]:
+        """
+        Schedule a download for processing.
+
+        Args:
+            download: Playwright download object
+
+        Returns:
+            The processing task, or None if the download was already submitted
+        """
+        if download in self._submitted:
+            return None
+        self._submitted.add(download)
+
+        task = asyncio.get_running_loop().create_task(
+            self._process(download), context=self._context.copy()
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _process(self, download: Download) -> None:
+        """Wait for the file, drop duplicate content and run the handler."""
+        filename = download.suggested_filename
+        try:
+            # Resolves once the file is fully written
+            with time_stage("download", **self.metric_labels):
+                path = str(await download.path())
+            digest = await asyncio.to_thread(file_digest, path)
+
+            if digest in self._digests:
+                self.duplicates += 1
+                logger.info(f"Skipping duplicate download: {filename}")
+                return
+            self._digests.add(digest)
+
+            await self.handler(path, filename)
+
+        except TargetClosedError:
+            logger.error("Target closed before download could complete")
+            self.failures.append(
+                {"filename": filename, "error": "Target closed before completion"}
+            )
+        except Exception as e:
+            logger.error(f"Error processing download {filename}: {str(e)}")
+            self.failures.append({"filename": filename, "error": str(e)})
+
+    async def drain(self) -> None:
+        """Wait until every submitted download has been processed."""
+        while self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
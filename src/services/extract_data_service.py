@@ -1,6 +1,7 @@
 import json
 import os, logging
 from typing import List, Dict, Any, Optional
+from src.core.tracing import traced
 from src.services.http_client import MainServiceClient
 from src.services.bill_service import BillService
 from src.utils.process_utility_bill_pdf import process_utility_bill_pdf
@@ -20,6 +21,7 @@ class ExtractDataService:
         self.bill_service = BillService()
         self.processed_data: List[Dict] = []
 
+    @traced("extract.process_bills")
     async def process_bills(self, user_service_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Process bills for a given user service.
@@ -205,6 +207,7 @@ class ExtractDataService:
             logger.error(f"Error converting data to JSON: {str(e)}")
             raise
 
+    @traced("extract.save_processed_data")
     async def _save_processed_data(self, user_service_id: int) -> str:
         """
         Save processed data to the backend.
@@ -1,15 +1,146 @@
-from typing import Optional, Any, Dict, Union, List
+from dataclasses import asdict, dataclass
+from typing import Optional, Any, Awaitable, Callable, Dict, Union, List
+import asyncio
+import importlib.util
 import logging
+import re
+import time
+import weakref
 import httpx
 from fastapi import HTTPException
 from src.core.errors import HTTPClientError
 from src.core.config import Config
+from src.core.metrics import (
+    BACKEND_BYTES_TOTAL,
+    BACKEND_REQUEST_SECONDS,
+    register_component_stats,
+)
+from src.core.tracing import TRACEPARENT_HEADER, current_traceparent, span
+from src.services.backend_cache import cached_read, invalidate
+from src.services.snapshot_cache import SnapshotCache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class ClientMetrics:
+    """Usage counters of the shared backend HTTP client."""
+
+    requests: int = 0
+    connections_opened: int = 0
+    clients_created: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+
+    @property
+    def connections_reused(self) -> int:
+        """Requests served over an already open connection."""
+        return max(self.requests - self.connections_opened, 0)
+
+
+_metrics = ClientMetrics()
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _create_client() -> httpx.AsyncClient:
+    """Create a keep-alive client with the configured pool limits."""
+    http2 = Config.HTTP_CLIENT_HTTP2
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP/2 requested but the h2 package is missing")
+        http2 = False
+
+    _metrics.clients_created += 1
+    return httpx.AsyncClient(
+        http2=http2,
+        follow_redirects=True,
+        limits=httpx.Limits(
+            max_connections=Config.HTTP_CLIENT_MAX_CONNECTIONS,
+            max_keepalive_connections=Config.HTTP_CLIENT_MAX_KEEPALIVE,
+            keepalive_expiry=Config.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """Return the pooled client bound to the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = _create_client()
+    return client
+
+
+async def close_shared_client() -> None:
+    """Close the pooled client bound to the running event loop, if any."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        logger.info(f"Closing backend HTTP client: {get_client_metrics()}")
+        await client.aclose()
+
+
+def get_client_metrics() -> Dict[str, Any]:
+    """Return connection reuse counters and the pool usage of this process."""
+    metrics = asdict(_metrics)
+    metrics["connections_reused"] = _metrics.connections_reused
+    metrics["pool_connections"] = 0
+    metrics["pool_idle_connections"] = 0
+
+    for client in list(_clients.values()):
+        try:
+            connections = client._transport._pool.connections
+        except AttributeError:
+            continue
+        metrics["pool_connections"] += len(connections)
+        metrics["pool_idle_connections"] += sum(
+            1 for connection in connections if connection.is_idle()
+        )
+    return metrics
+
+
+register_component_stats("http_client", get_client_metrics)
+
+
+def _endpoint_label(url: str) -> str:
+    """Endpoint path with numeric IDs collapsed, to keep label cardinality low."""
+    path = httpx.URL(url).path.rstrip("/") or "/"
+    return re.sub(r"/\d+(?=/|$)", "/{id}", path)
+
+
+def _count_bytes(method: str, url: str, response: httpx.Response) -> None:
+    """Add the request and response body sizes to the byte counters."""
+    sent = len(response.request.content)
+    received = len(response.content)
+    _metrics.bytes_sent += sent
+    _metrics.bytes_received += received
+    endpoint = _endpoint_label(url)
+    BACKEND_BYTES_TOTAL.labels(method.upper(), endpoint, "sent").inc(sent)
+    BACKEND_BYTES_TOTAL.labels(method.upper(), endpoint, "received").inc(received)
+
+
+def _scrapped_data_tag_of_user_service(user_service_id: int) -> str:
+    return f"user-service:{user_service_id}:scrapped-data"
+
+
+def _scrapped_data_tags(scrapped_data: Any) -> List[str]:
+    """Cache tags of the scrapped data entries in a backend response."""
+    entries = scrapped_data if isinstance(scrapped_data, list) else [scrapped_data]
+    return [
+        f"scrapped-data:{entry['id']}"
+        for entry in entries
+        if isinstance(entry, dict) and entry.get("id") is not None
+    ]
+
+
+async def _trace_connections(event_name: str, info: Dict[str, Any]) -> None:
+    """httpcore trace hook counting new connections."""
+    if event_name == "connection.connect_tcp.complete":
+        _metrics.connections_opened += 1
+
+
 class MainServiceClient:
     """Client for interacting with the main microservice."""
 
@@ -19,7 +150,8 @@ class MainServiceClient:
         self.headers = {
             "X-Internal-API-Key": Config.INTERNAL_API_KEY,
             "Content-Type": "application/json",
-        }       
+        }
+        self.snapshot_cache = SnapshotCache()
 
     async def _make_request(
         self,
@@ -44,11 +176,18 @@ class MainServiceClient:
             HTTPClientError: If the request fails
         """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        started = time.perf_counter()
+        status = "error"
 
-        try:
-            async with httpx.AsyncClient(
-                timeout=self.timeout, headers=self.headers, follow_redirects=True
-            ) as client:
+        with span(
+            "backend.request", method=method.upper(), endpoint=_endpoint_label(url)
+        ) as request_span:
+            headers = dict(self.headers)
+            traceparent = current_traceparent()
+            if traceparent:
+                headers[TRACEPARENT_HEADER] = traceparent
+            try:
+                client = get_shared_client()
                 logger.info(f"Making {method} request to {url}")
 
                 request_kwargs = {}
@@ -57,42 +196,79 @@ class MainServiceClient:
                 if params is not None:
                     request_kwargs["params"] = params
 
-                response = await getattr(client, method.lower())(url, **request_kwargs)
-
-                # Handle redirects
-                if response.status_code == 307:
-                    redirect_url = response.headers.get("location")
-                    logger.info(f"Following redirect to {redirect_url}")
-                    return await self._make_request(method, redirect_url, data, params)
+                _metrics.requests += 1
+                response = await client.request(
+                    method.upper(),
+                    url,
+                    headers=headers,
+                    timeout=self.timeout,
+                    extensions={"trace": _trace_connections},
+                    **request_kwargs,
+                )
+                status = str(response.status_code)
+                request_span.set_attribute("status", status)
+                _count_bytes(method, url, response)
 
                 # Raise for bad responses
                 response.raise_for_status()
 
                 return response.json()
 
-        except httpx.HTTPStatusError as e:
-            error_msg = f"HTTP error occurred: {str(e)}"
-            logger.error(error_msg)
-            if e.response.status_code == 403:
-                raise HTTPException(
-                    status_code=403, detail="Service authentication failed"
-                )
-            raise HTTPClientError(error_msg, e.response.status_code, e.response)
+            except httpx.HTTPStatusError as e:
+                error_msg = f"HTTP error occurred: {str(e)}"
+                logger.error(error_msg)
+                if e.response.status_code == 403:
+                    raise HTTPException(
+                        status_code=403, detail="Service authentication failed"
+                    )
+                raise HTTPClientError(error_msg, e.response.status_code, e.response)
+
+            except httpx.RequestError as e:
+                error_msg = f"Request error occurred: {str(e)}"
+                logger.error(error_msg)
+                raise HTTPClientError(error_msg)
 
-        except httpx.RequestError as e:
-            error_msg = f"Request error occurred: {str(e)}"
-            logger.error(error_msg)
-            raise HTTPClientError(error_msg)
+            except Exception as e:
+                error_msg = f"Unexpected error occurred: {str(e)}"
+                logger.error(error_msg)
+                raise HTTPClientError(error_msg)
+
+            finally:
+                BACKEND_REQUEST_SECONDS.labels(
+                    method.upper(), _endpoint_label(url), status
+                ).observe(time.perf_counter() - started)
+
+    async def _shared_read(
+        self,
+        name: str,
+        loader: Callable[[], Awaitable[Any]],
+        tags: List[str],
+        tags_of: Optional[Callable[[Any], List[str]]] = None,
+    ) -> Any:
+        """Read through the snapshot cache shared by all workers, if enabled."""
+        if not Config.BACKEND_SNAPSHOT_CACHE_ENABLED:
+            return await loader()
+        return await self.snapshot_cache.get_or_load(name, loader, tags, tags_of)
 
-        except Exception as e:
-            error_msg = f"Unexpected error occurred: {str(e)}"
-            logger.error(error_msg)
-            raise HTTPClientError(error_msg)
+    async def _invalidate(self, tag: str) -> None:
+        """Drop cached reads tagged ``tag`` after a write."""
+        invalidate(tag)
+        if Config.BACKEND_SNAPSHOT_CACHE_ENABLED:
+            await self.snapshot_cache.invalidate(tag)
 
     # User Service Methods
     async def get_user_service(self, user_service_id: int) -> Dict:
-        """Get user service by ID."""
-        return await self._make_request("GET", f"user-service/{user_service_id}")
+        """Get user service by ID, memoized within the current job."""
+        tags = [f"user-service:{user_service_id}"]
+        return await cached_read(
+            ("user-service", user_service_id),
+            lambda: self._shared_read(
+                f"user-service:{user_service_id}",
+                lambda: self._make_request("GET", f"user-service/{user_service_id}"),
+                tags,
+            ),
+            tags=tags,
+        )
 
     async def get_user_services_by_service(self, service_id: int) -> List[Dict]:
         """Get all user services for a service ID."""
@@ -100,9 +276,25 @@ class MainServiceClient:
 
     # Scrapped Data Methods
     async def get_scrapped_data(self, user_service_id: int) -> Union[Dict, List[Dict]]:
-        """Get scrapped data for a user service."""
-        return await self._make_request(
-            "GET", f"scrapped-data/user-service/{user_service_id}"
+        """
+        Get scrapped data for a user service, memoized within the current job.
+
+        The result is shared with other readers of the job and must not be
+        modified. Writes through this client invalidate it.
+        """
+        tags = [_scrapped_data_tag_of_user_service(user_service_id)]
+        return await cached_read(
+            ("scrapped-data", user_service_id),
+            lambda: self._shared_read(
+                f"scrapped-data:user-service:{user_service_id}",
+                lambda: self._make_request(
+                    "GET", f"scrapped-data/user-service/{user_service_id}"
+                ),
+                tags,
+                _scrapped_data_tags,
+            ),
+            tags=tags,
+            tags_of=_scrapped_data_tags,
         )
 
     async def create_scrapped_data(
@@ -119,7 +311,10 @@ class MainServiceClient:
             "consumption_data": consumption_data or {},
             "debt": debt,
         }
-        return await self._make_request("POST", "scrapped-data", data)
+        try:
+            return await self._make_request("POST", "scrapped-data", data)
+        finally:
+            await self._invalidate(_scrapped_data_tag_of_user_service(user_service_id))
 
     async def update_scrapped_data(
         self,
@@ -137,9 +332,43 @@ class MainServiceClient:
         if debt is not None:
             data["debt"] = debt
 
-        return await self._make_request(
-            "PATCH", f"scrapped-data/{scrapped_data_id}", data
-        )
+        try:
+            return await self._make_request(
+                "PATCH", f"scrapped-data/{scrapped_data_id}", data
+            )
+        finally:
+            await self._invalidate(f"scrapped-data:{scrapped_data_id}")
+
+    async def append_scrapped_bills(
+        self,
+        scrapped_data_id: int,
+        bills: List[Dict],
+        expected_count: int,
+        debt: Optional[bool] = None,
+    ) -> Dict:
+        """
+        Append bills to existing scrapped data without re-sending stored ones.
+
+        Args:
+            scrapped_data_id: Scrapped data to append to
+            bills: New bills only
+            expected_count: Number of bills the caller read; the backend
+                answers 409 if it holds a different number (concurrent write)
+            debt: Debt status to store, unchanged if None
+
+        Raises:
+            HTTPClientError: With status code 409 on a version conflict
+        """
+        data = {"bills_url": bills, "expected_count": expected_count}
+        if debt is not None:
+            data["debt"] = debt
+
+        try:
+            return await self._make_request(
+                "POST", f"scrapped-data/{scrapped_data_id}/bills", data
+            )
+        finally:
+            await self._invalidate(f"scrapped-data:{scrapped_data_id}")
 
     # Service Methods
     async def get_services(self) -> List[Dict]:
@@ -0,0 +1,116 @@
+import hashlib
+import json
+import logging
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+import redis.asyncio as redis
+
+from src.core.config import Config
+from src.core.metrics import register_component_stats
+from src.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Delete the key only while it still holds the releasing job's task ID
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass
+class InflightJobsMetrics:
+    """Counters of scrape job deduplication in this process."""
+
+    claims: int = 0
+    duplicates: int = 0
+    releases: int = 0
+    errors: int = 0
+
+
+_metrics = InflightJobsMetrics()
+
+
+def get_inflight_jobs_metrics() -> Dict[str, Any]:
+    """Return the job deduplication counters of this process."""
+    return asdict(_metrics)
+
+
+register_component_stats("inflight_jobs", get_inflight_jobs_metrics)
+
+
+def job_key(data: Dict[str, Any]) -> Optional[str]:
+    """
+    Deduplication key of a scrape request.
+
+    Requests for the same user service collapse onto one job; with
+    SCRAP_DEDUP_BY_CONFIG they must also share the same scraping config.
+
+    Returns:
+        The key, or None if the request names no user service
+    """
+    user_service_id = (data.get("user_service") or {}).get("id")
+    if user_service_id is None:
+        return None
+    key = f"scrap:inflight:{user_service_id}"
+    if Config.SCRAP_DEDUP_BY_CONFIG:
+        config = (data.get("service") or {}).get("scraping_config")
+        encoded = json.dumps(config, sort_keys=True, default=str).encode()
+        key = f"{key}:{hashlib.sha256(encoded).hexdigest()[:16]}"
+    return key
+
+
+class InflightJobs:
+    """
+    Redis leases of running scrape jobs, one per deduplication key.
+
+    A submission claims the key with its task ID; later submissions with the
+    same key get the running job's task ID instead of enqueuing another job.
+    The job releases the key when it ends, and the lease expires after
+    ``lease`` seconds in case it never does. Redis errors are logged and let
+    the submission through so scraping never depends on deduplication.
+    """
+
+    def __init__(
+        self, client: Optional[redis.Redis] = None, lease: Optional[int] = None
+    ):
+        self.client = client
+        self.lease = lease or Config.SCRAP_DEDUP_LEASE
+
+    def _redis(self) -> redis.Redis:
+        return self.client or get_redis()
+
+    async def claim(self, key: str, task_id: str) -> Optional[str]:
+        """
+        Claim ``key`` for the job ``task_id``.
+
+        Returns:
+            Task ID of the job already holding the key, or None if the claim
+            succeeded (or Redis is unavailable)
+        """
+        try:
+            # A lease expiring between SET and GET leaves the key free again
+            for _ in range(2):
+                if await self._redis().set(key, task_id, nx=True, ex=self.lease):
+                    _metrics.claims += 1
+                    return None
+                running = await self._redis().get(key)
+                if running is not None:
+                    _metrics.duplicates += 1
+                    return running
+        except Exception as e:
+            _metrics.errors += 1
+            logger.warning(f"Job deduplication claim failed: {str(e)}")
+        return None
+
+    async def release(self, key: str, task_id: str) -> None:
+        """Release ``key`` if it is still held by the job ``task_id``."""
+        try:
+            if await self._redis().eval(RELEASE_SCRIPT, 1, key, task_id):
+                _metrics.releases += 1
+        except Exception as e:
+            _metrics.errors += 1
+            logger.warning(f"Job deduplication release failed: {str(e)}")
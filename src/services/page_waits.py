@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import re
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional
+
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# Signals resolved by events fired after the action starts
+EVENT_SIGNALS = {"download", "download_started", "navigation", "response"}
+# Signals resolved by the page load state once the action ran
+LOAD_STATE_SIGNALS = {"load", "domcontentloaded", "networkidle"}
+# Bound used when a wait has no positive timeout (milliseconds); 0 would mean
+# "no limit" to Playwright and "give up at once" to asyncio
+DEFAULT_WAIT_TIMEOUT = 2000
+
+
+@dataclass
+class WaitCondition:
+    """
+    Signal that ends the wait after an action.
+
+    ``timeout`` (milliseconds) is only an upper bound: the wait returns as soon
+    as the signal arrives. Missing or non-positive timeouts become
+    DEFAULT_WAIT_TIMEOUT. ``url`` is a regular expression matched against the
+    navigated frame or the response URL.
+
+    Sequence entries configure it through an optional ``wait`` key, either a
+    signal name (``"wait": "networkidle"``) or a dict such as
+    ``{"for": "response", "url": "facturas", "timeout": 8000}``. Supported
+    signals: download, download_started, navigation, response, load,
+    domcontentloaded, networkidle, sleep and none.
+    """
+
+    kind: str = "none"
+    timeout: float = DEFAULT_WAIT_TIMEOUT
+    url: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if not self.timeout or self.timeout <= 0:
+            self.timeout = DEFAULT_WAIT_TIMEOUT
+
+    @classmethod
+    def from_action(
+        cls, action: Dict[str, Any], default: "WaitCondition"
+    ) -> "WaitCondition":
+        """Build the wait condition of a sequence entry, falling back to ``default``."""
+        spec = action.get("wait")
+        if spec is None:
+            return default
+        if isinstance(spec, str):
+            return cls(kind=spec, timeout=default.timeout, url=default.url)
+        return cls(
+            kind=spec.get("for", default.kind),
+            timeout=spec.get("timeout", default.timeout),
+            url=spec.get("url", default.url),
+        )
+
+    def matches_url(self, url: str) -> bool:
+        return self.url is None or re.search(self.url, url) is not None
+
+
+async def _wait_for_event(page: Page, condition: WaitCondition) -> None:
+    """Wait for an event based signal; the caller bounds the wait."""
+    if condition.kind in ("download", "download_started"):
+        download = await page.wait_for_event("download", timeout=0)
+        if condition.kind == "download":
+            # Resolves once the file is fully written
+            await download.path()
+    elif condition.kind == "navigation":
+        await page.wait_for_event(
+            "framenavigated",
+            predicate=lambda frame: frame == page.main_frame
+            and condition.matches_url(frame.url),
+            timeout=0,
+        )
+    elif condition.kind == "response":
+        await page.wait_for_event(
+            "response",
+            predicate=lambda response: condition.matches_url(response.url),
+            timeout=0,
+        )
+
+
+@asynccontextmanager
+async def wait_for_signal(page: Page, condition: WaitCondition) -> AsyncIterator[None]:
+    """
+    Arm ``condition`` before the wrapped action and wait for it afterwards.
+
+    Args:
+        page: Playwright page the action runs on
+        condition: Signal to wait for, bounded by its timeout
+    """
+    waiter = None
+    if condition.kind in EVENT_SIGNALS:
+        waiter = asyncio.ensure_future(_wait_for_event(page, condition))
+
+    try:
+        yield
+        await settle(page, condition, waiter)
+    finally:
+        if waiter is not None and not waiter.done():
+            waiter.cancel()
+
+
+async def settle(
+    page: Page, condition: WaitCondition, waiter: Optional[asyncio.Future] = None
+) -> None:
+    """Wait until the signal arrives or its timeout expires."""
+    timeout = condition.timeout / 1000
+    try:
+        if waiter is not None:
+            await asyncio.wait_for(waiter, timeout)
+        elif condition.kind in LOAD_STATE_SIGNALS:
+            await page.wait_for_load_state(condition.kind, timeout=condition.timeout)
+        elif condition.kind == "sleep":
+            await asyncio.sleep(timeout)
+    except (asyncio.TimeoutError, PlaywrightTimeoutError):
+        logger.info(
+            f"No '{condition.kind}' signal within {condition.timeout}ms, continuing"
+        )
+    except Exception as e:
+        logger.warning(f"Error waiting for '{condition.kind}' signal: {str(e)}")
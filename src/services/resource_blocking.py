@@ -0,0 +1,215 @@
+import logging
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, FrozenSet, Optional, Union
+
+from playwright.async_api import BrowserContext, Response, Route
+
+logger = logging.getLogger(__name__)
+
+# Resource types a profile can never block: the sequence depends on them
+REQUIRED_TYPES = frozenset({"document", "script", "xhr", "fetch"})
+
+# URLs that are always let through, e.g. the bills the sequence downloads
+ALWAYS_ALLOWED_URLS = (r"\.pdf(\?|#|$)",)
+
+ANALYTICS_URLS = (
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"doubleclick\.net",
+    r"connect\.facebook\.net",
+    r"hotjar\.com",
+    r"clarity\.ms",
+    r"youtube\.com/embed",
+)
+
+# Typical transfer size per blocked resource type. Blocked requests never
+# reach the network, so their size is unknown: savings are estimated from it
+ESTIMATED_BYTES = {
+    "image": 40_000,
+    "media": 500_000,
+    "font": 30_000,
+    "stylesheet": 20_000,
+    "script": 60_000,
+}
+DEFAULT_ESTIMATED_BYTES = 10_000
+
+# Bodies served for stubbed resources
+STUB_CONTENT_TYPES = {
+    "stylesheet": "text/css",
+    "script": "application/javascript",
+    "image": "image/gif",
+}
+
+
+@dataclass(frozen=True)
+class ResourceProfile:
+    """
+    Rules deciding which requests of a portal reach the network.
+
+    Requests whose resource type is in ``block_types`` or whose URL matches
+    ``block_urls`` are aborted; those in ``stub_types`` get an empty 200
+    response so pages waiting on them keep working. ``allow_urls`` and PDF
+    URLs always pass, and documents, scripts and XHR are never blocked by type.
+    """
+
+    name: str
+    block_types: FrozenSet[str] = frozenset()
+    stub_types: FrozenSet[str] = frozenset()
+    block_urls: tuple = ()
+    allow_urls: tuple = ()
+
+    @property
+    def blocks_anything(self) -> bool:
+        return bool(self.block_types or self.stub_types or self.block_urls)
+
+    def decide(self, resource_type: str, url: str) -> str:
+        """Return "continue", "block" or "stub" for a request."""
+        if any(re.search(p, url) for p in (*ALWAYS_ALLOWED_URLS, *self.allow_urls)):
+            return "continue"
+        if any(re.search(pattern, url) for pattern in self.block_urls):
+            return "block"
+        if resource_type in REQUIRED_TYPES:
+            return "continue"
+        if resource_type in self.stub_types:
+            return "stub"
+        if resource_type in self.block_types:
+            return "block"
+        return "continue"
+
+    @classmethod
+    def from_config(
+        cls, spec: Optional[Union[str, Dict[str, Any]]]
+    ) -> "ResourceProfile":
+        """
+        Build the profile of a service from its scraping config.
+
+        Args:
+            spec: Profile name, or a dict with an optional ``base`` profile
+                name plus ``block_types``, ``stub_types``, ``block_urls`` and
+                ``allow_urls`` lists extending it
+
+        Returns:
+            The resolved profile; no blocking when ``spec`` is empty
+        """
+        if not spec:
+            return RESOURCE_PROFILES["none"]
+        if isinstance(spec, str):
+            if spec not in RESOURCE_PROFILES:
+                logger.warning(f"Unknown resource profile '{spec}', not blocking")
+                return RESOURCE_PROFILES["none"]
+            return RESOURCE_PROFILES[spec]
+
+        base = cls.from_config(spec.get("base", "none"))
+        return cls(
+            name=spec.get("name", f"{base.name}+custom"),
+            block_types=base.block_types
+            | (frozenset(spec.get("block_types", ())) - REQUIRED_TYPES),
+            stub_types=base.stub_types
+            | (frozenset(spec.get("stub_types", ())) - REQUIRED_TYPES),
+            block_urls=(*base.block_urls, *spec.get("block_urls", ())),
+            allow_urls=(*base.allow_urls, *spec.get("allow_urls", ())),
+        )
+
+
+RESOURCE_PROFILES: Dict[str, ResourceProfile] = {
+    "none": ResourceProfile(name="none"),
+    # Skip heavy assets and trackers, keep the layout
+    "lean": ResourceProfile(
+        name="lean",
+        block_types=frozenset({"image", "media", "font"}),
+        block_urls=ANALYTICS_URLS,
+    ),
+    # Also serve empty stylesheets, for portals that only need the DOM
+    "strict": ResourceProfile(
+        name="strict",
+        block_types=frozenset({"image", "media", "font", "texttrack", "manifest"}),
+        stub_types=frozenset({"stylesheet"}),
+        block_urls=ANALYTICS_URLS,
+    ),
+}
+
+
+@dataclass
+class ResourceStats:
+    """
+    Network savings and page readiness of a single scraping job.
+
+    ``bytes_received`` is measured from the Content-Length of the responses
+    the page got; compare it between profiles to measure savings.
+    ``bytes_saved_estimate`` is not measured: it adds ESTIMATED_BYTES per
+    blocked or stubbed request.
+    """
+
+    profile: str = "none"
+    requests: int = 0
+    blocked: int = 0
+    stubbed: int = 0
+    bytes_received: int = 0
+    bytes_saved_estimate: int = 0
+    blocked_by_type: Dict[str, int] = field(default_factory=dict)
+    time_to_first_selector_ms: Optional[float] = None
+
+    def record(self, resource_type: str, decision: str) -> None:
+        self.requests += 1
+        if decision == "continue":
+            return
+        if decision == "block":
+            self.blocked += 1
+        else:
+            self.stubbed += 1
+        self.blocked_by_type[resource_type] = (
+            self.blocked_by_type.get(resource_type, 0) + 1
+        )
+        self.bytes_saved_estimate += ESTIMATED_BYTES.get(
+            resource_type, DEFAULT_ESTIMATED_BYTES
+        )
+
+    def record_response(self, response: Response) -> None:
+        try:
+            self.bytes_received += int(response.headers.get("content-length", 0))
+        except ValueError:
+            pass
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+async def apply_resource_profile(
+    context: BrowserContext, profile: ResourceProfile, stats: ResourceStats
+) -> None:
+    """
+    Route every request of a browser context through ``profile``.
+
+    Args:
+        context: Leased browser context of the job
+        profile: Blocking rules of the service
+        stats: Per-job counters updated for every request and response
+    """
+    stats.profile = profile.name
+    # Measured with every profile, so profiles can be compared
+    context.on("response", stats.record_response)
+    if not profile.blocks_anything:
+        return
+
+    async def handle(route: Route) -> None:
+        request = route.request
+        decision = profile.decide(request.resource_type, request.url)
+        stats.record(request.resource_type, decision)
+        try:
+            if decision == "block":
+                await route.abort("blockedbyclient")
+            elif decision == "stub":
+                await route.fulfill(
+                    status=200,
+                    body="",
+                    content_type=STUB_CONTENT_TYPES.get(
+                        request.resource_type, "text/plain"
+                    ),
+                )
+            else:
+                await route.continue_()
+        except Exception as e:
+            logger.debug(f"Routing {request.url} failed: {str(e)}")
+
+    await context.route("**/*", handle)
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import logging
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+import redis.asyncio as redis
+
+from src.core.config import Config
+from src.core.metrics import register_component_stats
+from src.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SessionCacheMetrics:
+    """Counters of the session cache in this process."""
+
+    hits: int = 0
+    misses: int = 0
+    invalid: int = 0
+    stores: int = 0
+    errors: int = 0
+    captchas_avoided: int = 0
+
+
+_metrics = SessionCacheMetrics()
+
+
+def get_session_cache_metrics() -> Dict[str, Any]:
+    """Return the session cache counters of this process."""
+    return asdict(_metrics)
+
+
+register_component_stats("session_cache", get_session_cache_metrics)
+
+
+class SessionCache:
+    """
+    Redis store of Playwright storage states per service and customer.
+
+    A stored state (cookies and localStorage) lets a new browser context resume
+    a logged-in session. Entries expire after ``ttl`` seconds and are dropped
+    as soon as a restored session fails its probe. Redis errors are logged and
+    treated as a miss so scraping never depends on the cache.
+    """
+
+    def __init__(self, client: Optional[redis.Redis] = None, ttl: Optional[int] = None):
+        self.client = client
+        self.ttl = ttl or Config.SESSION_CACHE_TTL
+
+    def _redis(self) -> redis.Redis:
+        return self.client or get_redis()
+
+    @staticmethod
+    def key(service_id: str, customer_number: str) -> str:
+        """Cache key; the customer number is hashed to keep it out of Redis."""
+        customer = hashlib.sha256(str(customer_number).encode()).hexdigest()[:24]
+        return f"scrap:session:{service_id}:{customer}"
+
+    async def load(
+        self, service_id: str, customer_number: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the stored storage state of a customer, if any.
+
+        Args:
+            service_id: Service the session belongs to
+            customer_number: Customer logged in on the portal
+
+        Returns:
+            Playwright storage state, or None on a miss. A value that is not
+            a JSON object is deleted and counted as a miss.
+        """
+        key = self.key(service_id, customer_number)
+        try:
+            raw = await self._redis().get(key)
+        except Exception as e:
+            _metrics.errors += 1
+            logger.warning(f"Session cache read failed: {str(e)}")
+            raw = None
+
+        if raw is None:
+            _metrics.misses += 1
+            return None
+
+        try:
+            state = json.loads(raw)
+        except ValueError:
+            state = None
+        if not isinstance(state, dict):
+            _metrics.errors += 1
+            _metrics.misses += 1
+            logger.warning(f"Dropping undecodable session state {key}")
+            await self.invalidate(service_id, customer_number)
+            return None
+        return state
+
+    async def store(
+        self, service_id: str, customer_number: str, state: Dict[str, Any]
+    ) -> None:
+        """Store the storage state of a customer for ``ttl`` seconds."""
+        try:
+            await self._redis().set(
+                self.key(service_id, customer_number), json.dumps(state), ex=self.ttl
+            )
+            _metrics.stores += 1
+        except Exception as e:
+            _metrics.errors += 1
+            logger.warning(f"Session cache write failed: {str(e)}")
+
+    async def invalidate(self, service_id: str, customer_number: str) -> None:
+        """Drop the stored state of a customer."""
+        try:
+            await self._redis().delete(self.key(service_id, customer_number))
+        except Exception as e:
+            _metrics.errors += 1
+            logger.warning(f"Session cache delete failed: {str(e)}")
+
+    @staticmethod
+    def record_hit(captcha: bool) -> None:
+        """Count a restored session that passed its probe."""
+        _metrics.hits += 1
+        if captcha:
+            _metrics.captchas_avoided += 1
+
+    @staticmethod
+    def record_invalid() -> None:
+        """Count a restored session that failed its probe."""
+        _metrics.invalid += 1
@@ -0,0 +1,287 @@
+import asyncio
+import logging
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import urlparse
+
+import redis.asyncio as redis
+
+from src.core.config import Config
+from src.core.errors import ScrapingError
+from src.core.metrics import register_component_stats
+from src.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+# Lower ranks are served first; ties are served in arrival order
+PRIORITY_RANKS = {PRIORITY_INTERACTIVE: 0, PRIORITY_BATCH: 1}
+
+# Refill a token bucket and take one token. Returns 0 when a token was taken,
+# otherwise the milliseconds until one is available.
+TOKEN_BUCKET_SCRIPT = """
+local now = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local burst = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate / 1000)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) * 1000 / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst * 1000 / rate) + 1000)
+return wait
+"""
+
+# Take a concurrency slot for the waiter at the head of the fair queue.
+# KEYS: slots, queue, heartbeats. Slots and heartbeats are scored by expiry
+# and last poll; the queue is scored by priority rank and arrival time.
+SLOT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local slot_ttl = tonumber(ARGV[3])
+local waiter = ARGV[4]
+local score = tonumber(ARGV[5])
+local stale = tonumber(ARGV[6])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+for _, gone in ipairs(redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', now - stale)) do
+    redis.call('ZREM', KEYS[2], gone)
+    redis.call('ZREM', KEYS[3], gone)
+end
+redis.call('ZADD', KEYS[2], 'NX', score, waiter)
+redis.call('ZADD', KEYS[3], now, waiter)
+local acquired = 0
+local free = limit - redis.call('ZCARD', KEYS[1])
+if free > 0 and redis.call('ZRANK', KEYS[2], waiter) < free then
+    redis.call('ZREM', KEYS[2], waiter)
+    redis.call('ZREM', KEYS[3], waiter)
+    redis.call('ZADD', KEYS[1], now + slot_ttl, waiter)
+    acquired = 1
+end
+for i = 1, 3 do
+    redis.call('PEXPIRE', KEYS[i], slot_ttl)
+end
+return acquired
+"""
+
+# Push back the expiry of a held slot. Returns 0 if the slot was already lost.
+REFRESH_SLOT_SCRIPT = """
+if not redis.call('ZSCORE', KEYS[1], ARGV[1]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], tonumber(ARGV[2]) + tonumber(ARGV[3]), ARGV[1])
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+
+def site_host(url: str) -> str:
+    """Return the host a scraping URL is limited by."""
+    return urlparse(url).netloc
+
+
+@dataclass
+class SiteLimiterMetrics:
+    """Counters of the per-site limiter in this process."""
+
+    slots_acquired: int = 0
+    slot_wait_seconds: float = 0.0
+    slots_lost: int = 0
+    throttled: int = 0
+    throttle_wait_seconds: float = 0.0
+    errors: int = 0
+
+
+_metrics = SiteLimiterMetrics()
+
+
+def get_site_limiter_metrics() -> Dict[str, Any]:
+    """Return the site limiter counters of this process."""
+    return asdict(_metrics)
+
+
+register_component_stats("site_limiter", get_site_limiter_metrics)
+
+
+class SiteLimiter:
+    """
+    Redis backed limiter shared by every worker hitting the same portal.
+
+    ``slot`` caps the jobs running against a host at once. Waiters queue by
+    priority and then arrival, so interactive requests are served before
+    batch jobs and jobs of the same priority are served in order; waiters
+    that stop polling drop out of the queue. Held slots are refreshed every
+    third of SITE_SLOT_TTL, so they only expire when their worker died.
+    ``throttle`` is a token bucket
+    spacing out navigations, form submits and downloads. If Redis is
+    unavailable the limiter lets requests through rather than failing jobs.
+    """
+
+    def __init__(self, client: Optional[redis.Redis] = None):
+        self.client = client
+        self.poll_interval = Config.SITE_LIMITER_POLL_INTERVAL
+
+    def _redis(self) -> redis.Redis:
+        return self.client or get_redis()
+
+    @staticmethod
+    def _now_ms() -> int:
+        return int(time.time() * 1000)
+
+    async def _eval(self, script: str, keys: list, args: list) -> int:
+        return int(await self._redis().eval(script, len(keys), *keys, *args))
+
+    async def _try_acquire(
+        self, host: str, waiter: str, limit: int, score: float
+    ) -> bool:
+        keys = [
+            f"scrap:site:{host}:slots",
+            f"scrap:site:{host}:queue",
+            f"scrap:site:{host}:heartbeats",
+        ]
+        stale_ms = int(max(self.poll_interval * 10, 2) * 1000)
+        acquired = await self._eval(
+            SLOT_SCRIPT,
+            keys,
+            [
+                self._now_ms(),
+                limit,
+                self._slot_ttl_ms(),
+                waiter,
+                score,
+                stale_ms,
+            ],
+        )
+        return acquired == 1
+
+    @staticmethod
+    def _slot_ttl_ms() -> int:
+        return int(Config.SITE_SLOT_TTL * 1000)
+
+    async def _keep_alive(self, host: str, waiter: str) -> None:
+        """Refresh the expiry of a held slot until cancelled."""
+        while True:
+            await asyncio.sleep(Config.SITE_SLOT_TTL / 3)
+            try:
+                held = await self._eval(
+                    REFRESH_SLOT_SCRIPT,
+                    [f"scrap:site:{host}:slots"],
+                    [waiter, self._now_ms(), self._slot_ttl_ms()],
+                )
+            except Exception as e:
+                _metrics.errors += 1
+                logger.warning(f"Could not refresh site slot of {host}: {str(e)}")
+                continue
+            if not held:
+                _metrics.slots_lost += 1
+                logger.warning(f"Site slot of {host} expired while held")
+                return
+
+    async def _release(self, host: str, waiter: str) -> None:
+        try:
+            await self._redis().zrem(f"scrap:site:{host}:slots", waiter)
+        except Exception as e:
+            _metrics.errors += 1
+            logger.warning(f"Could not release site slot of {host}: {str(e)}")
+
+    @asynccontextmanager
+    async def slot(
+        self, host: str, limit: int, priority: str = PRIORITY_INTERACTIVE
+    ) -> AsyncIterator[None]:
+        """
+        Hold one of the ``limit`` concurrency slots of ``host``.
+
+        Args:
+            host: Portal host
+            limit: Jobs allowed on the host at once, across all workers
+            priority: PRIORITY_INTERACTIVE or PRIORITY_BATCH
+
+        Raises:
+            ScrapingError: If no slot frees up within SITE_SLOT_WAIT_TIMEOUT
+        """
+        waiter = uuid.uuid4().hex
+        score = PRIORITY_RANKS.get(priority, 1) * 10**13 + self._now_ms()
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        acquired = False
+
+        try:
+            while True:
+                try:
+                    acquired = await self._try_acquire(host, waiter, limit, score)
+                except Exception as e:
+                    _metrics.errors += 1
+                    logger.warning(f"Site limiter unavailable, not limiting: {e}")
+                    break
+                if acquired:
+                    break
+                if loop.time() - started > Config.SITE_SLOT_WAIT_TIMEOUT:
+                    raise ScrapingError(f"Timed out waiting for a slot on {host}")
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            if not acquired:
+                try:
+                    await self._redis().zrem(f"scrap:site:{host}:queue", waiter)
+                except Exception:
+                    pass
+
+        waited = loop.time() - started
+        _metrics.slot_wait_seconds += waited
+        if acquired:
+            _metrics.slots_acquired += 1
+            if waited > self.poll_interval:
+                logger.info(f"Waited {waited:.1f}s for a {priority} slot on {host}")
+
+        keep_alive = (
+            asyncio.ensure_future(self._keep_alive(host, waiter)) if acquired else None
+        )
+        try:
+            yield
+        finally:
+            if keep_alive is not None:
+                keep_alive.cancel()
+                await asyncio.gather(keep_alive, return_exceptions=True)
+            if acquired:
+                await self._release(host, waiter)
+
+    async def throttle(self, host: str, rate: float, burst: int) -> None:
+        """
+        Wait for a token of the host bucket before the next request.
+
+        Args:
+            host: Portal host
+            rate: Tokens added per second
+            burst: Bucket size
+        """
+        if rate <= 0:
+            return
+        key = f"scrap:site:{host}:bucket"
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        throttled = False
+        while True:
+            try:
+                wait_ms = await self._eval(
+                    TOKEN_BUCKET_SCRIPT, [key], [self._now_ms(), rate, burst]
+                )
+            except Exception as e:
+                _metrics.errors += 1
+                logger.warning(f"Site limiter unavailable, not throttling: {e}")
+                return
+            if wait_ms <= 0:
+                break
+            throttled = True
+            await asyncio.sleep(wait_ms / 1000)
+
+        if throttled:
+            _metrics.throttled += 1
+            _metrics.throttle_wait_seconds += loop.time() - started
@@ -0,0 +1,146 @@
+import json
+import logging
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+import redis.asyncio as redis
+
+from src.core.config import Config
+from src.core.metrics import register_component_stats
+from src.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SnapshotCacheMetrics:
+    """Counters of the Redis snapshot cache in this process."""
+
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    stores: int = 0
+    invalidations: int = 0
+    errors: int = 0
+
+
+_metrics = SnapshotCacheMetrics()
+
+
+def get_snapshot_cache_metrics() -> Dict[str, Any]:
+    """Return the snapshot cache counters of this process."""
+    return asdict(_metrics)
+
+
+register_component_stats("snapshot_cache", get_snapshot_cache_metrics)
+
+
+class SnapshotCache:
+    """
+    Redis store of backend read responses shared by every worker.
+
+    Each entry is stamped with the versions of its tags at load time. A write
+    bumps the version of the tags it touches, so entries loaded before it no
+    longer match and are treated as stale; the entry itself expires after
+    ``ttl`` seconds. A write landing between the backend response and the
+    reading of a tag derived from it (the scrapped data ID) is only caught by
+    the TTL. Redis errors are logged and treated as a miss so backend reads
+    never depend on the cache.
+    """
+
+    def __init__(self, client: Optional[redis.Redis] = None, ttl: Optional[int] = None):
+        self.client = client
+        self.ttl = ttl or Config.BACKEND_SNAPSHOT_TTL
+
+    def _redis(self) -> redis.Redis:
+        return self.client or get_redis()
+
+    @staticmethod
+    def key(name: str) -> str:
+        return f"scrap:backend:snapshot:{name}"
+
+    @staticmethod
+    def version_key(tag: str) -> str:
+        return f"scrap:backend:version:{tag}"
+
+    async def _versions(self, tags: List[str]) -> Dict[str, int]:
+        if not tags:
+            return {}
+        values = await self._redis().mget([self.version_key(tag) for tag in tags])
+        return {tag: int(value or 0) for tag, value in zip(tags, values)}
+
+    async def _load(self, name: str) -> Optional[Dict[str, Any]]:
+        raw = await self._redis().get(self.key(name))
+        if raw is None:
+            _metrics.misses += 1
+            return None
+        entry = json.loads(raw)
+        if await self._versions(list(entry["versions"])) != entry["versions"]:
+            _metrics.stale += 1
+            return None
+        _metrics.hits += 1
+        return entry
+
+    async def get_or_load(
+        self,
+        name: str,
+        loader: Callable[[], Awaitable[Any]],
+        tags: Iterable[str] = (),
+        tags_of: Optional[Callable[[Any], Iterable[str]]] = None,
+    ) -> Any:
+        """
+        Return the stored snapshot ``name``, loading and storing it on a miss.
+
+        Args:
+            name: Snapshot name, e.g. ``scrapped-data:12``
+            loader: Coroutine function performing the backend call
+            tags: Tags whose writes make the snapshot stale
+            tags_of: Extra tags derived from the loaded value
+        """
+        tags = list(tags)
+        try:
+            entry = await self._load(name)
+            if entry is not None:
+                return entry["value"]
+            versions = await self._versions(tags)
+        except Exception as e:
+            _metrics.errors += 1
+            logger.warning(f"Snapshot cache read failed: {str(e)}")
+            return await loader()
+
+        value = await loader()
+        try:
+            derived = (
+                [tag for tag in tags_of(value) if tag not in versions]
+                if tags_of
+                else []
+            )
+            versions.update(await self._versions(derived))
+            async with self._redis().pipeline(transaction=True) as pipe:
+                pipe.set(
+                    self.key(name),
+                    json.dumps({"versions": versions, "value": value}),
+                    ex=self.ttl,
+                )
+                # Versions must outlive the snapshot, or they could restart
+                # at the stamped value after it expired
+                for tag, version in versions.items():
+                    if version:
+                        pipe.expire(self.version_key(tag), self.ttl * 2)
+                await pipe.execute()
+            _metrics.stores += 1
+        except Exception as e:
+            _metrics.errors += 1
+            logger.warning(f"Snapshot cache write failed: {str(e)}")
+        return value
+
+    async def invalidate(self, tag: str) -> None:
+        """Bump the version of ``tag``, making snapshots stamped with it stale."""
+        key = self.version_key(tag)
+        try:
+            async with self._redis().pipeline(transaction=True) as pipe:
+                await pipe.incr(key).expire(key, self.ttl * 2).execute()
+            _metrics.invalidations += 1
+        except Exception as e:
+            _metrics.errors += 1
+            logger.warning(f"Snapshot cache invalidation failed: {str(e)}")
@@ -1,22 +1,48 @@
 from dataclasses import dataclass, field
-from typing import Dict, Any, List, Optional, Tuple
+from functools import partial
+from typing import Dict, Any, List, Optional, Tuple, Union
 import asyncio
 import re
+import time
 from urllib.parse import urljoin, urlparse, urlunparse
 
-import pdfplumber
-from playwright.async_api import Page, Download
-from playwright._impl._errors import TargetClosedError
-from anticaptchaofficial.recaptchav2proxyless import recaptchaV2Proxyless
+from playwright.async_api import Page
 
 from src.core.errors import BrowserError, CaptchaError, ScrapingError
 from src.core.config import Config
+from src.core.cpu_executor import get_cpu_executor
+from src.core.metrics import (
+    ERRORS_TOTAL,
+    SCRAP_ACTION_SECONDS,
+    SCRAP_STAGE_SECONDS,
+    UNKNOWN,
+    time_stage,
+)
 from src.core.logging_config import setup_logging
 from src.core.retries import with_retry
+from src.core.tracing import span, traced
 from src.services.http_client import MainServiceClient
+from src.utils.bill_digest import content_bill, url_bill
+from src.utils.element_snapshot import snapshot_elements
 from src.utils.get_selector import get_selector
-from src.utils.browser_invoker import InvokerBrowser
+from src.utils.process_utility_bill_pdf import extract_pdf_text
 from src.services.bill_service import BillService
+from src.services.browser_pool import BrowserLease, BrowserPool, get_browser_pool
+from src.services.captcha_solver import CaptchaSolverPool, get_captcha_pool
+from src.services.download_pipeline import DownloadPipeline
+from src.services.page_waits import WaitCondition, settle, wait_for_signal
+from src.services.resource_blocking import (
+    ResourceProfile,
+    ResourceStats,
+    apply_resource_profile,
+)
+from src.services.session_cache import SessionCache
+from src.services.site_limiter import PRIORITY_INTERACTIVE, SiteLimiter, site_host
+
+# Upper bounds for waits that used to be fixed sleeps (milliseconds)
+FORM_SUBMIT_WAIT = WaitCondition(kind="download_started", timeout=12000)
+# Inputs, clicks and dialogs: returns at once unless the action navigated
+ACTION_WAIT = WaitCondition(kind="load", timeout=2000)
 
 
 @dataclass
@@ -26,7 +52,21 @@ class ScrapingConfig:
     url: str
     captcha: bool
     captcha_sequence: List[Dict[str, Any]] = field(default_factory=list)
+    # Each entry may carry a "wait" key (see page_waits.WaitCondition),
+    # "bulk": false to read element attributes one element at a time and
+    # "login": true to be skipped when a cached session is restored
     sequence: List[Dict[str, Any]] = field(default_factory=list)
+    # Maximum simultaneous jobs against this portal, across workers
+    max_concurrency: Optional[int] = None
+    # Navigations, form submits and downloads per second on this portal
+    rate_limit: Optional[float] = None
+    rate_burst: Optional[int] = None
+    # Maximum simultaneous downloads within one job on this portal
+    max_parallel_downloads: Optional[int] = None
+    # Resource blocking profile name or dict, see ResourceProfile.from_config
+    resource_profile: Optional[Union[str, Dict[str, Any]]] = None
+    # Element only shown to a logged-in customer; enables the session cache
+    session_probe: Optional[Dict[str, Any]] = None
 
 
 @dataclass
@@ -41,6 +81,31 @@ class UserService:
     updated_at: str
 
 
+@dataclass
+class ScrapeJob:
+    """State of a single scraping job, isolated from other customers."""
+
+    config: ScrapingConfig
+    user_service: UserService
+    debt: bool = False
+    bills: List[Dict[str, Any]] = field(default_factory=list)
+    save_bills_called: bool = False
+    downloads: Optional[DownloadPipeline] = None
+    resources: ResourceStats = field(default_factory=ResourceStats)
+    started_at: float = 0.0
+    session_restored: bool = False
+    priority: str = PRIORITY_INTERACTIVE
+    browser: str = UNKNOWN
+
+    @property
+    def metric_labels(self) -> Dict[str, str]:
+        """Labels identifying the job in stage metrics."""
+        return {
+            "service_id": str(self.user_service.service_id),
+            "browser": self.browser,
+        }
+
+
 class WebScrapService:
     """
     Enhanced web scraping service with improved error handling, logging, and best practices.
@@ -52,21 +117,27 @@ class WebScrapService:
     - Bill data extraction and storage
     """
 
-    def __init__(self):
-        """Initialize the web scraping service with necessary dependencies."""
+    def __init__(
+        self,
+        browser_pool: Optional[BrowserPool] = None,
+        captcha_pool: Optional[CaptchaSolverPool] = None,
+    ):
+        """
+        Initialize the web scraping service with necessary dependencies.
+
+        Args:
+            browser_pool: Pool to lease browsers from. Defaults to the worker pool
+                bound to the running event loop.
+            captcha_pool: Pool solving captchas. Defaults to the worker pool
+                bound to the running event loop.
+        """
         self.logger = setup_logging("web_scraping_service")
         self.http_client = MainServiceClient()
         self.bill_service = BillService()
-        self.browser = None
-        self.debt = False
-        self.bills: List[Dict[str, Any]] = []
-        self.save_bills_called = False
-        self.downloaded_files = set()
-
-        # Initialize captcha solver if needed
-        self.solver = recaptchaV2Proxyless()
-        self.solver.set_verbose(1)
-        self.solver.set_key(Config.KEY_ANTICAPTCHA)
+        self.browser_pool = browser_pool
+        self.captcha_pool = captcha_pool
+        self.session_cache = SessionCache()
+        self.site_limiter = SiteLimiter()
 
     async def __aenter__(self):
         """Context manager entry point."""
@@ -79,79 +150,75 @@ class WebScrapService:
         await self.cleanup()
 
     async def cleanup(self) -> None:
-        """Clean up resources and close browser."""
-        try:
-            if self.browser:
-                await self.browser.close_browser()
-        except Exception as e:
-            self.logger.error(f"Error during cleanup: {str(e)}")
+        """
+        Clean up resources.
 
-    async def _initialize_browser(self, config: ScrapingConfig):
-        """Initialize browser based on configuration"""
-        try:
-            invoker = InvokerBrowser()
-            browser_type = (
-                "firefox" if config.captcha and config.captcha_sequence else "chrome"
-            )
-            self.browser = invoker.get_command(browser_type)
-            return self.browser
-        except Exception as e:
-            self.logger.error(f"Browser initialization failed: {str(e)}")
-            raise BrowserError(f"Browser initialization failed: {str(e)}")
+        Browser contexts are released at the end of each search; the pooled
+        browsers themselves belong to the worker and outlive this service.
+        """
+        self.browser_pool = None
+
+    def _get_browser_pool(self) -> BrowserPool:
+        """Return the browser pool used by this service."""
+        if self.browser_pool is None:
+            self.browser_pool = get_browser_pool()
+        return self.browser_pool
+
+    def _get_browser_type(self, config: ScrapingConfig) -> str:
+        """Select the browser type based on configuration"""
+        return "firefox" if config.captcha and config.captcha_sequence else "chrome"
 
-    async def _navigate_to_page(self, browser, url: str):
+    async def _navigate_to_page(self, lease: BrowserLease, url: str):
         """Navigate to target page with error handling"""
         try:
-            page_result = await browser.navigate_to_page(url)
-            return (
-                page_result if isinstance(page_result, tuple) else (page_result, None)
-            )
+            await lease.page.goto(url)
+            return lease.page, lease.client
         except Exception as e:
             self.logger.error("Navigation failed: %s", str(e))
             raise BrowserError(f"Navigation failed: {str(e)}")
 
     async def _handle_dialog(self, dialog) -> None:
         """Handle browser dialogs automatically."""
-        await asyncio.sleep(2)
         await dialog.accept()
 
-    async def _handle_download(self, download: Download) -> None:
+    def _create_download_pipeline(self, job: ScrapeJob) -> DownloadPipeline:
+        """Create the pipeline that processes the downloads of a job."""
+        return DownloadPipeline(
+            handler=partial(self._handle_download, job=job),
+            max_parallel=job.config.max_parallel_downloads
+            or Config.SCRAP_DOWNLOAD_PARALLELISM,
+            metric_labels=job.metric_labels,
+        )
+
+    async def _handle_download(self, path: str, filename: str, job: ScrapeJob) -> None:
         """
-        Handle file downloads and process PDFs.
+        Process a downloaded PDF and add its content to the job bills.
 
         Args:
-            download: Playwright download object
+            path: Local path of the downloaded file
+            filename: Suggested filename of the download
+            job: Scraping job the download belongs to
         """
-        await asyncio.sleep(2)
-        try:
-            path = await download.path()
-            filename = download.suggested_filename
-
-            if filename in self.downloaded_files:
-                self.logger.info(f"Skipping duplicate download: {filename}")
-                return
-
-            self.downloaded_files.add(filename)
+        # Process PDF content off the event loop
+        with span("scrap.pdf_extract", filename=filename), time_stage(
+            "pdf_extract", **job.metric_labels
+        ):
+            text = await get_cpu_executor().run(extract_pdf_text, path, "")
 
-            # Process PDF content
-            with pdfplumber.open(path) as pdf:
-                text = "".join(page.extract_text() for page in pdf.pages)
-
-            self.bills.append({"content": text})
-            self.logger.info(f"Successfully processed PDF: {filename}")
-
-        except TargetClosedError:
-            self.logger.error("Target closed before download could complete")
-        except Exception as e:
-            self.logger.error(f"Error processing download: {str(e)}")
+        job.bills.append(content_bill(text))
+        self.logger.info(f"Successfully processed PDF: {filename}")
 
+    @traced("scrap.search")
     @with_retry(max_retries=3)
-    async def search(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    async def search(
+        self, data: Dict[str, Any], priority: str = PRIORITY_INTERACTIVE
+    ) -> Dict[str, Any]:
         """
         Main entry point for scraping operations.
 
         Args:
             data: Dictionary containing scraping configuration and user service data
+            priority: Queue priority for the portal slot, interactive or batch
 
         Returns:
             Dict containing debt status, save results, and extraction flags
@@ -160,23 +227,130 @@ class WebScrapService:
             ScrapingError: If scraping operation fails
         """
         self.logger.info("Starting search operation")
+        labels = {
+            "service_id": str(data.get("user_service", {}).get("service_id", UNKNOWN)),
+            "browser": UNKNOWN,
+        }
         try:
-            config = ScrapingConfig(**data["service"]["scraping_config"])
-            user_service = UserService(**data["user_service"])
+            job = ScrapeJob(
+                config=ScrapingConfig(**data["service"]["scraping_config"]),
+                user_service=UserService(**data["user_service"]),
+                priority=priority,
+            )
 
-            # Initialize browser and navigate to page
-            browser = await self._initialize_browser(config)
-            page_result = await self._navigate_to_page(browser, config.url)
+            # Lease an isolated browser context and navigate to page
+            browser_type = job.browser = labels["browser"] = self._get_browser_type(
+                job.config
+            )
+            session_state = await self._load_session(job)
+            context_options = (
+                {"storage_state": session_state} if session_state is not None else {}
+            )
+            site_slot = self.site_limiter.slot(
+                site_host(job.config.url),
+                job.config.max_concurrency or Config.SCRAP_SITE_CONCURRENCY,
+                job.priority,
+            )
+            async with site_slot:
+                acquire_started = time.perf_counter()
+                async with self._get_browser_pool().lease(
+                    browser_type, **context_options
+                ) as lease:
+                    SCRAP_STAGE_SECONDS.labels(
+                        stage="browser_acquire", **job.metric_labels
+                    ).observe(time.perf_counter() - acquire_started)
+                    await apply_resource_profile(
+                        lease.context,
+                        ResourceProfile.from_config(job.config.resource_profile),
+                        job.resources,
+                    )
+                    await self._throttle(job)
+                    job.started_at = asyncio.get_running_loop().time()
+                    with time_stage("page_goto", **job.metric_labels):
+                        page_result = await self._navigate_to_page(
+                            lease, job.config.url
+                        )
+                    if session_state is not None:
+                        await self._probe_session(lease, job)
+                    result = await self._handle_scraping(page_result, job)
+                    await self._save_session(lease, job)
+            self.logger.info(f"Resource stats: {job.resources.as_dict()}")
 
-            result = await self._handle_scraping(page_result, config, user_service)
-            save_result = await self._process_and_save_results(result, user_service.id)
+            save_result = await self._process_and_save_results(result, job)
 
-            return self._prepare_response(save_result)
+            return self._prepare_response(save_result, job)
 
         except Exception as e:
+            ERRORS_TOTAL.labels(error_type=type(e).__name__, **labels).inc()
             self.logger.error(f"Search operation failed: {str(e)}")
             raise ScrapingError(f"Search operation failed: {str(e)}")
 
+    async def _throttle(self, job: ScrapeJob) -> None:
+        """Wait for the portal rate limit before a navigation, submit or download."""
+        config = job.config
+        await self.site_limiter.throttle(
+            site_host(config.url),
+            (
+                config.rate_limit
+                if config.rate_limit is not None
+                else Config.SITE_RATE_LIMIT
+            ),
+            config.rate_burst or Config.SITE_RATE_BURST,
+        )
+
+    def _uses_session_cache(self, config: ScrapingConfig) -> bool:
+        """Sessions are only cached for services that can probe their validity."""
+        return Config.SESSION_CACHE_ENABLED and config.session_probe is not None
+
+    async def _load_session(self, job: ScrapeJob) -> Optional[Dict[str, Any]]:
+        """Return the cached storage state of the job customer, if any."""
+        if not self._uses_session_cache(job.config):
+            return None
+        return await self.session_cache.load(
+            job.user_service.service_id, job.user_service.customer_number
+        )
+
+    async def _probe_session(self, lease: BrowserLease, job: ScrapeJob) -> None:
+        """
+        Check that a restored session is still logged in.
+
+        On success captcha and login steps are skipped for this job. Otherwise
+        the cached state is dropped and the page reloaded from a clean session.
+        """
+        try:
+            await lease.page.wait_for_selector(
+                get_selector(job.config.session_probe),
+                timeout=Config.SESSION_PROBE_TIMEOUT,
+            )
+            job.session_restored = True
+            self.session_cache.record_hit(job.config.captcha)
+            self.logger.info("Restored cached session, skipping login")
+        except Exception as e:
+            self.logger.info(f"Cached session is no longer valid: {str(e)}")
+            self.session_cache.record_invalid()
+            await self.session_cache.invalidate(
+                job.user_service.service_id, job.user_service.customer_number
+            )
+            await lease.context.clear_cookies()
+            await lease.page.evaluate(
+                "() => { localStorage.clear(); sessionStorage.clear(); }"
+            )
+            await self._throttle(job)
+            await lease.page.goto(job.config.url)
+
+    async def _save_session(self, lease: BrowserLease, job: ScrapeJob) -> None:
+        """Cache the storage state of a successful job for the next run."""
+        if not self._uses_session_cache(job.config):
+            return
+        try:
+            state = await lease.context.storage_state()
+        except Exception as e:
+            self.logger.warning(f"Could not read session state: {str(e)}")
+            return
+        await self.session_cache.store(
+            job.user_service.service_id, job.user_service.customer_number, state
+        )
+
     async def _solve_captcha_with_sequence(
         self, page: Page, config: ScrapingConfig, user_service: UserService
     ) -> None:
@@ -206,19 +380,16 @@ class WebScrapService:
             )
             sitekey = await sitekey_element.get_attribute("data-sitekey")
 
-            # Solve captcha
-            self.solver.set_website_url(page.url)
-            self.solver.set_website_key(sitekey)
-            g_response = self.solver.solve_and_return_solution()
+            # Solve captcha without blocking the event loop
+            captcha_pool = self.captcha_pool or get_captcha_pool()
+            g_response = await captcha_pool.solve(page.url, sitekey)
 
-            if g_response != 0:
-                self.logger.info(f"Captcha solved successfully")
-                await page.evaluate(
-                    f"document.getElementById('g-recaptcha-response').innerHTML = '{g_response}'"
-                )
-                await page.click(config.captcha_sequence[2]["captcha_button_content"])
-            else:
-                raise CaptchaError(f"Captcha solving failed: {self.solver.error_code}")
+            self.logger.info(f"Captcha solved successfully")
+            await page.evaluate(
+                "token => document.getElementById('g-recaptcha-response').innerHTML = token",
+                g_response,
+            )
+            await page.click(config.captcha_sequence[2]["captcha_button_content"])
 
         except Exception as e:
             self.logger.error(f"Captcha solving failed: {str(e)}")
@@ -250,16 +421,19 @@ class WebScrapService:
         customer_number_index = 0
 
         try:
+            condition = WaitCondition.from_action(action, ACTION_WAIT)
             if action["element_type"] == "input":
                 size = int(action.get("size", len(user_service.customer_number)))
                 input_value = user_service.customer_number[
                     customer_number_index : customer_number_index + size
                 ]
-                await page.fill(selector, input_value)
+                async with wait_for_signal(page, condition):
+                    await page.fill(selector, input_value)
                 return customer_number_index + size
 
             elif action["element_type"] == "button":
-                await page.click(selector)
+                async with wait_for_signal(page, condition):
+                    await page.click(selector)
                 return customer_number_index
 
         except Exception as e:
@@ -275,7 +449,7 @@ class WebScrapService:
             self.logger.warning(f"Modal handling failed: {str(e)}")
 
     async def _execute_action(
-        self, page: Page, action: Dict[str, Any], user_service: UserService
+        self, page: Page, action: Dict[str, Any], job: ScrapeJob
     ) -> List[Dict[str, Any]]:
         """
         Execute a single scraping action.
@@ -283,23 +457,27 @@ class WebScrapService:
         Args:
             page: Playwright page object
             action: Action configuration
-            user_service: User service information
+            job: Current scraping job
 
         Returns:
             List of extracted data
         """
+        started = time.perf_counter()
         try:
             element_type = action["element_type"]
             selector = get_selector(action)
 
             await page.wait_for_selector(selector, timeout=5000)
+            if job.resources.time_to_first_selector_ms is None:
+                elapsed = asyncio.get_running_loop().time() - job.started_at
+                job.resources.time_to_first_selector_ms = round(elapsed * 1000, 1)
 
             if element_type in ["input", "button"]:
-                await self._handle_input_or_button(page, action, user_service)
+                await self._handle_input_or_button(page, action, job.user_service)
                 return []
             elif element_type == "buttons":
-                await self._handle_buttons(page, selector)
-                return self.bills
+                await self._handle_buttons(page, selector, action, job)
+                return job.bills
             elif element_type in [
                 "h1",
                 "h2",
@@ -317,7 +495,7 @@ class WebScrapService:
                 "ul",
                 "name",
             ]:
-                return await self._handle_element(page, action, user_service)
+                return await self._handle_element(page, action, job)
             elif element_type == "modal":
                 await self._handle_modal(page, selector)
                 return []
@@ -327,45 +505,57 @@ class WebScrapService:
         except Exception as e:
             self.logger.error(f"Action execution failed: {str(e)}")
             raise ScrapingError(f"Action execution failed: {str(e)}")
+        finally:
+            SCRAP_ACTION_SECONDS.labels(
+                element_type=action.get("element_type", UNKNOWN), **job.metric_labels
+            ).observe(time.perf_counter() - started)
 
-    def _prepare_response(self, save_result: Dict[str, Any]) -> Dict[str, Any]:
+    def _prepare_response(
+        self, save_result: Dict[str, Any], job: ScrapeJob
+    ) -> Dict[str, Any]:
         """
         Prepare the final response object.
 
         Args:
             save_result: Result from saving bills
+            job: Finished scraping job
 
         Returns:
-            Dict containing debt status, save results, and extraction flags
+            Dict containing debt status, save results, extraction flags and
+            the downloads that failed
         """
         return {
-            "debt": self.debt,
+            "debt": job.debt,
             "save_result": save_result,
             "should_extract": (
                 save_result.get("new_bills_saved", False)
                 or not save_result.get("success", False)
-                or any("url" in bill for bill in self.bills)
+                or any("url" in bill for bill in job.bills)
             ),
+            "resource_stats": job.resources.as_dict(),
+            "download_failures": job.downloads.failures if job.downloads else [],
         }
 
+    @traced("scrap.process_and_save_results")
     async def _process_and_save_results(
-        self, result: List[Dict[str, Any]], user_service_id: str
+        self, result: List[Dict[str, Any]], job: ScrapeJob
     ) -> Dict[str, Any]:
         """
         Process and save the scraped results.
 
         Args:
             result: List of scraped data
-            user_service_id: User service identifier
+            job: Finished scraping job
 
         Returns:
             Dict containing save operation results
         """
+        user_service_id = job.user_service.id
         try:
             self.logger.info(f"Processing results for user service: {user_service_id}")
             self.logger.info(f"Extracted data: {result}")
             return await self.bill_service.save_bills(
-                user_service_id=user_service_id, bills=result, debt=self.debt
+                user_service_id=user_service_id, bills=result, debt=job.debt
             )
         except Exception as e:
             self.logger.error(f"Error saving bills: {str(e)}")
@@ -375,19 +565,16 @@ class WebScrapService:
                 "new_bills_saved": False,
             }
 
+    @traced("scrap.handle_scraping")
     async def _handle_scraping(
-        self,
-        page_result: Tuple[Page, Any],
-        config: ScrapingConfig,
-        user_service: UserService,
+        self, page_result: Tuple[Page, Any], job: ScrapeJob
     ) -> List[Dict[str, Any]]:
         """
         Handle the main scraping logic with proper error handling and retries.
 
         Args:
             page_result: Tuple containing page and client objects
-            config: Scraping configuration
-            user_service: User service information
+            job: Current scraping job
 
         Returns:
             List of scraped data
@@ -396,28 +583,33 @@ class WebScrapService:
             ScrapingError: If scraping operation fails
         """
         page, client = page_result
+        config = job.config
         consecutive_errors = 0
         customer_number_index = 0
 
         try:
             # Set up event handlers
             page.on("dialog", self._handle_dialog)
-            page.on("download", self._handle_download)
+            job.downloads = self._create_download_pipeline(job)
+            page.on("download", job.downloads.submit)
 
             # Handle captcha if needed
-            if config.captcha:
-                await self._handle_captcha(page, client, config, user_service)
+            if config.captcha and not job.session_restored:
+                await self._handle_captcha(page, client, config, job.user_service)
 
             # Execute scraping sequence
             for action in config.sequence:
+                if job.session_restored and action.get("login"):
+                    continue
                 try:
                     self.logger.info(f"Executing action: {action}")
-                    result = await self._execute_action(
-                        page=page, action=action, user_service=user_service
-                    )
+                    with span("scrap.action", element_type=action.get("element_type")):
+                        result = await self._execute_action(
+                            page=page, action=action, job=job
+                        )
 
                     if result:
-                        self.bills.extend(result)
+                        job.bills.extend(result)
 
                     consecutive_errors = 0
 
@@ -432,7 +624,10 @@ class WebScrapService:
 
                     continue
 
-            return self.bills
+            # Let in-flight downloads finish before the page is closed
+            await job.downloads.drain()
+
+            return job.bills
 
         except Exception as e:
             self.logger.error(f"Scraping operation failed: {str(e)}")
@@ -444,17 +639,22 @@ class WebScrapService:
         self, page, client, config: ScrapingConfig, user_service: UserService
     ):
         """Handle captcha solving with improved error handling"""
+        labels = {
+            "service_id": str(user_service.service_id),
+            "browser": self._get_browser_type(config),
+        }
         try:
-            if config.captcha_sequence:
-                await self._solve_captcha_with_sequence(page, config, user_service)
-            else:
-                await self._wait_for_captcha_solve(client)
+            with span("scrap.captcha"), time_stage("captcha_solve", **labels):
+                if config.captcha_sequence:
+                    await self._solve_captcha_with_sequence(page, config, user_service)
+                else:
+                    await self._wait_for_captcha_solve(client)
         except Exception as e:
             self.logger.error(f"Captcha handling failed: {str(e)}")
             raise CaptchaError(f"Captcha handling failed: {str(e)}")
 
     async def _handle_element(
-        self, page: Page, action: Dict[str, Any], user_service: UserService
+        self, page: Page, action: Dict[str, Any], job: ScrapeJob
     ) -> List[Dict[str, Any]]:
         """
         Handle element actions and debt checking with improved error handling.
@@ -462,7 +662,7 @@ class WebScrapService:
         Args:
             page: Playwright page object
             action: Action configuration
-            user_service: User service information
+            job: Current scraping job
 
         Returns:
             List of extracted data
@@ -476,15 +676,12 @@ class WebScrapService:
 
             # Handle debt check if specified
             if action.get("debt"):
-                await self._check_debt_status(elements, action.get("no_debt_text"))
+                await self._check_debt_status(elements, action.get("no_debt_text"), job)
 
             # Handle query if present
             if action.get("query"):
                 results = await self._handle_query(
-                    page=page,
-                    action=action,
-                    elements=elements,
-                    user_service_id=user_service.id,
+                    page=page, action=action, elements=elements, job=job
                 )
                 return results
 
@@ -495,7 +692,7 @@ class WebScrapService:
             raise ScrapingError(f"Element handling failed: {str(e)}")
 
     async def _check_debt_status(
-        self, elements: List[Any], no_debt_text: Optional[str]
+        self, elements: List[Any], no_debt_text: Optional[str], job: ScrapeJob
     ) -> None:
         """
         Check debt status based on element text.
@@ -503,27 +700,28 @@ class WebScrapService:
         Args:
             elements: List of page elements
             no_debt_text: Regular expression pattern for no debt condition
+            job: Current scraping job
         """
         try:
             if elements:
                 debt_message = await elements[0].inner_text()
                 if no_debt_text and re.search(no_debt_text, debt_message):
-                    self.debt = False
+                    job.debt = False
                 else:
-                    self.debt = True
+                    job.debt = True
             else:
-                self.debt = True
+                job.debt = True
 
         except Exception as e:
             self.logger.error(f"Error checking debt status: {str(e)}")
-            self.debt = True  # Default to debt on error
+            job.debt = True  # Default to debt on error
 
     async def _handle_query(
         self,
         page: Page,
         action: Dict[str, Any],
         elements: List[Any],
-        user_service_id: str,
+        job: ScrapeJob,
     ) -> List[Dict[str, Any]]:
         """
         Handle query actions for elements with improved URL handling.
@@ -532,7 +730,7 @@ class WebScrapService:
             page: Playwright page object
             action: Action configuration
             elements: List of page elements
-            user_service_id: User service identifier
+            job: Current scraping job
 
         Returns:
             List of extracted data
@@ -542,51 +740,49 @@ class WebScrapService:
         """
         try:
             if action.get("redirect"):
-                return await self._handle_redirect(page, elements[0])
+                return await self._handle_redirect(page, elements[0], job)
             elif action.get("form"):
-                return await self._handle_form_submission(elements)
+                return await self._handle_form_submission(page, action, elements, job)
             else:
-                return await self._handle_urls(page, elements, user_service_id)
+                return await self._handle_urls(page, action, elements, job)
 
         except Exception as e:
             self.logger.error(f"Query handling failed: {str(e)}")
             raise ScrapingError(f"Query handling failed: {str(e)}")
 
-    async def _handle_redirect(self, page: Page, element: Any) -> List[Dict[str, Any]]:
+    async def _handle_redirect(
+        self, page: Page, element: Any, job: ScrapeJob
+    ) -> List[Dict[str, Any]]:
         """Handle redirect actions."""
         href = await element.get_attribute("href")
         absolute_url = urljoin(page.url, href)
-        await page.goto(absolute_url, wait_until="load")
+        await self._throttle(job)
+        with time_stage("page_goto", **job.metric_labels):
+            await page.goto(absolute_url, wait_until="load")
         return []
 
     async def _handle_form_submission(
-        self, elements: List[Any]
+        self,
+        page: Page,
+        action: Dict[str, Any],
+        elements: List[Any],
+        job: ScrapeJob,
     ) -> List[Dict[str, Any]]:
         """Handle form submission actions with duplicate prevention."""
+        condition = WaitCondition.from_action(action, FORM_SUBMIT_WAIT)
         processed_forms = set()  # Track processed forms
 
-        for i in range(len(elements)):  # Use actual length instead of hardcoded 9
+        # Get form identifiers of all elements at once
+        snapshots = await snapshot_elements(page, elements, action.get("bulk"))
+
+        for i, (td, snapshot) in enumerate(zip(elements, snapshots)):
             try:
-                td = elements[i]
-                form = await td.query_selector("form")
+                form_id = snapshot.form_id
 
-                if not form:
+                if form_id is None:
                     self.logger.warning(f"No form found in element {i}")
                     continue
 
-                # Get form identifier using multiple attributes for better uniqueness
-                form_id = await form.evaluate(
-                    """
-                    form => {
-                        const action = form.getAttribute("action") || "";
-                        const inputs = Array.from(form.querySelectorAll("input")).map(
-                            i => i.getAttribute("value")
-                        ).join(",");
-                        return `${action}-${inputs}`;
-                    }
-                """
-                )
-
                 # Skip if already processed
                 if form_id in processed_forms:
                     self.logger.info(
@@ -594,48 +790,50 @@ class WebScrapService:
                     )
                     continue
 
-                # Submit form and wait for navigation/download
-                await form.dispatch_event("submit")
-                processed_forms.add(form_id)
-                self.logger.info(f"Successfully submitted form {i} with ID {form_id}")
-
-                # Wait for potential file download/processing
-                await asyncio.sleep(12)
+                # Submit form and wait for the download to start
+                await job.downloads.wait_for_capacity()
+                form = await td.query_selector("form")
+                await self._throttle(job)
+                async with wait_for_signal(page, condition):
+                    await form.dispatch_event("submit")
+                    processed_forms.add(form_id)
+                    self.logger.info(
+                        f"Successfully submitted form {i} with ID {form_id}"
+                    )
 
             except Exception as e:
                 self.logger.error(f"Error processing form {i}: {str(e)}")
                 continue
 
-        return self.bills  # Return collected bills instead of empty list
+        return job.bills  # Return collected bills instead of empty list
 
     async def _handle_urls(
-        self, page: Page, elements: List[Any], user_service_id: str
+        self, page: Page, action: Dict[str, Any], elements: List[Any], job: ScrapeJob
     ) -> List[Dict[str, Any]]:
         """Handle URL extraction and processing."""
         try:
             # Extract URLs from elements
-            elements_href = [
-                await element.get_attribute("href") for element in elements
-            ]
+            snapshots = await snapshot_elements(page, elements, action.get("bulk"))
+            elements_href = [snapshot.href for snapshot in snapshots]
 
             # Clean and format URLs
             base_url = urlunparse(urlparse(page.url)._replace(path=""))
             elements_formatted = [
-                {"url": urljoin(base_url, href)}
+                url_bill(urljoin(base_url, href))
                 for href in elements_href
                 if href is not None
             ]
 
             # Save bills if needed
             if elements_formatted:
-                self.bills.extend(elements_formatted)
-                if not self.save_bills_called:
+                job.bills.extend(elements_formatted)
+                if not job.save_bills_called:
                     await self.bill_service.save_bills(
-                        user_service_id=user_service_id,
+                        user_service_id=job.user_service.id,
                         bills=elements_formatted,
-                        debt=self.debt,
+                        debt=job.debt,
                     )
-                    self.save_bills_called = True
+                    job.save_bills_called = True
 
             return elements_formatted
 
@@ -643,28 +841,31 @@ class WebScrapService:
             self.logger.error(f"URL handling failed: {str(e)}")
             return []
 
-    async def _handle_buttons(self, page: Page, selector: str) -> None:
+    async def _handle_buttons(
+        self, page: Page, selector: str, action: Dict[str, Any], job: ScrapeJob
+    ) -> None:
         """
         Handle button clicking and file downloading with improved error handling and duplicate prevention.
 
         Args:
             page: Playwright page object
             selector: Button selector
+            action: Action configuration
+            job: Current scraping job
 
         Raises:
             ScrapingError: If button handling fails
         """
+        condition = WaitCondition.from_action(action, ACTION_WAIT)
         try:
             buttons = await page.query_selector_all(selector)
             processed_buttons = set()  # Track processed buttons using their properties
+            snapshots = await snapshot_elements(page, buttons, action.get("bulk"))
 
-            for i, button in enumerate(buttons):
+            for i, (button, snapshot) in enumerate(zip(buttons, snapshots)):
                 try:
                     # Get unique identifier for button (e.g., text content or some attribute)
-                    button_id = (
-                        await button.get_attribute("href")
-                        or await button.text_content()
-                    )
+                    button_id = snapshot.href or snapshot.text
 
                     # Skip if already processed
                     if button_id in processed_buttons:
@@ -676,26 +877,17 @@ class WebScrapService:
                     # Ensure button is visible
                     await button.scroll_into_view_if_needed()
 
-                    # Set up download handler
+                    # Only start a new download when the pipeline has room
+                    await job.downloads.wait_for_capacity()
+                    await self._throttle(job)
                     async with page.expect_download(timeout=30000) as download_info:
                         await button.click()
 
-                    # Wait for download and process
-                    download = await download_info.value
-                    suggested_filename = download.suggested_filename
-
-                    # Skip if file already downloaded
-                    if suggested_filename in self.downloaded_files:
-                        self.logger.info(
-                            f"Skipping duplicate download: {suggested_filename}"
-                        )
-                        continue
-
-                    await self._handle_download(download)
+                    # Hand the download over and move on to the next button
+                    job.downloads.submit(await download_info.value)
                     processed_buttons.add(button_id)
 
-                    # Add delay between clicks
-                    await asyncio.sleep(2)
+                    await settle(page, condition)
 
                 except Exception as e:
                     self.logger.error(f"Error processing button {i}: {str(e)}")
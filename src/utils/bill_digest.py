@@ -0,0 +1,75 @@
+import hashlib
+import re
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DIGEST_KEY = "digest"
+
+_WHITESPACE = re.compile(r"\s+")
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _sha256(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def normalize_content(content: Any) -> str:
+    """Bill text with whitespace runs collapsed, as compared for duplicates."""
+    if isinstance(content, dict):
+        content = content.get("content", "")
+    return _WHITESPACE.sub(" ", str(content)).strip()
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a bill URL.
+
+    Scheme and host are lowercased, default ports and fragments dropped and
+    query parameters sorted, so the same bill linked in different ways gets
+    the same digest.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+def content_digest(content: Any) -> str:
+    return f"content:{_sha256(normalize_content(content))}"
+
+
+def url_digest(url: str) -> str:
+    return f"url:{_sha256(normalize_url(url))}"
+
+
+def content_bill(content: str) -> Dict[str, Any]:
+    """Create a downloaded bill together with its digest."""
+    return {"content": content, DIGEST_KEY: content_digest(content)}
+
+
+def url_bill(url: str) -> Dict[str, Any]:
+    """Create a linked bill together with its digest."""
+    return {"url": url, DIGEST_KEY: url_digest(url)}
+
+
+def bill_digest(bill: Dict[str, Any]) -> Optional[str]:
+    """
+    Return the digest identifying a bill for deduplication.
+
+    Bills created by the scraper carry their digest; it is only computed for
+    bills stored before digests existed. Content takes precedence over URL.
+
+    Returns:
+        The digest, or None if the bill has neither content nor URL
+    """
+    digest = bill.get(DIGEST_KEY)
+    if digest:
+        return digest
+    if "content" in bill:
+        return content_digest(bill["content"])
+    if "url" in bill:
+        return url_digest(bill["url"])
+    return None
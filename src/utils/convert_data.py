@@ -1,10 +1,13 @@
 import decimal
 import re
-from typing import Dict, Any, List, Optional, Union
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Pattern, Tuple, Union
 from dataclasses import dataclass
 from decimal import Decimal, DecimalException
 import logging
 
+from src.core.cpu_executor import get_cpu_executor
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,141 +23,325 @@ class Address:
     postal_code: Optional[str] = None
 
 
+# Flags used by first-match field extraction
+FIELD_FLAGS = re.MULTILINE | re.IGNORECASE
+# Flags used when collecting every match (charges, installments, services)
+MATCH_ALL_FLAGS = re.IGNORECASE
+
+# Dictionary with the default patterns of every category
+DEFAULT_PATTERNS: Dict[str, List[str]] = {
+    # Basic information patterns
+    "date": [
+        r"Fecha(?:\sde)?\semisión:\s*(\d{2}/\d{2}/\d{2,4})",
+        r"Fecha:\s*(\d{2}/\d{2}/\d{2,4})",
+        r"Emisión:\s*(\d{2}/\d{2}/\d{2,4})",
+        r"FECHA DE EMISIÓN\s*(\d{2}/\d{2}/\d{2,4})",
+    ],
+    "account_number": [
+        r"NÚMERO DE CUENTA:\s*(\d+)",
+        r"CÓDIGO PAGO ELECTRÓNICO\s*(\d+)",
+        r"Cod\.\s*018\s*(\d+)",
+        r"N° de Cliente:\s*(\d+)",
+        r"(?:Cuenta|Account)(?:\sNº)?:\s*(\d+)",
+        r"N° DE CLIENTE\s*(\d+)",
+        r"Nº\s*(\d{3}-\d{7}-\d{3}-\d)",
+        r"Código de LINK PAGOS / BANELCO:\s*(\d+)",
+    ],
+    "customer_name": [
+        r"(?:NOMBRE:|Cliente:)\s*([\w\s,]+?)(?=\n)",
+        r"(?<=\n)((?!CÓDIGO PAGO ELECTRÓNICO)[\w\s]+?)(?=\nCL\s)",
+        r"Titular:\s*([\w\s,]+?)(?=\n)",
+        r"APELLIDO Y NOMBRE[^:]*?:\s*([\w\s,]+?)(?=\n)",
+        r"^([A-Z\s,]+?)(?=\s+Vencimiento)",
+    ],
+    "due_date": [
+        r"Vencimiento actual:\s*(\d{2}/\d{2}/\d{2,4})",
+        r"Vencimiento:\s*(\d{2}/\d{2}/\d{2,4})",
+        r"C\.E\.S\.P\..*?:\s*(\d{2}/\d{2}/\d{2,4})",
+        r"Fecha de vencimiento:\s*(\d{2}/\d{2}/\d{2,4})",
+        r"VENCIMIENTO\s*(\d{2}/\d{2}/\d{2,4})",
+    ],
+    "total_amount": [
+        r"TOTAL\s*\$\s*([\d,.]+)",
+        r"Total a pagar.*?\$\s*([\d,.]+)",
+        r"Importe Total:?\s*\$\s*([\d,.]+)",
+        r"TOTAL PESOS:\s*\$\s*([\d,.]+)",
+        r"IMPORTE A PAGAR\s*\$\s*([\d,.]+)",
+        r"\$\s*([\d,.]+)(?=\s*$)",
+    ],
+    # Business information
+    "business_info": [
+        r"CUIT[^:]*?:\s*([\d-]+)",
+        r"INGRESOS BRUTOS:\s*(\d+)",
+        r"IVA\s*([^:\n]+?)(?=\n)",
+        r"Inicio[^:]*?:\s*(\d{2}/\d{2}/\d{4})",
+        r"ESTABLECIMIENTO[^:]*?:\s*([\d-]+)",
+    ],
+    # Service period
+    "service_period": [
+        r"PERIODO\s+([^$\n]+?)(?=\s+VENCIMIENTO)",
+        r"Período Facturado:\s*([\w\s/]+)",
+        r"(\d{2}/\d{2}/\d{2,4})\s*al\s*(\d{2}/\d{2}/\d{2,4})",
+    ],
+    # Address patterns
+    "address": [
+        r"Domicilio:\s*(.*?)(?=\n)",
+        r"DOMICILIO POSTAL\s*(?:Calle)?\s*(.*?)(?=\n)",
+        r"Domicilio suministro:\s*(?:CL\s+)?(.*?)(?=\d{4})",
+        r"(?:CL|Calle)\s+(.*?)(?=\d{4})",
+        r"Dirección de suministro:\s*(.*?)(?=\n)",
+    ],
+    "postal_code": [
+        r"(?:CL|Domicilio).*?(\d{4})\s+([A-Z\s]+)",
+        r"C\.P\.:\s*(\d{4})",
+        r"CP:\s*(\d{4})",
+    ],
+    "location": [
+        r"(?:CL|Domicilio).*?\d{4}\s+([A-Z\s]+(?:SAN RAFAEL|MENDOZA|BUENOS AIRES)[A-Z\s]+)",
+        r"Localidad:\s*([A-Z\s]+)",
+        r"Loc\.:\s*([A-Z\s]+)",
+    ],
+    # Charges and services
+    "charges": [
+        r"(Cargo Fijo[^$]*?)\$\s*([\d,.]+)",
+        r"(Cargo Variable[^$]*?)\$\s*([\d,.]+)",
+        r"(Subsidio[^:]*?):\s*\$?\s*(-?[\d,.]+)",
+        r"(Impuesto[^:]*?):\s*\$?\s*([\d,.]+)",
+        r"(Cargo[^:]*?):\s*\$?\s*([\d,.]+)",
+        r"(Bonificación[^:]*?):\s*\$?\s*(-?[\d,.]+)",
+        r"(Cuota Fija[^$]*?)\$?\s*([\d,.]+)",
+        r"([\w\s]+?)\s*\$\s*([\d,.]+)(?=\n)",
+    ],
+    # Service details
+    "service_details": [
+        r"(\d{2}/\d{4})\s+(\d+)\s+([A-Z\s]+)\s+(\d+\s*[A-Z]+)\s+\$\s*([\d,.]+)",
+        r"FTTH\s+([^$\n]+?)(?=\s+\$)",
+        r"Internet\s+(\d+\s*MB)",
+    ],
+    # Additional identifiers
+    "invoice_number": [
+        r"FACTURA\s+([A-Z]\s+[\d-]+)",
+        r"B-(\d+)",
+        r"Nº\s*(\d{3}-\d{7}-\d{3}-\d)",
+    ],
+    # Payment installments
+    "installments": [
+        r"CUOTA\s+\d+\s+VENCIMIENTO\s+(\d{2}/\d{2}/\d{4})\s+IMPORTE\s+\$\s*([\d,.]+)"
+    ],
+    "consumption": [
+        r"Consumo Medido\s+(\d+)\s*m³",
+        r"Factor de correción.*?\(1\)\s+(\d+\.\d+)",
+        r"Calorías suministradas\s+(\d+\.\d+)\s*kcal",
+        r"Consumo a facturar a \d+ kcal/m³\s+(\d+)\s*x\s+(\d+\.\d+)\s*x\s*\(\s*(\d+\.\d+)\s*\)\s+(\d+)\s*m³",
+        r"M3 asignados.*?(\d+\.\d+)\s*m³",
+        r"Cargo Variable kWh\s+(\d+)\s+([\d,.]+)\s+([\d,.]+)",
+    ],
+}
+
+# Flag sets each category is matched with by GenericBillParser
+CATEGORY_FLAGS: Dict[str, Tuple[int, ...]] = {
+    "charges": (MATCH_ALL_FLAGS,),
+    "service_details": (MATCH_ALL_FLAGS,),
+    "installments": (MATCH_ALL_FLAGS,),
+    "consumption": (FIELD_FLAGS, 0),
+}
+
+APARTMENT_PATTERN = re.compile(r"Dpto:(\d{2}-\d{2})")
+CONSUMPTION_HISTORY_PATTERN = re.compile(r"(\d{2}/\d{2})\s+(\d+(?:,\d+)?)")
+
+
+@lru_cache(maxsize=None)
+def compile_pattern(pattern: str, flags: int = FIELD_FLAGS) -> Pattern:
+    """Compile a pattern once per process, independently of the ``re`` cache."""
+    return re.compile(pattern, flags)
+
+
+# Returned by FirstMatchScanner when the single pass cannot decide the result
+UNRESOLVED = object()
+
+
+class FirstMatchScanner:
+    """
+    Resolve a whole category of first-match patterns in one walk over the text.
+
+    The patterns are combined into alternation automata where every branch ends
+    with an empty marker group identifying it. At each position the alternation
+    reports the highest priority pattern matching there; after a hit the walk
+    resumes one character later using only the patterns with a higher priority.
+    The result is the same as calling ``search`` with each pattern in order and
+    keeping the first one that matches.
+    """
+
+    def __init__(self, patterns: List[Pattern]):
+        self.patterns = patterns
+        self._automata: Dict[int, Pattern] = {}
+        # First group of each pattern inside the combined automata
+        self._first_groups: List[int] = []
+        self._pattern_by_marker: Dict[int, int] = {}
+
+        group = 0
+        for index, pattern in enumerate(patterns):
+            self._first_groups.append(group + 1)
+            group += pattern.groups + 1
+            self._pattern_by_marker[group] = index
+
+    def _automaton(self, limit: int) -> Pattern:
+        """Return the automaton combining the ``limit`` highest priority patterns."""
+        automaton = self._automata.get(limit)
+        if automaton is None:
+            flags = self.patterns[0].flags if self.patterns else 0
+            automaton = re.compile(
+                "|".join(
+                    f"(?:{pattern.pattern})()" for pattern in self.patterns[:limit]
+                ),
+                flags,
+            )
+            self._automata[limit] = automaton
+        return automaton
+
+    def search(self, text: str, default: Any = None) -> Any:
+        """
+        Return the stripped first group of the highest priority matching pattern.
+
+        Returns ``UNRESOLVED`` when a pattern matches without capturing its
+        first group, since only per-pattern extraction can then decide.
+        """
+        result = default
+        limit = len(self.patterns)
+        position = 0
+
+        while limit:
+            match = self._automaton(limit).search(text, position)
+            if match is None:
+                break
+
+            index = self._pattern_by_marker[match.lastindex]
+            if self.patterns[index].groups == 0:
+                return UNRESOLVED
+            value = match.group(self._first_groups[index])
+            if value is None:
+                return UNRESOLVED
+
+            result = value.strip()
+            limit = index
+            position = match.start() + 1
+
+        return result
+
+
+class PatternRegistry:
+    """
+    Compiled regex patterns grouped by category.
+
+    Patterns are compiled once per (category, flags) pair and shared by every
+    parser using the registry. Adding a pattern only recompiles its category.
+    """
+
+    def __init__(self, patterns: Dict[str, List[str]]):
+        self.patterns = {category: list(items) for category, items in patterns.items()}
+        self._compiled: Dict[Tuple[str, int], List[Pattern]] = {}
+        self._scanners: Dict[Tuple[str, int], FirstMatchScanner] = {}
+
+    def build(self, category_flags: Dict[str, Tuple[int, ...]]) -> "PatternRegistry":
+        """Compile every category with the flags it is matched with."""
+        for category in self.patterns:
+            for flags in category_flags.get(category, (FIELD_FLAGS,)):
+                self.compiled(category, flags)
+        return self
+
+    def compiled(self, category: str, flags: int = FIELD_FLAGS) -> List[Pattern]:
+        """Return the compiled patterns of a category."""
+        key = (category, flags)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            compiled = [
+                compile_pattern(pattern, flags) for pattern in self.patterns[category]
+            ]
+            self._compiled[key] = compiled
+        return compiled
+
+    def scanner(self, category: str, flags: int = FIELD_FLAGS) -> FirstMatchScanner:
+        """Return the single-pass scanner of a category."""
+        key = (category, flags)
+        scanner = self._scanners.get(key)
+        if scanner is None:
+            scanner = FirstMatchScanner(self.compiled(category, flags))
+            self._scanners[key] = scanner
+        return scanner
+
+    def add(self, category: str, pattern: str) -> None:
+        """Add a pattern and recompile only the affected category."""
+        self.patterns.setdefault(category, []).append(pattern)
+        self.invalidate(category)
+
+    def invalidate(self, category: str) -> None:
+        """Drop and rebuild the compiled patterns of a single category."""
+        flag_sets = [flags for key, flags in self._compiled if key == category]
+        for flags in flag_sets:
+            del self._compiled[(category, flags)]
+            self._scanners.pop((category, flags), None)
+            self.compiled(category, flags)
+
+    def copy(self) -> "PatternRegistry":
+        """Return an independent registry sharing the already compiled patterns."""
+        clone = PatternRegistry(self.patterns)
+        clone._compiled = dict(self._compiled)
+        clone._scanners = dict(self._scanners)
+        return clone
+
+
+DEFAULT_REGISTRY = PatternRegistry(DEFAULT_PATTERNS).build(CATEGORY_FLAGS)
+
+
 class GenericBillParser:
-    def __init__(self):
-        # Dictionary to store all patterns
-        self.patterns = {
-            # Basic information patterns
-            "date": [
-                r"Fecha(?:\sde)?\semisión:\s*(\d{2}/\d{2}/\d{2,4})",
-                r"Fecha:\s*(\d{2}/\d{2}/\d{2,4})",
-                r"Emisión:\s*(\d{2}/\d{2}/\d{2,4})",
-                r"FECHA DE EMISIÓN\s*(\d{2}/\d{2}/\d{2,4})",
-            ],
-            "account_number": [
-                r"NÚMERO DE CUENTA:\s*(\d+)",
-                r"CÓDIGO PAGO ELECTRÓNICO\s*(\d+)",
-                r"Cod\.\s*018\s*(\d+)",
-                r"N° de Cliente:\s*(\d+)",
-                r"(?:Cuenta|Account)(?:\sNº)?:\s*(\d+)",
-                r"N° DE CLIENTE\s*(\d+)",
-                r"Nº\s*(\d{3}-\d{7}-\d{3}-\d)",
-                r"Código de LINK PAGOS / BANELCO:\s*(\d+)",
-            ],
-            "customer_name": [
-                r"(?:NOMBRE:|Cliente:)\s*([\w\s,]+?)(?=\n)",
-                r"(?<=\n)((?!CÓDIGO PAGO ELECTRÓNICO)[\w\s]+?)(?=\nCL\s)",
-                r"Titular:\s*([\w\s,]+?)(?=\n)",
-                r"APELLIDO Y NOMBRE[^:]*?:\s*([\w\s,]+?)(?=\n)",
-                r"^([A-Z\s,]+?)(?=\s+Vencimiento)",
-            ],
-            "due_date": [
-                r"Vencimiento actual:\s*(\d{2}/\d{2}/\d{2,4})",
-                r"Vencimiento:\s*(\d{2}/\d{2}/\d{2,4})",
-                r"C\.E\.S\.P\..*?:\s*(\d{2}/\d{2}/\d{2,4})",
-                r"Fecha de vencimiento:\s*(\d{2}/\d{2}/\d{2,4})",
-                r"VENCIMIENTO\s*(\d{2}/\d{2}/\d{2,4})",
-            ],
-            "total_amount": [
-                r"TOTAL\s*\$\s*([\d,.]+)",
-                r"Total a pagar.*?\$\s*([\d,.]+)",
-                r"Importe Total:?\s*\$\s*([\d,.]+)",
-                r"TOTAL PESOS:\s*\$\s*([\d,.]+)",
-                r"IMPORTE A PAGAR\s*\$\s*([\d,.]+)",
-                r"\$\s*([\d,.]+)(?=\s*$)",
-            ],
-            # Business information
-            "business_info": [
-                r"CUIT[^:]*?:\s*([\d-]+)",
-                r"INGRESOS BRUTOS:\s*(\d+)",
-                r"IVA\s*([^:\n]+?)(?=\n)",
-                r"Inicio[^:]*?:\s*(\d{2}/\d{2}/\d{4})",
-                r"ESTABLECIMIENTO[^:]*?:\s*([\d-]+)",
-            ],
-            # Service period
-            "service_period": [
-                r"PERIODO\s+([^$\n]+?)(?=\s+VENCIMIENTO)",
-                r"Período Facturado:\s*([\w\s/]+)",
-                r"(\d{2}/\d{2}/\d{2,4})\s*al\s*(\d{2}/\d{2}/\d{2,4})",
-            ],
-            # Address patterns
-            "address": [
-                r"Domicilio:\s*(.*?)(?=\n)",
-                r"DOMICILIO POSTAL\s*(?:Calle)?\s*(.*?)(?=\n)",
-                r"Domicilio suministro:\s*(?:CL\s+)?(.*?)(?=\d{4})",
-                r"(?:CL|Calle)\s+(.*?)(?=\d{4})",
-                r"Dirección de suministro:\s*(.*?)(?=\n)",
-            ],
-            "postal_code": [
-                r"(?:CL|Domicilio).*?(\d{4})\s+([A-Z\s]+)",
-                r"C\.P\.:\s*(\d{4})",
-                r"CP:\s*(\d{4})",
-            ],
-            "location": [
-                r"(?:CL|Domicilio).*?\d{4}\s+([A-Z\s]+(?:SAN RAFAEL|MENDOZA|BUENOS AIRES)[A-Z\s]+)",
-                r"Localidad:\s*([A-Z\s]+)",
-                r"Loc\.:\s*([A-Z\s]+)",
-            ],
-            # Charges and services
-            "charges": [
-                r"(Cargo Fijo[^$]*?)\$\s*([\d,.]+)",
-                r"(Cargo Variable[^$]*?)\$\s*([\d,.]+)",
-                r"(Subsidio[^:]*?):\s*\$?\s*(-?[\d,.]+)",
-                r"(Impuesto[^:]*?):\s*\$?\s*([\d,.]+)",
-                r"(Cargo[^:]*?):\s*\$?\s*([\d,.]+)",
-                r"(Bonificación[^:]*?):\s*\$?\s*(-?[\d,.]+)",
-                r"(Cuota Fija[^$]*?)\$?\s*([\d,.]+)",
-                r"([\w\s]+?)\s*\$\s*([\d,.]+)(?=\n)",
-            ],
-            # Service details
-            "service_details": [
-                r"(\d{2}/\d{4})\s+(\d+)\s+([A-Z\s]+)\s+(\d+\s*[A-Z]+)\s+\$\s*([\d,.]+)",
-                r"FTTH\s+([^$\n]+?)(?=\s+\$)",
-                r"Internet\s+(\d+\s*MB)",
-            ],
-            # Additional identifiers
-            "invoice_number": [
-                r"FACTURA\s+([A-Z]\s+[\d-]+)",
-                r"B-(\d+)",
-                r"Nº\s*(\d{3}-\d{7}-\d{3}-\d)",
-            ],
-            # Payment installments
-            "installments": [
-                r"CUOTA\s+\d+\s+VENCIMIENTO\s+(\d{2}/\d{2}/\d{4})\s+IMPORTE\s+\$\s*([\d,.]+)"
-            ],
-            "consumption": [
-                r"Consumo Medido\s+(\d+)\s*m³",
-                r"Factor de correción.*?\(1\)\s+(\d+\.\d+)",
-                r"Calorías suministradas\s+(\d+\.\d+)\s*kcal",
-                r"Consumo a facturar a \d+ kcal/m³\s+(\d+)\s*x\s+(\d+\.\d+)\s*x\s*\(\s*(\d+\.\d+)\s*\)\s+(\d+)\s*m³",
-                r"M3 asignados.*?(\d+\.\d+)\s*m³",
-                r"Cargo Variable kWh\s+(\d+)\s+([\d,.]+)\s+([\d,.]+)",
-            ],
-        }
+    def __init__(
+        self, registry: Optional[PatternRegistry] = None, single_pass: bool = False
+    ):
+        # Compiled patterns are shared by every parser using the same registry
+        self.registry = registry or DEFAULT_REGISTRY
+        # Resolve each first-match category in one walk over the text
+        self.single_pass = single_pass
+
+    @property
+    def patterns(self) -> Dict[str, List[str]]:
+        """Raw patterns of every category."""
+        return self.registry.patterns
 
     def add_pattern(self, category: str, pattern: str) -> None:
         """Add a new pattern to an existing category or create a new category."""
-        if category in self.patterns:
-            self.patterns[category].append(pattern)
-        else:
-            self.patterns[category] = [pattern]
-
-    def extract_field(self, text: str, patterns: List[str], default: Any = None) -> Any:
+        if self.registry is DEFAULT_REGISTRY:
+            # Keep the shared registry untouched for every other parser
+            self.registry = self.registry.copy()
+        self.registry.add(category, pattern)
+
+    def extract_field(
+        self, text: str, patterns: List[Union[str, Pattern]], default: Any = None
+    ) -> Any:
         """Extract a field using multiple regex patterns."""
         for pattern in patterns:
+            if isinstance(pattern, str):
+                pattern = compile_pattern(pattern, FIELD_FLAGS)
             try:
-                match = re.search(pattern, text, re.MULTILINE | re.IGNORECASE)
+                match = pattern.search(text)
                 if match:
                     return match.group(1).strip()
             except (AttributeError, IndexError):
                 continue
         return default
 
+    def extract_category(self, text: str, category: str, default: Any = None) -> Any:
+        """Extract a field using the compiled patterns of a category."""
+        if self.single_pass:
+            value = self.registry.scanner(category).search(text, default)
+            if value is not UNRESOLVED:
+                return value
+        return self.extract_field(text, self.registry.compiled(category), default)
+
     def extract_charges(self, text: str) -> Dict[str, Decimal]:
         """Extract all charges from the bill."""
         charges = {}
-        for pattern in self.patterns["charges"]:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
+        for pattern in self.registry.compiled("charges", MATCH_ALL_FLAGS):
+            matches = pattern.finditer(text)
             for match in matches:
                 try:
                     concept = match.group(1).strip() if match.group(1) else ""
@@ -185,24 +372,25 @@ class GenericBillParser:
 
     def extract_business_info(self, text: str) -> Dict[str, str]:
         """Extract business information."""
-        info = {}
-        for field in [
-            "CUIT",
-            "INGRESOS BRUTOS",
-            "IVA",
-            "INICIO ACTIVIDAD",
-            "ESTABLECIMIENTO",
-        ]:
-            value = self.extract_field(text, self.patterns["business_info"])
-            if value:
-                info[field] = value
-        return info
+        value = self.extract_category(text, "business_info")
+        if not value:
+            return {}
+        return {
+            field: value
+            for field in [
+                "CUIT",
+                "INGRESOS BRUTOS",
+                "IVA",
+                "INICIO ACTIVIDAD",
+                "ESTABLECIMIENTO",
+            ]
+        }
 
     def extract_installments(self, text: str) -> List[Dict[str, Any]]:
         """Extract payment installments if available."""
         installments = []
-        for pattern in self.patterns["installments"]:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
+        for pattern in self.registry.compiled("installments", MATCH_ALL_FLAGS):
+            matches = pattern.finditer(text)
             for match in matches:
                 installments.append(
                     {
@@ -215,8 +403,8 @@ class GenericBillParser:
     def extract_service_details(self, text: str) -> List[Dict[str, Any]]:
         """Extract service details."""
         details = []
-        for pattern in self.patterns["service_details"]:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
+        for pattern in self.registry.compiled("service_details", MATCH_ALL_FLAGS):
+            matches = pattern.finditer(text)
             for match in matches:
                 if len(match.groups()) >= 2:
                     details.append(
@@ -234,15 +422,15 @@ class GenericBillParser:
         address = Address()
 
         # Extract street and number
-        street_match = self.extract_field(text, self.patterns["address"])
+        street_match = self.extract_category(text, "address")
         if street_match:
             parts = street_match.split()
             address.street = " ".join(parts[:-1]) if len(parts) > 1 else street_match
             address.number = parts[-1] if len(parts) > 1 else None
 
         # Extract location information
-        address.postal_code = self.extract_field(text, self.patterns["postal_code"])
-        location_match = self.extract_field(text, self.patterns["location"])
+        address.postal_code = self.extract_category(text, "postal_code")
+        location_match = self.extract_category(text, "location")
         if location_match:
             address.city = next(
                 (
@@ -260,7 +448,7 @@ class GenericBillParser:
                 )
 
         # Extract apartment information
-        apt_match = re.search(r"Dpto:(\d{2}-\d{2})", text)
+        apt_match = APARTMENT_PATTERN.search(text)
         if apt_match:
             address.apartment = apt_match.group(1)
 
@@ -269,8 +457,7 @@ class GenericBillParser:
     def extract_consumption_history(self, text: str) -> Dict[str, float]:
         """Extract consumption history."""
         history = {}
-        history_pattern = r"(\d{2}/\d{2})\s+(\d+(?:,\d+)?)"
-        matches = re.finditer(history_pattern, text)
+        matches = CONSUMPTION_HISTORY_PATTERN.finditer(text)
 
         for match in matches:
             period = match.group(1)
@@ -304,17 +491,20 @@ class GenericBillParser:
         self, text: str
     ) -> Dict[str, Optional[Union[Decimal, Dict]]]:
         """Extract consumption information with safe decimal conversion."""
+        patterns = self.registry.compiled("consumption", FIELD_FLAGS)
+        strict_patterns = self.registry.compiled("consumption", 0)
+
         measured = self.safe_decimal_convert(
-            self.extract_field(text, [self.patterns["consumption"][0]]) or None
+            self.extract_field(text, [patterns[0]]) or None
         )
         factor = self.safe_decimal_convert(
-            self.extract_field(text, [self.patterns["consumption"][1]]) or None
+            self.extract_field(text, [patterns[1]]) or None
         )
         calories = self.safe_decimal_convert(
-            self.extract_field(text, [self.patterns["consumption"][2]]) or None
+            self.extract_field(text, [patterns[2]]) or None
         )
 
-        consumption_match = re.search(self.patterns["consumption"][3], text)
+        consumption_match = strict_patterns[3].search(text)
         billed = (
             self.safe_decimal_convert(consumption_match.group(4))
             if consumption_match
@@ -322,10 +512,10 @@ class GenericBillParser:
         )
 
         assigned = self.safe_decimal_convert(
-            self.extract_field(text, [self.patterns["consumption"][4]]) or None
+            self.extract_field(text, [patterns[4]]) or None
         )
 
-        variable_charge_match = re.search(self.patterns["consumption"][5], text)
+        variable_charge_match = strict_patterns[5].search(text)
         variable_charge = {
             "kwh": None,
             "rate": None,
@@ -351,13 +541,13 @@ class GenericBillParser:
     def parse(self, text: str) -> Dict[str, Any]:
         """Parse all relevant information from the bill text."""
         data = {
-            "invoice_number": self.extract_field(text, self.patterns["invoice_number"]),
-            "invoice_date": self.extract_field(text, self.patterns["date"]),
-            "account_number": self.extract_field(text, self.patterns["account_number"]),
-            "customer_name": self.extract_field(text, self.patterns["customer_name"]),
-            "due_date": self.extract_field(text, self.patterns["due_date"]),
-            "total_amount": self.extract_field(text, self.patterns["total_amount"]),
-            "service_period": self.extract_field(text, self.patterns["service_period"]),
+            "invoice_number": self.extract_category(text, "invoice_number"),
+            "invoice_date": self.extract_category(text, "date"),
+            "account_number": self.extract_category(text, "account_number"),
+            "customer_name": self.extract_category(text, "customer_name"),
+            "due_date": self.extract_category(text, "due_date"),
+            "total_amount": self.extract_category(text, "total_amount"),
+            "service_period": self.extract_category(text, "service_period"),
             "address": self.extract_address(text).__dict__,
             "business_info": self.extract_business_info(text),
             "charges": self.extract_charges(text),
@@ -369,6 +559,11 @@ class GenericBillParser:
         return {k: v for k, v in data.items() if v is not None and v != {} and v != ""}
 
 
+def parse_bill_text(text: str) -> Dict[str, Any]:
+    """Parse a bill text. Runs in the CPU executor."""
+    return GenericBillParser().parse(text)
+
+
 async def convert_data_to_json(content: Union[str, Dict]) -> Dict:
     """Convert bill content to JSON format."""
     try:
@@ -379,8 +574,7 @@ async def convert_data_to_json(content: Union[str, Dict]) -> Dict:
         if not isinstance(content, str):
             raise ValueError("Content must be string")
 
-        parser = GenericBillParser()
-        data = parser.parse(content)
+        data = await get_cpu_executor().run(parse_bill_text, content)
 
         # Convert Decimal objects to strings
         def convert_decimal(obj):
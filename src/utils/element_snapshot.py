@@ -0,0 +1,94 @@
+import logging
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+from playwright.async_api import ElementHandle, Page
+
+from src.core.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Identifier of the first form inside an element: its action plus input values
+FORM_ID_SCRIPT = """
+    form => {
+        const action = form.getAttribute("action") || "";
+        const inputs = Array.from(form.querySelectorAll("input")).map(
+            i => i.getAttribute("value")
+        ).join(",");
+        return `${action}-${inputs}`;
+    }
+"""
+
+# Collects href, text and form identifier of every element in one evaluation
+SNAPSHOT_SCRIPT = f"""
+    elements => {{
+        const formId = {FORM_ID_SCRIPT};
+        return elements.map(element => {{
+            const form = element.querySelector("form");
+            return [
+                element.getAttribute("href"),
+                element.textContent,
+                form ? formId(form) : null,
+            ];
+        }});
+    }}
+"""
+
+
+@dataclass
+class ElementSnapshot:
+    """Attributes of a page element read by the scraping actions."""
+
+    href: Optional[str]
+    text: Optional[str]
+    form_id: Optional[str]
+
+
+async def snapshot_element(element: ElementHandle) -> ElementSnapshot:
+    """
+    Read the attributes of a single element, one round trip per value.
+
+    An element that cannot be read, e.g. detached from the page, gets an
+    empty snapshot.
+    """
+    try:
+        form = await element.query_selector("form")
+        return ElementSnapshot(
+            href=await element.get_attribute("href"),
+            text=await element.text_content(),
+            form_id=await form.evaluate(FORM_ID_SCRIPT) if form else None,
+        )
+    except Exception as e:
+        logger.warning(f"Could not read element, leaving it empty: {e}")
+        return ElementSnapshot(href=None, text=None, form_id=None)
+
+
+async def snapshot_elements(
+    page: Page, elements: List[ElementHandle], bulk: Optional[bool] = None
+) -> List[ElementSnapshot]:
+    """
+    Read href, text and form identifier of several elements.
+
+    The bulk path runs a single in-page evaluation over all handles and keeps
+    the order of ``elements``. If it is disabled or fails, every element is
+    read on its own and unreadable ones get an empty snapshot in their place.
+
+    Args:
+        page: Playwright page the elements belong to
+        elements: Element handles to read
+        bulk: Use the single evaluation. Defaults to ``SCRAP_BULK_SNAPSHOT``
+
+    Returns:
+        One snapshot per element
+    """
+    if not elements:
+        return []
+
+    if Config.SCRAP_BULK_SNAPSHOT if bulk is None else bulk:
+        try:
+            rows: List[List[Any]] = await page.evaluate(SNAPSHOT_SCRIPT, elements)
+            return [ElementSnapshot(*row) for row in rows]
+        except Exception as e:
+            logger.warning(f"Bulk element snapshot failed, reading one by one: {e}")
+
+    return [await snapshot_element(element) for element in elements]
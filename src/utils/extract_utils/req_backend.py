@@ -1,5 +1,4 @@
 import json
-from src.core.config import Config
 from src.services.http_client import MainServiceClient
 
 client = MainServiceClient()
@@ -38,13 +37,9 @@ async def save_consumed_data(user_service_id, consumed_data):
     if not consumption_to_save:
         return "No new data to save"
 
-    # Prepare data for the PATCH request
-    data = {
-        "consumption_data": consumed_data,
-    }
     # Send the PATCH request to update the backend
-    response = await client.make_request(
-        "patch", f"{Config.BACKEND_URL}/scrapped-data/{scrapped_data_id}", data
+    response = await client.update_scrapped_data(
+        scrapped_data_id=scrapped_data_id, consumption_data=consumed_data
     )
     if not response:
         return "Failed to save data"
@@ -1,19 +1,26 @@
 from typing import Any, Dict
 import pdfplumber
 
+from src.core.cpu_executor import get_cpu_executor
 from src.utils.convert_data import GenericBillParser
 
 
+def extract_pdf_text(pdf_path: str, separator: str = "\n") -> str:
+    """Extract the text of every page of a PDF. Runs in the CPU executor."""
+    with pdfplumber.open(pdf_path) as pdf:
+        pages_text = (page.extract_text() for page in pdf.pages)
+        return separator.join(text for text in pages_text if text)
+
+
+def parse_bill_pdf(pdf_path: str) -> Dict[str, Any]:
+    """Extract and parse a bill PDF. Runs in the CPU executor."""
+    return GenericBillParser().parse(extract_pdf_text(pdf_path))
+
+
 async def process_utility_bill_pdf(pdf_path: str) -> Dict[str, Any]:
     """Process a utility bill PDF and return structured data."""
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            text = "\n".join(
-                page.extract_text() for page in pdf.pages if page.extract_text()
-            )
-
-        parser = GenericBillParser()
-        return parser.parse(text)
+        return await get_cpu_executor().run(parse_bill_pdf, pdf_path)
     except Exception as e:
         print(f"Error processing utility bill PDF: {str(e)}")
         return {}
@@ -0,0 +1,364 @@
+"""
+Asyncio worker running many scrape jobs at once in one process.
+
+An alternative to the Celery prefork worker for I/O bound lanes. It consumes
+the same Redis queue as ``python -m src.workers.lanes interactive``, takes the
+same ``scrap_task`` messages and stores their results in the Celery result
+backend, so callers cannot tell which kind of worker ran a job. Jobs share
+one event loop, browser pool and HTTP client. At most
+ASYNC_WORKER_CONCURRENCY of them run at once, and new ones wait while the
+container is short of memory.
+
+The first SIGTERM/SIGINT stops consuming and lets running jobs finish; a
+second one cancels them. Jobs not finished are requeued.
+
+Usage:
+    python -m src.workers.async_worker [--queue scrap.interactive] [--concurrency 24]
+"""
+
+import argparse
+import asyncio
+import functools
+import logging
+import signal
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from celery import Celery, states
+from kombu import Message
+
+from src.core.config import Config
+from src.core.cpu_executor import get_cpu_executor
+from src.core.metrics import (
+    QUEUE_WAIT_SECONDS,
+    register_component_stats,
+    start_worker_exporter,
+)
+from src.core.tracing import TRACEPARENT_HEADER, attach, detach, span
+from src.workers.lanes import lane_of_queue
+
+logger = logging.getLogger(__name__)
+
+# Seconds a drain of the broker connection waits for messages
+DRAIN_TIMEOUT = 1.0
+
+
+@dataclass
+class AsyncWorkerMetrics:
+    """Counters of the asyncio worker in this process."""
+
+    received: int = 0
+    running: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    requeued: int = 0
+    rejected: int = 0
+    memory_waits: int = 0
+
+
+_metrics = AsyncWorkerMetrics()
+
+
+def get_async_worker_metrics() -> Dict[str, Any]:
+    """Return the asyncio worker counters of this process."""
+    return asdict(_metrics)
+
+
+register_component_stats("async_worker", get_async_worker_metrics)
+
+
+def memory_usage() -> Optional[float]:
+    """
+    Return the fraction of the container memory limit in use.
+
+    Browsers are child processes, so the whole cgroup is measured rather than
+    this process. Without a cgroup limit the host memory is used.
+
+    Returns:
+        Fraction in use, or None if it cannot be read
+    """
+    try:
+        # cgroup v2
+        with open("/sys/fs/cgroup/memory.max") as f:
+            limit = f.read().strip()
+        if limit != "max":
+            with open("/sys/fs/cgroup/memory.current") as f:
+                return int(f.read()) / int(limit)
+    except (OSError, ValueError):
+        pass
+
+    try:
+        # cgroup v1, whose "unlimited" is a huge number
+        with open("/sys/fs/cgroup/memory/memory.limit_in_bytes") as f:
+            limit = int(f.read())
+        if limit < 1 << 60:
+            with open("/sys/fs/cgroup/memory/memory.usage_in_bytes") as f:
+                return int(f.read()) / limit
+    except (OSError, ValueError):
+        pass
+
+    try:
+        with open("/proc/meminfo") as f:
+            info = {
+                line.split(":")[0]: int(line.split()[1]) for line in f if ":" in line
+            }
+        return 1 - info["MemAvailable"] / info["MemTotal"]
+    except (OSError, ValueError, KeyError, IndexError):
+        return None
+
+
+class Admission:
+    """
+    Global job semaphore that also holds new jobs back under memory pressure.
+
+    A job is admitted once a slot is free and memory use is below
+    ``high_water``. When nothing is running a job is always admitted, so a
+    high baseline cannot stall the worker.
+    """
+
+    def __init__(
+        self,
+        concurrency: int,
+        high_water: float,
+        poll_interval: float = 1.0,
+        usage: Callable[[], Optional[float]] = memory_usage,
+    ):
+        self.high_water = high_water
+        self.poll_interval = poll_interval
+        self.running = 0
+        self._usage = usage
+        self._slots = asyncio.Semaphore(concurrency)
+
+    def _under_pressure(self) -> bool:
+        usage = self._usage()
+        return usage is not None and usage >= self.high_water
+
+    async def acquire(self) -> None:
+        await self._slots.acquire()
+        try:
+            if self.running and self._under_pressure():
+                _metrics.memory_waits += 1
+                while self.running and self._under_pressure():
+                    await asyncio.sleep(self.poll_interval)
+        except BaseException:
+            self._slots.release()
+            raise
+        self.running += 1
+
+    def release(self) -> None:
+        self.running -= 1
+        self._slots.release()
+
+
+class AsyncWorker:
+    """
+    Consume Celery task messages from ``queue`` and run them as coroutines.
+
+    Args:
+        app: Celery app whose broker, queues and result backend are used
+        queue: Queue to consume
+        handlers: Coroutine function per task name, called with the task's
+            arguments and ``task_id``
+        concurrency: Jobs running at once
+    """
+
+    def __init__(
+        self,
+        app: Celery,
+        queue: str,
+        handlers: Dict[str, Callable[..., Awaitable[Any]]],
+        concurrency: Optional[int] = None,
+        admission: Optional[Admission] = None,
+    ):
+        self.app = app
+        self.queue = queue
+        self.handlers = handlers
+        self.concurrency = concurrency or Config.ASYNC_WORKER_CONCURRENCY
+        self.admission = admission or Admission(
+            self.concurrency,
+            Config.ASYNC_WORKER_MEMORY_HIGH_WATER,
+            Config.ASYNC_WORKER_MEMORY_POLL_INTERVAL,
+        )
+        # kombu channels are not thread-safe: every broker call uses this thread
+        self._io = ThreadPoolExecutor(1, thread_name_prefix="async-worker-io")
+        self._jobs: Set[asyncio.Task] = set()
+        self._waiting: Set[asyncio.Task] = set()
+        self._stopping: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def _broker(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        return await self._loop.run_in_executor(
+            self._io, functools.partial(func, *args, **kwargs)
+        )
+
+    def stop(self) -> None:
+        """Stop consuming and requeue jobs not started; called again, cancel all."""
+        if self._stopping.is_set():
+            logger.warning("Cancelling running jobs")
+            for job in list(self._jobs):
+                job.cancel()
+            return
+        logger.info("Stopping: waiting for running jobs to finish")
+        self._stopping.set()
+        for job in list(self._waiting):
+            job.cancel()
+
+    async def run(self) -> None:
+        """Consume until ``stop``, then wait for the jobs taken so far."""
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        queue = self.app.amqp.queues[self.queue]
+
+        def on_message(body: Any, message: Message) -> None:
+            # Runs on the I/O thread while draining
+            self._loop.call_soon_threadsafe(self._dispatch, body, message)
+
+        connection = self.app.connection_for_read()
+        try:
+            consumer = await self._broker(
+                connection.Consumer,
+                queues=[queue],
+                callbacks=[on_message],
+                accept=self.app.conf.accept_content,
+            )
+            await self._broker(consumer.qos, prefetch_count=self.concurrency)
+            await self._broker(consumer.consume)
+            logger.info(
+                f"Consuming {self.queue} with up to {self.concurrency} jobs at once"
+            )
+            while not self._stopping.is_set():
+                try:
+                    await self._broker(connection.drain_events, timeout=DRAIN_TIMEOUT)
+                except socket.timeout:
+                    continue
+            await self._broker(consumer.cancel)
+
+            if self._jobs:
+                await asyncio.gather(*list(self._jobs), return_exceptions=True)
+        finally:
+            await self._broker(connection.release)
+            self._io.shutdown(wait=True)
+
+    def _dispatch(self, body: Any, message: Message) -> None:
+        _metrics.received += 1
+        job = asyncio.ensure_future(self._handle(body, message))
+        self._jobs.add(job)
+        job.add_done_callback(self._jobs.discard)
+
+    async def _handle(self, body: Any, message: Message) -> None:
+        headers = message.headers or {}
+        task_name, task_id = headers.get("task"), headers.get("id")
+        handler = self.handlers.get(task_name)
+        if handler is None:
+            _metrics.rejected += 1
+            logger.error(f"No handler for task {task_name}, dropping {task_id}")
+            await self._broker(message.reject)
+            return
+
+        waiting = asyncio.current_task()
+        self._waiting.add(waiting)
+        try:
+            await self.admission.acquire()
+        except asyncio.CancelledError:
+            await self._requeue(message)
+            raise
+        finally:
+            self._waiting.discard(waiting)
+
+        _metrics.running += 1
+        parent = attach(headers.get(TRACEPARENT_HEADER))
+        try:
+            self._observe_queue_wait(task_name, headers, message)
+            args, kwargs = body[0], body[1]
+            with span(f"async_worker.{task_name}", task_id=task_id):
+                result = await handler(*args, task_id=task_id, **kwargs)
+        except asyncio.CancelledError:
+            await self._requeue(message)
+            raise
+        except Exception as e:
+            _metrics.failed += 1
+            logger.error(f"Job {task_id} failed: {str(e)}")
+            await self._store_result(task_id, e, states.FAILURE)
+        else:
+            _metrics.succeeded += 1
+            await self._store_result(task_id, result, states.SUCCESS)
+        finally:
+            _metrics.running -= 1
+            self.admission.release()
+            detach(parent)
+        await self._broker(message.ack)
+
+    def _observe_queue_wait(
+        self, task_name: str, headers: Dict[str, Any], message: Message
+    ) -> None:
+        published_at = headers.get("published_at")
+        if published_at is None:
+            return
+        queue = (message.delivery_info or {}).get("routing_key") or self.queue
+        QUEUE_WAIT_SECONDS.labels(
+            lane_of_queue(queue), task_name.rsplit(".", 1)[-1]
+        ).observe(max(0.0, time.time() - published_at))
+
+    async def _requeue(self, message: Message) -> None:
+        _metrics.requeued += 1
+        await asyncio.shield(self._broker(message.requeue))
+
+    async def _store_result(self, task_id: str, result: Any, state: str) -> None:
+        if not self.app.conf.result_backend:
+            return
+        try:
+            await asyncio.to_thread(
+                self.app.backend.store_result, task_id, result, state
+            )
+        except Exception as e:
+            logger.warning(f"Could not store the result of {task_id}: {str(e)}")
+
+
+async def _serve(
+    worker: AsyncWorker, closers: List[Callable[[], Awaitable[None]]]
+) -> None:
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, worker.stop)
+    try:
+        await worker.run()
+    finally:
+        for closer in closers:
+            try:
+                await closer()
+            except Exception as e:
+                logger.warning(f"Error closing worker resource: {str(e)}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    from src.workers.tasks import RESOURCE_CLOSERS, c_app, run_scrap_job, scrap_task
+
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--queue", default=Config.QUEUE_INTERACTIVE)
+    arg_parser.add_argument(
+        "--concurrency", type=int, default=Config.ASYNC_WORKER_CONCURRENCY
+    )
+    args = arg_parser.parse_args(argv)
+
+    browser_slots = Config.BROWSER_POOL_MAX_BROWSERS * Config.BROWSER_POOL_MAX_CONTEXTS
+    if args.concurrency > browser_slots:
+        logger.warning(
+            f"Only {browser_slots} browser contexts for {args.concurrency} jobs; "
+            "raise BROWSER_POOL_MAX_BROWSERS or BROWSER_POOL_MAX_CONTEXTS"
+        )
+
+    start_worker_exporter(Config.WORKER_METRICS_PORT)
+    worker = AsyncWorker(
+        c_app, args.queue, {scrap_task.name: run_scrap_job}, args.concurrency
+    )
+    try:
+        asyncio.run(_serve(worker, RESOURCE_CLOSERS))
+    finally:
+        get_cpu_executor().shutdown()
+
+
+if __name__ == "__main__":
+    main()
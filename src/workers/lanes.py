@@ -0,0 +1,76 @@
+"""
+Celery lanes: one queue and one worker per kind of work.
+
+Interactive ``/scrap`` jobs, batch runs over a whole service and bill
+extraction are routed to their own queues, each consumed by a worker with
+its own concurrency, so a long batch run never holds the slots a user
+facing refresh needs.
+
+Usage:
+    python -m src.workers.lanes interactive|batch|extraction [celery options]
+"""
+
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from src.core.config import Config
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+EXTRACTION = "extraction"
+
+
+@dataclass(frozen=True)
+class Lane:
+    name: str
+    queue: str
+    concurrency: int
+
+
+def get_lanes() -> Dict[str, Lane]:
+    """Lanes by name, as configured."""
+    return {
+        INTERACTIVE: Lane(
+            INTERACTIVE, Config.QUEUE_INTERACTIVE, Config.WORKER_INTERACTIVE_CONCURRENCY
+        ),
+        BATCH: Lane(BATCH, Config.QUEUE_BATCH, Config.WORKER_BATCH_CONCURRENCY),
+        EXTRACTION: Lane(
+            EXTRACTION, Config.QUEUE_EXTRACTION, Config.WORKER_EXTRACTION_CONCURRENCY
+        ),
+    }
+
+
+def lane_of_queue(queue: Optional[str]) -> str:
+    """Name of the lane consuming ``queue``, or the queue name itself."""
+    for lane in get_lanes().values():
+        if lane.queue == queue:
+            return lane.name
+    return queue or "unknown"
+
+
+def worker_argv(name: str, extra: Optional[List[str]] = None) -> List[str]:
+    """Arguments of ``celery worker`` serving only the lane ``name``."""
+    lane = get_lanes()[name]
+    return [
+        "worker",
+        "--loglevel=INFO",
+        f"--queues={lane.queue}",
+        f"--concurrency={lane.concurrency}",
+        f"--hostname={lane.name}@%h",
+        *(extra or []),
+    ]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in get_lanes():
+        sys.exit(f"usage: python -m src.workers.lanes {{{'|'.join(get_lanes())}}}")
+
+    from src.workers.tasks import c_app
+
+    c_app.worker_main(worker_argv(argv[0], argv[1:]))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,81 +1,235 @@
 import asyncio
 import importlib
 import logging
+import time
 
 from typing import Any, Dict
 from celery import Celery
+from billiard.process import current_process
+from celery.signals import (
+    before_task_publish,
+    task_postrun,
+    task_prerun,
+    worker_process_init,
+    worker_init,
+    worker_process_shutdown,
+    worker_shutdown,
+)
 from celery.schedules import crontab
 from celery.contrib.abortable import AbortableTask
 import ast
 
 from src.core.errors import WebScrapingError
 from src.core.logging_config import setup_logging
-from src.utils.browser_invoker import InvokerBrowser
+from src.services.backend_cache import backend_job_cache
+from src.services.batch_scrap_service import BatchProgress, BatchScrapService
+from src.services.browser_pool import close_browser_pool
+from src.services.captcha_solver import close_captcha_pool
+from src.services.inflight_jobs import InflightJobs, job_key
 from src.services.web_scrap_service import WebScrapService
 from src.services.extract_data_service import ExtractDataService
 from src.core.config import Config
-from src.services.http_client import MainServiceClient
+from src.core.cpu_executor import get_cpu_executor, set_pool_processes
+from src.core.metrics import QUEUE_WAIT_SECONDS, start_worker_exporter
+from src.core.redis_client import close_redis
+from src.core.tracing import (
+    TRACEPARENT_HEADER,
+    activate,
+    attach,
+    current_traceparent,
+    detach,
+    end_span,
+    start_span,
+)
+from src.services.http_client import MainServiceClient, close_shared_client
+from src.workers.lanes import lane_of_queue
+from src.workers.worker_loop import WorkerLoop
 
 client = MainServiceClient()
 c_app = Celery()
 c_app.config_from_object("src.core.config")
 
+# Async resources shared by the jobs of a worker process, closed on exit
+RESOURCE_CLOSERS = [
+    close_browser_pool,
+    close_captcha_pool,
+    close_shared_client,
+    close_redis,
+]
+
+worker_loop = WorkerLoop(RESOURCE_CLOSERS)
+
+
+@worker_init.connect
+def share_cpu_quota(sender=None, **kwargs):
+    """Split the CPU executor workers between the pool processes to be forked."""
+    set_pool_processes(getattr(sender, "concurrency", None) or 1)
+
+
+@worker_process_init.connect
+def start_worker_loop(**kwargs):
+    """Start the event loop of this pool process before its first task."""
+    worker_loop.start()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def stop_worker_loop(**kwargs):
+    """Close the shared async resources and stop the loop (also in solo pools)."""
+    worker_loop.stop()
+
+
+@worker_process_init.connect
+def start_metrics_exporter(**kwargs):
+    """Serve the metrics of this pool process on its own port."""
+    start_worker_exporter(
+        Config.WORKER_METRICS_PORT, getattr(current_process(), "index", 0) or 0
+    )
+
+
+@worker_process_shutdown.connect
+def shutdown_cpu_executor(**kwargs):
+    """Stop the PDF processing pool together with the worker process."""
+    get_cpu_executor().shutdown()
+
+
+@before_task_publish.connect
+def inject_traceparent(headers=None, **kwargs):
+    """Send the trace of the publishing request along with the task."""
+    traceparent = current_traceparent()
+    if headers is not None and traceparent:
+        headers[TRACEPARENT_HEADER] = traceparent
+
+
+# Header carrying the publish time, for the queue wait of each lane
+PUBLISHED_AT_HEADER = "published_at"
+
+
+@before_task_publish.connect
+def stamp_publish_time(headers=None, **kwargs):
+    """Stamp the publish time on outgoing tasks to measure their queue wait."""
+    if headers is not None:
+        headers[PUBLISHED_AT_HEADER] = time.time()
+
+
+@task_prerun.connect
+def observe_queue_wait(task=None, **kwargs):
+    """Record how long the task waited in its queue."""
+    published_at = getattr(task.request, PUBLISHED_AT_HEADER, None)
+    if published_at is None:
+        return
+    queue = (task.request.delivery_info or {}).get("routing_key")
+    QUEUE_WAIT_SECONDS.labels(
+        lane_of_queue(queue), task.name.rsplit(".", 1)[-1]
+    ).observe(max(0.0, time.time() - published_at))
+
+
+# Span and context token of each running task, by task id
+_task_spans: Dict[str, Any] = {}
+
+
+@task_prerun.connect
+def start_task_span(task_id=None, task=None, **kwargs):
+    """Continue the publisher's trace for the duration of the task."""
+    parent = attach(getattr(task.request, TRACEPARENT_HEADER, None))
+    task_span = start_span(f"celery.{task.name}", task_id=task_id)
+    _task_spans[task_id] = (task_span, activate(task_span), parent)
+
+
+@task_postrun.connect
+def end_task_span(task_id=None, state=None, **kwargs):
+    entry = _task_spans.pop(task_id, None)
+    if entry is None:
+        return
+    task_span, token, parent = entry
+    task_span.set_attribute("state", state)
+    end_span(task_span)
+    detach(token)
+    detach(parent)
+
 
 def async_task(f):
-    def wrapper(self, *args, **kwargs):
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(f(self, *args, **kwargs))
-        finally:
-            loop.close()
+    """Run the coroutine function on the event loop of this worker process."""
 
-    return wrapper
+    def wrapper(*args, **kwargs):
+        return worker_loop.run(f(*args, **kwargs))
 
+    return wrapper
 
-@c_app.task(bind=True, base=AbortableTask)
-def scrap_task(self, data: Dict[str, Any]) -> Dict[str, Any]:
 
-    @async_task
-    async def _scrap_task(data: Dict[str, Any]) -> Dict[str, Any]:
+async def run_scrap_job(data: Dict[str, Any], task_id: str) -> Dict[str, Any]:
+    """
+    Scrape the bills of a user service and queue their extraction.
 
-        logger = logging.getLogger("scraping_task")
+    Shared by ``scrap_task`` and the asyncio worker (src/workers/async_worker.py).
 
-        scrap_service = WebScrapService()
-        extract_service = ExtractDataService()
+    Args:
+        data: Payload of ``scrap_task`` (browser, service and user service)
+        task_id: ID of the job, releasing its deduplication key when done
+    """
+    logger = logging.getLogger("scraping_task")
 
-        try:
+    try:
+        with backend_job_cache():
             async with WebScrapService() as scrap_service:
                 result = await scrap_service.search(data)
                 logger.info("Scraping completed successfully")
+                download_failures = result.get("download_failures", [])
+                if download_failures:
+                    logger.warning(f"{len(download_failures)} downloads failed")
 
                 if result.get("should_extract", True):
-                    try:
-                        extract_service = ExtractDataService()
-                        await extract_service.process_bills(data)
-                        return {
-                            "status": "success",
-                            "message": "Data extracted successfully",
-                        }
-                    except Exception as e:
-                        logger.error(f"Extraction failed: {str(e)}")
-                        return {
-                            "status": "error",
-                            "message": f"Error during extraction: {str(e)}",
-                        }
+                    # PDF parsing runs in the extraction lane, freeing
+                    # this browser slot for the next interactive job
+                    extraction = await asyncio.to_thread(extract_task.delay, data)
+                    return {
+                        "status": "success",
+                        "message": "Bill extraction queued",
+                        "extract_task_id": extraction.id,
+                        "download_failures": download_failures,
+                    }
                 else:
                     return {
                         "status": "success",
                         "message": result.get("save_result", {}).get(
                             "message", "No action needed"
                         ),
+                        "download_failures": download_failures,
                     }
 
+    except Exception as e:
+        logger.error(f"Unexpected error: {str(e)}")
+        return {"status": "error", "message": str(e)}
+    finally:
+        key = job_key(data) if Config.SCRAP_DEDUP_ENABLED else None
+        if key is not None:
+            await InflightJobs().release(key, task_id)
+
+
+@c_app.task(bind=True, base=AbortableTask)
+def scrap_task(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    return async_task(run_scrap_job)(data, self.request.id)
+
+
+@c_app.task(bind=True, base=AbortableTask)
+def extract_task(self, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract and save the consumption data of scraped bills"""
+
+    @async_task
+    async def _extract_task(data: Dict[str, Any]) -> Dict[str, Any]:
+        logger = logging.getLogger("extraction_task")
+        try:
+            with backend_job_cache():
+                result = await ExtractDataService().process_bills(data)
         except Exception as e:
-            logger.error(f"Unexpected error: {str(e)}")
-            return {"status": "error", "message": str(e)}
+            logger.error(f"Extraction failed: {str(e)}")
+            return {"status": "error", "message": f"Error during extraction: {str(e)}"}
 
-    return _scrap_task(data)
+        if not result.get("success"):
+            return {"status": "error", "message": result.get("message")}
+        return {"status": "success", "message": "Data extracted successfully"}
+
+    return _extract_task(data)
 
 
 @c_app.task(bind=True, base=AbortableTask)
@@ -83,38 +237,25 @@ def scrap_all_user_service_by_service_task(self, service):
     """Wrapper task for async scraping of all user services"""
 
     @async_task
-    async def _scrap_all_task(service):
+    async def _scrap_all_task(task, service):
         service_id = service["id"]
         users_service = await client.get_user_services_by_service(service_id)
 
         if users_service == "No user_service found":
             return {"error": "No user_service found"}
 
-        invoker = InvokerBrowser()
-        browser_web = invoker.get_command(Config.BROWSER)
-        scrap_service = WebScrapService()
-
-        final_result = None
-        for user_service in users_service:
-            data = {
-                "browser": Config.BROWSER,
-                "user_service": user_service,
-                "service": service,
-            }
-            result = await scrap_service.search(data)
-            final_result = result
-
-        if final_result and final_result[1] != "No new bills to save":
-            try:
-                extract_service = ExtractDataService()
-                await extract_service.process_bills(data)
-                return {"status": "success"}
-            except Exception as e:
-                return {"error": f"Error: {e}"}
-        else:
-            return {"status": "success"}
-
-    return _scrap_all_task(service)
+        async def report_progress(progress: BatchProgress) -> None:
+            # update_state writes to the result backend synchronously
+            await asyncio.to_thread(
+                task.update_state, state="PROGRESS", meta=progress.as_dict()
+            )
+
+        progress = await BatchScrapService().run(
+            service, users_service, on_progress=report_progress
+        )
+        return {"status": "success", **progress.as_dict()}
+
+    return _scrap_all_task(self, service)
 
 
 # @c_app.on_after_configure.connect
@@ -0,0 +1,119 @@
+"""
+Long-lived event loop of a worker process.
+
+Celery runs tasks synchronously, so every async task is handed to one event
+loop running on a background thread of the process. Resources bound to the
+running loop through the ``get_x()`` helpers (browser pool, captcha pool,
+shared HTTP client, Redis client) are thereby created once and shared by
+every task of the process. They are only touched from the loop thread, so
+they need no locking beyond what asyncio code already does. Register their
+``close_x()`` helper with ``register_closer`` to release them on shutdown.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Any, Awaitable, Callable, Coroutine, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds given to the closers and to pending tasks when the loop stops
+SHUTDOWN_TIMEOUT = 30.0
+
+
+class WorkerLoop:
+    """
+    Event loop running on a daemon thread, started on first use.
+
+    A loop inherited through ``fork`` is never reused: the child starts its
+    own, since the parent's thread does not exist there.
+    """
+
+    def __init__(self, closers: Optional[List[Callable[[], Awaitable[None]]]] = None):
+        self.closers: List[Callable[[], Awaitable[None]]] = list(closers or [])
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def register_closer(self, closer: Callable[[], Awaitable[None]]) -> None:
+        """Run ``closer()`` on the loop when it stops, after the ones before it."""
+        self.closers.append(closer)
+
+    @property
+    def running(self) -> bool:
+        return (
+            self._loop is not None
+            and self._pid == os.getpid()
+            and self._thread is not None
+            and self._thread.is_alive()
+        )
+
+    def start(self) -> asyncio.AbstractEventLoop:
+        """Start the loop thread unless it is already running."""
+        with self._lock:
+            if not self.running:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def run() -> None:
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(
+                    target=run, name="worker-loop", daemon=True
+                )
+                self._loop, self._pid = loop, os.getpid()
+                self._thread.start()
+                ready.wait()
+                logger.info(f"Worker event loop started in process {self._pid}")
+            return self._loop
+
+    def run(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """
+        Run ``coro`` on the loop and wait for its result.
+
+        The coroutine sees the caller's context variables (e.g. the task
+        span). If the wait is interrupted, e.g. by a Celery time limit, the
+        coroutine is cancelled instead of being left running.
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.start())
+        try:
+            return future.result()
+        except BaseException:
+            future.cancel()
+            raise
+
+    def stop(self) -> None:
+        """Run the closers, cancel what is left and stop the loop thread."""
+        with self._lock:
+            if not self.running:
+                return
+            loop, thread = self._loop, self._thread
+            try:
+                asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(
+                    SHUTDOWN_TIMEOUT
+                )
+            except Exception as e:
+                logger.warning(f"Worker event loop did not shut down cleanly: {str(e)}")
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(SHUTDOWN_TIMEOUT)
+            if not thread.is_alive():
+                loop.close()
+            self._loop = self._thread = self._pid = None
+
+    async def _shutdown(self) -> None:
+        for closer in self.closers:
+            try:
+                await closer()
+            except Exception as e:
+                logger.warning(f"Error closing worker resource: {str(e)}")
+
+        current = asyncio.current_task()
+        pending = [task for task in asyncio.all_tasks() if task is not current]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        await asyncio.get_running_loop().shutdown_asyncgens()
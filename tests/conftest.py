@@ -0,0 +1,22 @@
+import os
+
+# Settings required by src.core.config, so services can be imported in tests
+for name, value in {
+    "SECRET_KEY": "test",
+    "JWT_ALGORITHM": "HS256",
+    "SS_WEB_PORT": "5001",
+    "ACCESS_TOKEN_EXPIRY": "3600",
+    "REFRESH_TOKEN_EXPIRY": "3600",
+    "INTERNAL_API_KEY": "test",
+    "SERVICE_TO_SERVICE_SECRET": "test",
+    "BROWSER": "chrome",
+    "KEY_ANTICAPTCHA": "test",
+    "BACKEND_URL": "http://backend.test",
+    "ENDPOINT_PROXY": "",
+    "REDIS_URL": "redis://localhost:6379/0",
+    "PROCESSOR_ID": "test",
+    "GOOGLE_APPLICATION_CREDENTIALS": "test",
+    # A local Redis would otherwise share backend reads between tests
+    "BACKEND_SNAPSHOT_CACHE_ENABLED": "false",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+from celery import Celery
+
+from src.workers.async_worker import Admission, AsyncWorker, get_async_worker_metrics
+
+QUEUE = "scrap.interactive"
+TASK = "src.workers.tasks.scrap_task"
+
+
+@pytest.fixture
+def app():
+    app = Celery(broker="memory://", backend="cache+memory://")
+    app.conf.task_default_queue = QUEUE
+    return app
+
+
+class Jobs:
+    """Handler recording jobs, which finish once ``release`` is set."""
+
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+        self.done = []
+        self.release = asyncio.Event()
+
+    async def __call__(self, data, task_id):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await self.release.wait()
+        finally:
+            self.running -= 1
+        self.done.append(data["user_service"]["id"])
+        return {"status": "success", "user_service_id": data["user_service"]["id"]}
+
+
+async def wait_for(predicate, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def publish(app, count, name=TASK):
+    return [
+        app.send_task(name, args=[{"user_service": {"id": n}}], queue=QUEUE)
+        for n in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_runs_jobs_concurrently_up_to_the_limit(app):
+    jobs = Jobs()
+    worker = AsyncWorker(app, QUEUE, {TASK: jobs}, concurrency=3)
+    results = publish(app, 5)
+    running = asyncio.ensure_future(worker.run())
+
+    await wait_for(lambda: jobs.running == 3)
+    await asyncio.sleep(0.05)
+    assert jobs.running == 3
+    jobs.release.set()
+    await wait_for(lambda: len(jobs.done) == 5)
+    worker.stop()
+    await running
+
+    assert jobs.peak == 3
+    assert results[4].get(timeout=1)["user_service_id"] == 4
+
+
+@pytest.mark.asyncio
+async def test_unknown_tasks_are_rejected(app):
+    before = get_async_worker_metrics()
+    worker = AsyncWorker(app, QUEUE, {TASK: Jobs()}, concurrency=1)
+    publish(app, 1, name="src.workers.tasks.extract_task")
+    running = asyncio.ensure_future(worker.run())
+
+    await wait_for(lambda: get_async_worker_metrics()["rejected"] > before["rejected"])
+    worker.stop()
+    await running
+
+
+@pytest.mark.asyncio
+async def test_stop_requeues_jobs_not_started(app):
+    jobs = Jobs()
+    before = get_async_worker_metrics()
+    # Memory stays high, so only the first job is admitted
+    admission = Admission(2, high_water=0.8, poll_interval=0.01, usage=lambda: 0.95)
+    worker = AsyncWorker(app, QUEUE, {TASK: jobs}, concurrency=2, admission=admission)
+    publish(app, 2)
+    running = asyncio.ensure_future(worker.run())
+
+    await wait_for(
+        lambda: get_async_worker_metrics()["received"] >= before["received"] + 2
+    )
+    worker.stop()
+    jobs.release.set()
+    await running
+
+    assert jobs.done == [0]
+    assert get_async_worker_metrics()["requeued"] == before["requeued"] + 1
+
+
+@pytest.mark.asyncio
+async def test_admission_waits_under_memory_pressure():
+    usage = [0.95]
+    admission = Admission(
+        10, high_water=0.8, poll_interval=0.01, usage=lambda: usage[0]
+    )
+
+    await admission.acquire()  # nothing running: admitted anyway
+    second = asyncio.ensure_future(admission.acquire())
+    await asyncio.sleep(0.05)
+    assert not second.done()
+
+    usage[0] = 0.5
+    await asyncio.wait_for(second, 1)
+    assert admission.running == 2
@@ -0,0 +1,154 @@
+import asyncio
+
+import pytest
+
+from benchmarks.fixture_servers import FakeBackend
+from src.core.config import Config
+from src.services.backend_cache import (
+    BackendCache,
+    backend_job_cache,
+    cached_read,
+    get_backend_cache_metrics,
+    invalidate,
+)
+from src.services.bill_service import BillService
+from src.services.http_client import MainServiceClient, close_shared_client
+from src.utils.bill_digest import content_bill
+
+
+class Loader:
+    def __init__(self, delay=0.0, fail=False):
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("backend down")
+        return {"id": 1, "call": self.calls}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reads_share_one_load():
+    cache = BackendCache()
+    loader = Loader(delay=0.01)
+    before = get_backend_cache_metrics()
+
+    results = await asyncio.gather(*(cache.get_or_load("k", loader) for _ in range(5)))
+    again = await cache.get_or_load("k", loader)
+
+    assert loader.calls == 1
+    assert all(result is results[0] for result in results) and again is results[0]
+    metrics = get_backend_cache_metrics()
+    assert metrics["misses"] == before["misses"] + 1
+    assert metrics["coalesced"] == before["coalesced"] + 4
+    assert metrics["hits"] == before["hits"] + 1
+
+
+@pytest.mark.asyncio
+async def test_failed_loads_are_not_cached():
+    cache = BackendCache()
+    loader = Loader(fail=True)
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await cache.get_or_load("k", loader)
+
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_by_tag_and_derived_tags():
+    cache = BackendCache()
+    loader = Loader()
+    await cache.get_or_load(
+        "k", loader, tags=["user-service:5"], tags_of=lambda r: [f"data:{r['id']}"]
+    )
+
+    cache.invalidate("other")
+    await cache.get_or_load("k", loader)
+    cache.invalidate("data:1")
+    await cache.get_or_load("k", loader)
+
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl():
+    cache = BackendCache(ttl=0.01)
+    loader = Loader()
+
+    await cache.get_or_load("k", loader)
+    await asyncio.sleep(0.02)
+    await cache.get_or_load("k", loader)
+
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_read_is_scoped_to_the_job(monkeypatch):
+    monkeypatch.setattr(Config, "BACKEND_CACHE_TTL", 0.0)
+    loader = Loader()
+
+    await cached_read("k", loader)
+    await cached_read("k", loader)
+    with backend_job_cache():
+        await cached_read("k", loader, tags=["t"])
+        await cached_read("k", loader, tags=["t"])
+        invalidate("t")
+        await cached_read("k", loader, tags=["t"])
+    with backend_job_cache():
+        await cached_read("k", loader)
+
+    assert loader.calls == 5
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_spans_jobs_when_enabled(monkeypatch):
+    monkeypatch.setattr(Config, "BACKEND_CACHE_TTL", 60.0)
+    loader = Loader()
+
+    for _ in range(2):
+        with backend_job_cache():
+            await cached_read("shared", loader, tags=["shared-tag"])
+    invalidate("shared-tag")
+    with backend_job_cache():
+        await cached_read("shared", loader, tags=["shared-tag"])
+
+    assert loader.calls == 2
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    server = FakeBackend().start()
+    monkeypatch.setattr(Config, "BACKEND_URL", server.url)
+    monkeypatch.setattr(Config, "BACKEND_CACHE_TTL", 0.0)
+    server.scrapped_data[5] = {
+        "id": 1,
+        "user_service_id": 5,
+        "bills_url": [content_bill("factura 1")],
+    }
+    yield server
+    server.stop()
+
+
+@pytest.mark.asyncio
+async def test_job_reads_backend_once_until_a_write(backend):
+    client = MainServiceClient()
+    try:
+        with backend_job_cache():
+            await client.get_user_service(5)
+            await client.get_user_service(5)
+            await client.get_scrapped_data(5)
+            await BillService().save_bills(5, [content_bill("factura 2")])
+            data = await client.get_scrapped_data(5)
+    finally:
+        await close_shared_client()
+
+    reads = [call for call in backend.calls if call[0] == "GET"]
+    assert reads.count(("GET", "/user-service/5")) == 1
+    # One read before the append and a fresh one after it
+    assert reads.count(("GET", "/scrapped-data/user-service/5")) == 2
+    assert len(data["bills_url"]) == 2
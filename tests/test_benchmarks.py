@@ -0,0 +1,79 @@
+from benchmarks.corpus import build_pdf_corpus, load_provider_corpus, render_pdf
+from benchmarks.suite import BenchmarkResult, compare, measure, percentile
+from src.utils.convert_data import GenericBillParser
+from src.utils.process_utility_bill_pdf import extract_pdf_text
+
+
+def result(**overrides):
+    values = dict(
+        name="parser", bills=1000, seconds=1.0, p50_ms=1.0, p99_ms=2.0, peak_kib=10.0
+    )
+    values.update(overrides)
+    return BenchmarkResult(**values)
+
+
+BASELINE = {
+    "parser": {"bills_per_sec": 1000.0, "p50_ms": 1.0, "p99_ms": 2.0, "peak_kib": 10.0}
+}
+
+
+def test_corpus_covers_every_provider_format():
+    providers = {provider for provider, _ in load_provider_corpus(8)}
+
+    assert providers == {"electricity", "ftth", "gas", "water"}
+
+
+def test_generated_pdfs_parse_like_their_text(tmp_path):
+    texts = dict(load_provider_corpus(4))
+
+    for provider, path in build_pdf_corpus(tmp_path, 4):
+        extracted = extract_pdf_text(str(path))
+
+        assert extracted.splitlines() == texts[provider].splitlines()
+        assert GenericBillParser().parse(extracted) == GenericBillParser().parse(
+            texts[provider]
+        )
+
+
+def test_render_pdf_escapes_parentheses(tmp_path):
+    path = tmp_path / "bill.pdf"
+    path.write_bytes(render_pdf("Cargo (fijo) \\ $ 10,00"))
+
+    assert extract_pdf_text(str(path)) == "Cargo (fijo) \\ $ 10,00"
+
+
+def test_percentile_uses_nearest_rank():
+    samples = list(range(1, 101))
+
+    assert percentile(samples, 50) == 50
+    assert percentile(samples, 99) == 99
+    assert percentile([], 50) == 0.0
+
+
+def test_measure_reports_latency_and_memory():
+    inputs = [("gas", 1000), ("water", 2000)]
+
+    measured = measure("alloc", lambda n: [0] * n, inputs)
+
+    assert measured.bills == 2
+    assert set(measured.p50_ms_by_provider) == {"gas", "water"}
+    assert measured.peak_kib > 0
+
+
+def test_compare_passes_within_tolerance():
+    assert compare([result(seconds=1.2, p50_ms=1.2)], BASELINE, tolerance=0.3) == []
+
+
+def test_compare_flags_regressions():
+    regressions = compare(
+        [result(seconds=2.0, p99_ms=3.0, peak_kib=20.0)], BASELINE, tolerance=0.3
+    )
+
+    assert [r.split(":")[0] for r in regressions] == [
+        "parser.bills_per_sec",
+        "parser.peak_kib",
+    ]
+
+
+def test_compare_ignores_benchmarks_without_baseline():
+    assert compare([result(name="new", seconds=100.0)], BASELINE, tolerance=0.3) == []
@@ -0,0 +1,100 @@
+import pytest
+
+from benchmarks.fixture_servers import FakeBackend
+from src.core.config import Config
+from src.services.bill_service import BillService
+from src.services.http_client import close_shared_client
+from src.utils.bill_digest import (
+    bill_digest,
+    content_bill,
+    content_digest,
+    normalize_url,
+    url_bill,
+    url_digest,
+)
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    server = FakeBackend().start()
+    monkeypatch.setattr(Config, "BACKEND_URL", server.url)
+    yield server
+    server.stop()
+
+
+def test_content_digest_ignores_whitespace_layout():
+    assert content_digest("Total $ 10,00\n\nVence  20/03") == content_digest(
+        "Total $ 10,00 Vence 20/03 "
+    )
+    assert content_digest("Total $ 10,00") != content_digest("Total $ 11,00")
+
+
+def test_normalize_url():
+    assert (
+        normalize_url("HTTPS://Portal.Example.com:443/facturas?b=2&a=1#top")
+        == "https://portal.example.com/facturas?a=1&b=2"
+    )
+    assert normalize_url("http://portal:8080") == "http://portal:8080/"
+
+
+def test_bills_are_created_with_their_digest():
+    assert content_bill("texto")["digest"] == content_digest("texto")
+    assert url_bill("http://a/b.pdf")["digest"] == url_digest("http://a/b.pdf")
+
+
+def test_bill_digest_prefers_the_stored_one():
+    assert bill_digest({"content": "texto", "digest": "content:abc"}) == "content:abc"
+    assert bill_digest({"content": "texto"}) == content_digest("texto")
+    assert bill_digest({"url": "http://a/b.pdf"}) == url_digest("http://a/b.pdf")
+    assert bill_digest({"other": 1}) is None
+
+
+def test_content_and_url_digests_do_not_collide():
+    assert bill_digest({"content": "http://a/b.pdf"}) != bill_digest(
+        {"url": "http://a/b.pdf"}
+    )
+
+
+def test_deduplicate_bills_by_digest():
+    bills = [
+        content_bill("factura 1"),
+        {"content": "factura  1"},
+        url_bill("http://a/b.pdf?x=1&y=2"),
+        {"url": "http://A/b.pdf?y=2&x=1"},
+        "invalid",
+    ]
+
+    unique = BillService()._deduplicate_bills(bills)
+
+    assert [bill.get("content") or bill.get("url") for bill in unique] == [
+        "factura 1",
+        "http://a/b.pdf?x=1&y=2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_save_merges_with_legacy_bills_by_digest(backend, monkeypatch):
+    monkeypatch.setattr(Config, "BILL_SAVE_MODE", "replace")
+    backend.scrapped_data[5] = {
+        "id": 1,
+        "user_service_id": 5,
+        "bills_url": [{"content": "factura 1"}, {"url": "http://a/b.pdf"}],
+    }
+
+    try:
+        result = await BillService().save_bills(
+            5,
+            [content_bill("factura 1"), url_bill("http://A/b.pdf"), content_bill("2")],
+        )
+    finally:
+        await close_shared_client()
+
+    stored = backend.scrapped_data[5]["bills_url"]
+    assert result["new_bills_saved"]
+    assert [bill.get("content") or bill.get("url") for bill in stored] == [
+        "factura 1",
+        "http://a/b.pdf",
+        "2",
+    ]
+    # Legacy bills are stamped when the list is replaced
+    assert all(bill["digest"] for bill in stored)
@@ -0,0 +1,102 @@
+from pathlib import Path
+
+import pytest
+
+from src.utils.convert_data import (
+    DEFAULT_PATTERNS,
+    FIELD_FLAGS,
+    FirstMatchScanner,
+    GenericBillParser,
+    PatternRegistry,
+    UNRESOLVED,
+    compile_pattern,
+)
+from test_extract import GenericBillParser as ExtractTestParser
+
+FIXTURES = sorted((Path(__file__).parent / "fixtures" / "bills").glob("*.txt"))
+
+# Categories resolved by first-match extraction
+FIELD_CATEGORIES = [
+    category
+    for category in DEFAULT_PATTERNS
+    if category not in ("charges", "service_details", "installments", "consumption")
+]
+
+
+@pytest.fixture(params=FIXTURES, ids=lambda path: path.stem)
+def bill_text(request):
+    return request.param.read_text()
+
+
+def test_single_pass_parse_matches_legacy_parse(bill_text):
+    legacy = GenericBillParser(single_pass=False).parse(bill_text)
+    single_pass = GenericBillParser(single_pass=True).parse(bill_text)
+
+    assert single_pass == legacy
+
+
+@pytest.mark.parametrize("category", FIELD_CATEGORIES)
+def test_single_pass_category_matches_legacy(bill_text, category):
+    legacy = GenericBillParser(single_pass=False)
+    single_pass = GenericBillParser(single_pass=True)
+
+    assert single_pass.extract_category(bill_text, category) == legacy.extract_category(
+        bill_text, category
+    )
+
+
+def test_single_pass_matches_legacy_on_test_extract_patterns(bill_text):
+    registry = PatternRegistry(ExtractTestParser().patterns)
+    legacy = GenericBillParser(registry, single_pass=False)
+    single_pass = GenericBillParser(registry, single_pass=True)
+
+    for category in registry.patterns:
+        assert single_pass.extract_category(
+            bill_text, category
+        ) == legacy.extract_category(bill_text, category), category
+
+
+def test_scanner_keeps_pattern_priority_over_text_position():
+    scanner = FirstMatchScanner(
+        [compile_pattern(r"TOTAL\s*(\d+)"), compile_pattern(r"\$\s*(\d+)")]
+    )
+
+    assert scanner.search("$ 10\nTOTAL 20\n") == "20"
+    assert scanner.search("$ 10\n") == "10"
+    assert scanner.search("nothing here", default="-") == "-"
+
+
+def test_scanner_finds_match_overlapping_lower_priority_match():
+    scanner = FirstMatchScanner(
+        [compile_pattern(r"B(\d)"), compile_pattern(r"(A+B\d)")]
+    )
+
+    assert scanner.search("AAB1") == "1"
+
+
+def test_scanner_defers_to_legacy_when_group_does_not_participate():
+    scanner = FirstMatchScanner([compile_pattern(r"X(\d)?"), compile_pattern(r"(Y)")])
+
+    assert scanner.search("X Y") is UNRESOLVED
+    assert GenericBillParser(single_pass=True).extract_field(
+        "X Y", scanner.patterns
+    ) == GenericBillParser(single_pass=False).extract_field("X Y", scanner.patterns)
+
+
+def test_add_pattern_only_affects_own_parser():
+    parser = GenericBillParser(single_pass=True)
+    parser.add_pattern("invoice_number", r"Ticket\s+(\d+)")
+
+    assert parser.extract_category("Ticket 42", "invoice_number") == "42"
+    assert (
+        GenericBillParser(single_pass=True).extract_category(
+            "Ticket 42", "invoice_number"
+        )
+        is None
+    )
+    assert parser.registry.compiled("date") is GenericBillParser().registry.compiled(
+        "date"
+    )
+    assert compile_pattern(r"Ticket\s+(\d+)", FIELD_FLAGS) in parser.registry.compiled(
+        "invoice_number"
+    )
@@ -0,0 +1,138 @@
+import pytest
+
+from benchmarks.fixture_servers import FakeBackend
+from src.core.config import Config
+from src.core.errors import HTTPClientError
+from src.services import bill_service
+from src.services.bill_service import BillService, get_bill_save_metrics
+from src.services.http_client import (
+    MainServiceClient,
+    close_shared_client,
+    get_client_metrics,
+)
+from src.utils.bill_digest import DIGEST_KEY, content_bill
+
+HISTORY = [content_bill(f"factura {n} " + "detalle " * 500) for n in range(24)]
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    server = FakeBackend().start()
+    monkeypatch.setattr(Config, "BACKEND_URL", server.url)
+    monkeypatch.setattr(Config, "BILL_SAVE_MODE", "append")
+    monkeypatch.setattr(bill_service, "_append_unsupported", False)
+    server.scrapped_data[5] = {
+        "id": 1,
+        "user_service_id": 5,
+        "bills_url": list(HISTORY),
+    }
+    yield server
+    server.stop()
+
+
+async def save(bills, **kwargs):
+    try:
+        return await BillService().save_bills(5, bills, **kwargs)
+    finally:
+        await close_shared_client()
+
+
+def stored(backend):
+    return [bill["content"][:10] for bill in backend.scrapped_data[5]["bills_url"]]
+
+
+@pytest.mark.asyncio
+async def test_append_sends_only_new_bills(backend):
+    before = get_bill_save_metrics()
+
+    result = await save([HISTORY[0], content_bill("factura nueva")], debt=True)
+
+    assert result["new_bills_saved"]
+    assert stored(backend)[-1] == "factura nu"
+    assert len(stored(backend)) == len(HISTORY) + 1
+    assert backend.scrapped_data[5]["debt"] is True
+    assert ("POST", "/scrapped-data/1/bills") in backend.calls
+    assert ("PATCH", "/scrapped-data/1") not in backend.calls
+    assert get_bill_save_metrics()["appends"] == before["appends"] + 1
+
+
+@pytest.mark.asyncio
+async def test_conflict_falls_back_to_full_replacement(backend, monkeypatch):
+    before = get_bill_save_metrics()
+    real_get = MainServiceClient.get_scrapped_data
+    reads = []
+
+    async def get_then_concurrent_write(client, user_service_id):
+        data = await real_get(client, user_service_id)
+        if not reads:
+            # Another worker appends after this one read the bills
+            backend.scrapped_data[5]["bills_url"].append(content_bill("otra"))
+        reads.append(user_service_id)
+        return data
+
+    monkeypatch.setattr(
+        MainServiceClient, "get_scrapped_data", get_then_concurrent_write
+    )
+
+    result = await save([content_bill("factura nueva")])
+
+    assert result["new_bills_saved"]
+    assert stored(backend)[-2:] == ["otra", "factura nu"]
+    assert ("PATCH", "/scrapped-data/1") in backend.calls
+    metrics = get_bill_save_metrics()
+    assert metrics["conflicts"] == before["conflicts"] + 1
+    assert metrics["replacements"] == before["replacements"] + 1
+
+
+@pytest.mark.asyncio
+async def test_append_uploads_a_fraction_of_a_replacement(backend, monkeypatch):
+    new_bill = content_bill("factura nueva")
+
+    sent = get_client_metrics()["bytes_sent"]
+    await save([new_bill])
+    appended = get_client_metrics()["bytes_sent"] - sent
+
+    backend.scrapped_data[5]["bills_url"] = list(HISTORY)
+    monkeypatch.setattr(Config, "BILL_SAVE_MODE", "replace")
+    sent = get_client_metrics()["bytes_sent"]
+    await save([new_bill])
+    replaced = get_client_metrics()["bytes_sent"] - sent
+
+    assert stored(backend)[-1] == "factura nu"
+    assert appended * 10 < replaced
+
+
+@pytest.mark.asyncio
+async def test_backend_without_append_gets_a_full_replacement(backend, monkeypatch):
+    before = get_bill_save_metrics()
+    appends = []
+
+    async def append_not_allowed(client, **kwargs):
+        appends.append(kwargs)
+        raise HTTPClientError("Method Not Allowed", status_code=405)
+
+    monkeypatch.setattr(MainServiceClient, "append_scrapped_bills", append_not_allowed)
+
+    await save([content_bill("factura nueva")])
+    await save([content_bill("factura otra")])
+
+    assert stored(backend)[-2:] == ["factura nu", "factura ot"]
+    assert len(appends) == 1
+    metrics = get_bill_save_metrics()
+    assert metrics["append_unsupported"] == before["append_unsupported"] + 1
+    assert metrics["replacements"] == before["replacements"] + 2
+
+
+@pytest.mark.asyncio
+async def test_bills_without_digest_are_replaced_once(backend):
+    backend.scrapped_data[5]["bills_url"] = [
+        {"content": bill["content"]} for bill in HISTORY
+    ]
+
+    await save([content_bill("factura nueva")])
+    backend.calls.clear()
+    await save([content_bill("factura otra")])
+
+    bills = backend.scrapped_data[5]["bills_url"]
+    assert all(DIGEST_KEY in bill for bill in bills)
+    assert ("POST", "/scrapped-data/1/bills") in backend.calls
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from src.services.browser_pool import BrowserPool, PooledBrowser
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.closed = False
+
+    def is_connected(self):
+        return not self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class SlowLaunchPool(BrowserPool):
+    """Pool whose launches take ``delay`` seconds and are counted."""
+
+    def __init__(self, delay=0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+        self.launched = []
+
+    async def _launch(self, browser_type):
+        await asyncio.sleep(self.delay)
+        pooled = PooledBrowser(browser_type=browser_type, browser=FakeBrowser())
+        self.launched.append(pooled)
+        return pooled
+
+
+@pytest.mark.asyncio
+async def test_leases_and_releases_do_not_wait_for_a_launch():
+    pool = SlowLaunchPool(max_browsers=2, max_contexts=1, max_uses=100)
+    first = await pool._acquire("chrome")
+    pool.delay = 1.0
+
+    launching = asyncio.ensure_future(pool._acquire("chrome"))
+    await asyncio.sleep(0.05)
+    await asyncio.wait_for(pool._release(first), 0.1)
+    assert await asyncio.wait_for(pool._acquire("chrome"), 0.1) is first
+
+    second = await launching
+    assert second is not first
+    assert len(pool.launched) == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_launches_respect_max_browsers():
+    pool = SlowLaunchPool(delay=0.05, max_browsers=2, max_contexts=1, max_uses=100)
+
+    leases = [asyncio.ensure_future(pool._acquire("chrome")) for _ in range(3)]
+    await asyncio.sleep(0.2)
+
+    assert len(pool.launched) == 2
+    assert not leases[2].done()
+    await pool._release(await leases[0])
+    await asyncio.wait_for(leases[2], 1)
+    assert len(pool.launched) == 2
+
+
+@pytest.mark.asyncio
+async def test_retired_browsers_count_until_their_last_lease_closes():
+    pool = SlowLaunchPool(max_browsers=1, max_contexts=2, max_uses=1)
+    retired = await pool._acquire("chrome")
+    assert retired.retired
+
+    waiting = asyncio.ensure_future(pool._acquire("chrome"))
+    await asyncio.sleep(0.05)
+    assert not waiting.done()
+
+    await pool._release(retired)
+    replacement = await asyncio.wait_for(waiting, 1)
+    assert replacement is not retired
+    assert retired.browser.closed
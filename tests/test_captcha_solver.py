@@ -0,0 +1,114 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.core.config import Config
+from src.core.errors import CaptchaError
+from src.services.captcha_solver import (
+    AntiCaptchaSolver,
+    CaptchaSolverPool,
+    StubCaptchaSolver,
+    close_captcha_pool,
+    get_captcha_metrics,
+    get_captcha_pool,
+)
+from src.services.http_client import close_shared_client, get_shared_client
+
+
+@pytest.mark.asyncio
+async def test_pool_solves_concurrently_within_budget():
+    solver = StubCaptchaSolver(delay=0.1)
+    pool = CaptchaSolverPool(solver, max_concurrent=4, timeout=5)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    tokens = await asyncio.gather(
+        *(pool.solve("https://portal.test", "sitekey") for _ in range(8))
+    )
+
+    assert tokens == ["stub-captcha-token"] * 8
+    # Two rounds of four solves, not eight sequential ones
+    assert loop.time() - start < 0.5
+    assert pool.stats.solved == 8
+    assert pool.stats.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_counts_timeouts():
+    pool = CaptchaSolverPool(StubCaptchaSolver(delay=1), max_concurrent=1, timeout=0.05)
+
+    with pytest.raises(CaptchaError):
+        await pool.solve("https://portal.test", "sitekey")
+
+    assert pool.stats.timed_out == 1
+    assert pool.stats.solved == 0
+
+
+@pytest.mark.asyncio
+async def test_anticaptcha_solver_polls_until_ready():
+    polls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        if request.url.path == "/createTask":
+            assert body["task"]["websiteKey"] == "sitekey"
+            return httpx.Response(200, json={"errorId": 0, "taskId": 7})
+        polls.append(body["taskId"])
+        if len(polls) < 3:
+            return httpx.Response(200, json={"errorId": 0, "status": "processing"})
+        return httpx.Response(
+            200,
+            json={
+                "errorId": 0,
+                "status": "ready",
+                "solution": {"gRecaptchaResponse": "token"},
+                "cost": "0.00150",
+            },
+        )
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        solver = AntiCaptchaSolver(api_key="key", poll_interval=0.01, client=client)
+        pool = CaptchaSolverPool(solver, max_concurrent=1, timeout=5)
+
+        assert await pool.solve("https://portal.test", "sitekey") == "token"
+
+    assert polls == [7, 7, 7]
+    assert pool.stats.cost == pytest.approx(0.0015)
+
+
+@pytest.mark.asyncio
+async def test_anticaptcha_solver_raises_api_errors():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, json={"errorId": 1, "errorCode": "ERROR_KEY_DOES_NOT_EXIST"}
+        )
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        pool = CaptchaSolverPool(
+            AntiCaptchaSolver(api_key="key", client=client), max_concurrent=1
+        )
+
+        with pytest.raises(CaptchaError, match="ERROR_KEY_DOES_NOT_EXIST"):
+            await pool.solve("https://portal.test", "sitekey")
+
+    assert pool.stats.failed == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_owns_its_client_and_reports_stats(monkeypatch):
+    monkeypatch.setattr(Config, "CAPTCHA_SOLVER", "anticaptcha")
+    before = get_captcha_metrics()
+    pool = get_captcha_pool()
+    client = pool.solver._get_client()
+    pool.stats.solved += 1
+
+    assert client is not get_shared_client()
+    assert get_captcha_metrics()["solved"] == before["solved"] + 1
+
+    await close_captcha_pool()
+    await close_shared_client()
+
+    assert client.is_closed
+    assert get_captcha_metrics()["solved"] == before["solved"] + 1
@@ -0,0 +1,78 @@
+import asyncio
+import operator
+import os
+import threading
+import time
+
+import billiard
+import pytest
+
+from src.core import cpu_executor
+from src.core.errors import DocumentProcessingError
+from src.core.cpu_executor import CpuExecutor, get_cpu_executor, set_cpu_executor
+
+
+def run_in_pool_child(results):
+    """Body of a daemonic pool process, like a Celery prefork child."""
+    set_cpu_executor(None)
+    executor = get_cpu_executor()
+    outcomes = []
+    try:
+        outcomes.append(asyncio.run(executor.run(os.getpid)) != os.getpid())
+        for timeout, func, *args in ((20, os._exit, 1), (1, time.sleep, 30)):
+            try:
+                asyncio.run(executor.run(func, *args, timeout=timeout))
+            except DocumentProcessingError as e:
+                outcomes.append(str(e))
+        outcomes.append(asyncio.run(executor.run(operator.add, 1, 2)))
+        results.put((outcomes, executor.kind))
+    except BaseException as e:
+        results.put((outcomes + [repr(e)], executor.kind))
+    finally:
+        executor.shutdown()
+
+
+def test_daemonic_processes_use_an_isolated_process_pool():
+    results = billiard.Queue()
+    child = billiard.Process(target=run_in_pool_child, args=(results,), daemon=True)
+    child.start()
+    try:
+        assert results.get(timeout=60) == (
+            [
+                True,
+                "_exit crashed its worker process",
+                "sleep timed out after 1s",
+                3,
+            ],
+            "process",
+        )
+    finally:
+        child.join(10)
+
+
+@pytest.mark.asyncio
+async def test_timed_out_threads_keep_their_slot():
+    executor = CpuExecutor(kind="thread", max_workers=2, max_pending=1)
+    release = threading.Event()
+    try:
+        with pytest.raises(DocumentProcessingError):
+            await executor.run(release.wait, timeout=0.05)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(executor.run(operator.add, 1, 2), 0.2)
+
+        release.set()
+        assert await asyncio.wait_for(executor.run(operator.add, 1, 2), 1) == 3
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_workers_are_split_between_pool_processes(monkeypatch):
+    monkeypatch.setattr(cpu_executor, "cpu_quota", lambda: 8)
+    monkeypatch.setattr(cpu_executor, "_pool_processes", 1)
+
+    cpu_executor.set_pool_processes(4)
+
+    assert CpuExecutor(kind="thread").max_workers == 2
+    cpu_executor.set_pool_processes(16)
+    assert CpuExecutor(kind="thread").max_workers == 1
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from src.services.download_pipeline import DownloadPipeline
+
+
+class FakeDownload:
+    """Download double whose file is written after a short delay."""
+
+    def __init__(self, path, content: bytes, delay: float = 0.05):
+        self._path = path
+        self.content = content
+        self.delay = delay
+        self.suggested_filename = path.name
+
+    async def path(self):
+        await asyncio.sleep(self.delay)
+        self._path.write_bytes(self.content)
+        return self._path
+
+
+class Recorder:
+    def __init__(self):
+        self.files = []
+        self.active = 0
+        self.max_active = 0
+
+    async def __call__(self, path, filename):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.05)
+        self.files.append(filename)
+        self.active -= 1
+
+
+@pytest.mark.asyncio
+async def test_each_download_is_handled_once(tmp_path):
+    handler = Recorder()
+    pipeline = DownloadPipeline(handler, max_parallel=4)
+    download = FakeDownload(tmp_path / "bill.pdf", b"bill")
+
+    # Listener and button loop both see the same download
+    assert pipeline.submit(download) is not None
+    assert pipeline.submit(download) is None
+    await pipeline.drain()
+
+    assert handler.files == ["bill.pdf"]
+
+
+@pytest.mark.asyncio
+async def test_duplicate_content_is_skipped(tmp_path):
+    handler = Recorder()
+    pipeline = DownloadPipeline(handler, max_parallel=4)
+
+    pipeline.submit(FakeDownload(tmp_path / "a.pdf", b"same bill"))
+    pipeline.submit(FakeDownload(tmp_path / "b.pdf", b"same bill"))
+    pipeline.submit(FakeDownload(tmp_path / "c.pdf", b"other bill"))
+    await pipeline.drain()
+
+    assert len(handler.files) == 2
+    assert pipeline.duplicates == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_downloads_are_recorded(tmp_path):
+    async def failing(path, filename):
+        if filename == "b.pdf":
+            raise ValueError("not a PDF")
+
+    pipeline = DownloadPipeline(failing, max_parallel=4)
+
+    pipeline.submit(FakeDownload(tmp_path / "a.pdf", b"bill"))
+    pipeline.submit(FakeDownload(tmp_path / "b.pdf", b"page"))
+    await pipeline.drain()
+
+    assert pipeline.failures == [{"filename": "b.pdf", "error": "not a PDF"}]
+
+
+@pytest.mark.asyncio
+async def test_parallelism_is_bounded(tmp_path):
+    handler = Recorder()
+    pipeline = DownloadPipeline(handler, max_parallel=3)
+
+    for i in range(9):
+        await pipeline.wait_for_capacity()
+        assert pipeline.in_flight < 3
+        pipeline.submit(FakeDownload(tmp_path / f"{i}.pdf", str(i).encode()))
+    await pipeline.drain()
+
+    assert len(handler.files) == 9
+    assert 1 < handler.max_active <= 3
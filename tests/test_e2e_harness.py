@@ -0,0 +1,113 @@
+from pathlib import Path
+
+import httpx
+import pytest
+from playwright.sync_api import sync_playwright
+
+from benchmarks import e2e_scrape
+from benchmarks.fixture_servers import FakeBackend, PortalServer
+from src.core.config import Config
+from src.services.bill_service import BillService
+from src.services.http_client import close_shared_client
+
+
+def browser_installed(name: str) -> bool:
+    if name == "chromium" and Config.CHROME_EXECUTABLE_PATH:
+        return Path(Config.CHROME_EXECUTABLE_PATH).exists()
+    try:
+        with sync_playwright() as playwright:
+            return Path(getattr(playwright, name).executable_path).exists()
+    except Exception:
+        return False
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    server = FakeBackend(service_id=3).start()
+    monkeypatch.setattr(Config, "BACKEND_URL", server.url)
+    monkeypatch.setattr(Config, "BILL_SAVE_MODE", "append")
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def portal():
+    server = PortalServer(bills=4).start()
+    yield server
+    server.stop()
+
+
+@pytest.mark.asyncio
+async def test_bill_service_saves_against_fake_backend(backend):
+    service = BillService()
+    try:
+        first = await service.save_bills(7, [{"content": "a"}], debt=False)
+        second = await service.save_bills(7, [{"content": "a"}, {"content": "b"}])
+    finally:
+        await close_shared_client()
+
+    assert first["new_bills_saved"] and second["new_bills_saved"]
+    assert [bill["content"] for bill in backend.scrapped_data[7]["bills_url"]] == [
+        "a",
+        "b",
+    ]
+    assert ("POST", "/scrapped-data") in backend.calls
+    assert ("POST", "/scrapped-data/1/bills") in backend.calls
+
+
+def test_portal_lists_forms_and_buttons(portal):
+    page = httpx.get(f"{portal.url}/facturas.html").text
+
+    assert page.count('<td class="factura">') == 2
+    assert page.count('class="boton-pdf"') == 2
+    assert "no registra deuda" in page
+
+
+def test_portal_serves_bill_pdfs_as_attachments(portal):
+    response = httpx.post(f"{portal.url}/descargar/3")
+
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.headers["content-disposition"].startswith("attachment")
+    assert response.content.startswith(b"%PDF")
+    assert httpx.get(f"{portal.url}/descargar/4").status_code == 404
+
+
+def test_firefox_config_logs_in_through_the_captcha(portal):
+    config = PortalServer.scraping_config(portal.url, "firefox")
+    page = httpx.get(f"{portal.url}/index.html").text
+
+    assert config["captcha"] and len(config["captcha_sequence"]) == 3
+    assert not any(action.get("login") for action in config["sequence"])
+    assert 'data-sitekey="fixture-sitekey"' in page
+    assert 'id="g-recaptcha-response"' in page
+    assert not PortalServer.scraping_config(portal.url).get("captcha")
+
+
+@pytest.mark.parametrize(
+    "browser",
+    [
+        pytest.param(
+            "chrome",
+            marks=pytest.mark.skipif(
+                not browser_installed("chromium"), reason="Chromium is not installed"
+            ),
+        ),
+        pytest.param(
+            "firefox",
+            marks=pytest.mark.skipif(
+                not browser_installed("firefox"), reason="Firefox is not installed"
+            ),
+        ),
+    ],
+)
+def test_scrape_jobs_run_end_to_end(monkeypatch, browser):
+    monkeypatch.setattr(Config, "BACKEND_URL", Config.BACKEND_URL)
+    monkeypatch.setattr(Config, "ENDPOINT_PROXY", Config.ENDPOINT_PROXY)
+    monkeypatch.setattr(Config, "CAPTCHA_SOLVER", Config.CAPTCHA_SOLVER)
+    monkeypatch.setattr(Config, "CPU_EXECUTOR_KIND", "thread")
+
+    summary = e2e_scrape.run(jobs=2, concurrency=2, bills=2, browser=browser)
+
+    assert summary["succeeded"] == 2, summary["errors"]
+    assert summary["bills_saved"] == 4
+    assert "stage:page_goto" in summary["stages"]
@@ -0,0 +1,91 @@
+import pytest
+
+from src.utils.element_snapshot import ElementSnapshot, snapshot_elements
+
+
+class FakeForm:
+    def __init__(self, form_id):
+        self.form_id = form_id
+
+    async def evaluate(self, script):
+        return self.form_id
+
+
+class FakeElement:
+    def __init__(self, href, text, form_id=None):
+        self.href = href
+        self.text = text
+        self.form = FakeForm(form_id) if form_id else None
+
+    async def get_attribute(self, name):
+        return self.href
+
+    async def text_content(self):
+        return self.text
+
+    async def query_selector(self, selector):
+        return self.form
+
+
+class FakePage:
+    """Page double answering the bulk evaluation from its elements."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.evaluations = 0
+
+    async def evaluate(self, script, elements):
+        self.evaluations += 1
+        if self.fail:
+            raise RuntimeError("Execution context was destroyed")
+        return [[e.href, e.text, e.form.form_id if e.form else None] for e in elements]
+
+
+ELEMENTS = [
+    FakeElement("/bill/1", "Factura 1"),
+    FakeElement(None, "Descargar", form_id="/pay-1,2"),
+]
+EXPECTED = [
+    ElementSnapshot("/bill/1", "Factura 1", None),
+    ElementSnapshot(None, "Descargar", "/pay-1,2"),
+]
+
+
+@pytest.mark.asyncio
+async def test_bulk_snapshot_uses_a_single_evaluation():
+    page = FakePage()
+
+    assert await snapshot_elements(page, ELEMENTS, bulk=True) == EXPECTED
+    assert page.evaluations == 1
+
+
+@pytest.mark.asyncio
+async def test_per_element_snapshot_matches_bulk():
+    page = FakePage()
+
+    assert await snapshot_elements(page, ELEMENTS, bulk=False) == EXPECTED
+    assert page.evaluations == 0
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_per_element_reads_when_bulk_fails():
+    page = FakePage(fail=True)
+
+    assert await snapshot_elements(page, ELEMENTS, bulk=True) == EXPECTED
+
+
+class DetachedElement(FakeElement):
+    async def query_selector(self, selector):
+        raise RuntimeError("Element is not attached to the DOM")
+
+
+@pytest.mark.asyncio
+async def test_unreadable_elements_get_an_empty_snapshot_in_place():
+    page = FakePage(fail=True)
+    elements = [ELEMENTS[0], DetachedElement("/bill/2", "Factura 2"), ELEMENTS[1]]
+
+    assert await snapshot_elements(page, elements, bulk=True) == [
+        EXPECTED[0],
+        ElementSnapshot(None, None, None),
+        EXPECTED[1],
+    ]
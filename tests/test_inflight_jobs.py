@@ -0,0 +1,81 @@
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from src import main
+from src.core.config import Config
+from src.services.inflight_jobs import InflightJobs, get_inflight_jobs_metrics, job_key
+
+DATA = {
+    "user_service": {"id": 7},
+    "service": {"id": 2, "scraping_config": {"url": "https://portal.test"}},
+}
+
+
+class BrokenRedis:
+    async def set(self, *args, **kwargs):
+        raise ConnectionError("Connection refused")
+
+
+class FakeTask:
+    def __init__(self):
+        self.submitted = []
+
+    def apply_async(self, args, task_id):
+        self.submitted.append((args, task_id))
+
+
+@pytest.fixture
+def jobs():
+    return InflightJobs(FakeAsyncRedis(decode_responses=True), lease=600)
+
+
+def test_job_key_includes_the_scraping_config(monkeypatch):
+    other = {**DATA, "service": {"id": 2, "scraping_config": {"url": "x"}}}
+
+    assert job_key(DATA) != job_key(other)
+    assert job_key({"service": DATA["service"]}) is None
+    monkeypatch.setattr(Config, "SCRAP_DEDUP_BY_CONFIG", False)
+    assert job_key(DATA) == job_key(other) == "scrap:inflight:7"
+
+
+@pytest.mark.asyncio
+async def test_duplicates_get_the_running_task_id(jobs):
+    key = job_key(DATA)
+
+    assert await jobs.claim(key, "task-1") is None
+    assert await jobs.claim(key, "task-2") == "task-1"
+    assert 0 < await jobs.client.ttl(key) <= 600
+
+
+@pytest.mark.asyncio
+async def test_only_the_owner_releases_the_key(jobs):
+    key = job_key(DATA)
+    await jobs.claim(key, "task-1")
+
+    await jobs.release(key, "task-2")
+    assert await jobs.claim(key, "task-3") == "task-1"
+
+    await jobs.release(key, "task-1")
+    assert await jobs.claim(key, "task-3") is None
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_let_submissions_through():
+    before = get_inflight_jobs_metrics()
+
+    assert await InflightJobs(BrokenRedis()).claim("key", "task-1") is None
+    assert get_inflight_jobs_metrics()["errors"] == before["errors"] + 1
+
+
+@pytest.mark.asyncio
+async def test_scrap_endpoint_collapses_duplicate_requests(jobs, monkeypatch):
+    task = FakeTask()
+    monkeypatch.setattr(main, "inflight_jobs", jobs)
+    monkeypatch.setattr(main, "scrap_task", task)
+
+    first = await main.scrap(DATA)
+    second = await main.scrap(DATA)
+
+    assert not first["duplicate"] and second["duplicate"]
+    assert second["task_id"] == first["task_id"]
+    assert task.submitted == [((DATA,), first["task_id"])]
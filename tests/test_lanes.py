@@ -0,0 +1,51 @@
+from types import SimpleNamespace
+
+from prometheus_client import REGISTRY
+
+from src.core.config import Config
+from src.workers import tasks
+from src.workers.lanes import lane_of_queue, worker_argv
+
+
+def queue_of(task) -> str:
+    return tasks.c_app.amqp.router.route({}, task.name)["queue"].name
+
+
+def test_tasks_are_routed_to_their_lane():
+    assert queue_of(tasks.scrap_task) == Config.QUEUE_INTERACTIVE
+    assert queue_of(tasks.scrap_all_user_service_by_service_task) == Config.QUEUE_BATCH
+    assert queue_of(tasks.extract_task) == Config.QUEUE_EXTRACTION
+
+
+def test_lane_workers_consume_only_their_queue(monkeypatch):
+    monkeypatch.setattr(Config, "WORKER_BATCH_CONCURRENCY", 3)
+
+    argv = worker_argv("batch", ["--without-gossip"])
+
+    assert f"--queues={Config.QUEUE_BATCH}" in argv
+    assert "--concurrency=3" in argv
+    assert argv[-1] == "--without-gossip"
+
+
+def test_queue_wait_is_observed_per_lane():
+    headers = {}
+    tasks.stamp_publish_time(headers=headers)
+    request = SimpleNamespace(
+        published_at=headers["published_at"] - 2,
+        delivery_info={"routing_key": Config.QUEUE_BATCH},
+    )
+    labels = {"lane": "batch", "task": "scrap_all_user_service_by_service_task"}
+    before = REGISTRY.get_sample_value("celery_queue_wait_seconds_count", labels) or 0
+
+    tasks.observe_queue_wait(
+        task=SimpleNamespace(
+            name=tasks.scrap_all_user_service_by_service_task.name, request=request
+        )
+    )
+
+    assert lane_of_queue(Config.QUEUE_BATCH) == "batch"
+    assert (
+        REGISTRY.get_sample_value("celery_queue_wait_seconds_count", labels)
+        == before + 1
+    )
+    assert REGISTRY.get_sample_value("celery_queue_wait_seconds_sum", labels) >= 2
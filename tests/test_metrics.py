@@ -0,0 +1,74 @@
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from src.core.cpu_executor import CpuExecutor
+from src.core.errors import ScrapingError
+from src.core.metrics import register_component_stats, time_stage
+from src.main import app
+from src.services.http_client import _endpoint_label
+from src.services.web_scrap_service import WebScrapService
+from src.utils.convert_data import parse_bill_text
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def test_metrics_route_serves_prometheus_text():
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "scrap_stage_seconds" in response.text
+    assert "backend_request_seconds" in response.text
+
+
+def test_time_stage_observes_with_job_labels():
+    labels = {"stage": "page_goto", "service_id": "7", "browser": "chrome"}
+    before = sample("scrap_stage_seconds_count", **labels)
+
+    with time_stage("page_goto", service_id=7, browser="chrome"):
+        pass
+
+    assert sample("scrap_stage_seconds_count", **labels) == before + 1
+
+
+@pytest.mark.asyncio
+async def test_cpu_tasks_are_timed_inside_the_worker():
+    executor = CpuExecutor(kind="thread", max_workers=1)
+    before = sample("cpu_task_seconds_count", task="parse_bill_text")
+
+    try:
+        await executor.run(parse_bill_text, "TOTAL A PAGAR $ 1.234,56")
+    finally:
+        executor.shutdown()
+
+    assert sample("cpu_task_seconds_count", task="parse_bill_text") == before + 1
+
+
+def test_backend_endpoint_label_collapses_ids():
+    assert (
+        _endpoint_label("http://backend/api/scrapped-data/user-service/42")
+        == "/api/scrapped-data/user-service/{id}"
+    )
+    assert _endpoint_label("http://backend/api/service") == "/api/service"
+
+
+def test_component_stats_are_exported_as_gauges():
+    register_component_stats("test_component", lambda: {"hits": 3, "name": "x"})
+
+    assert sample("scrap_component_stat", component="test_component", stat="hits") == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_search_counts_the_error_type():
+    labels = {"error_type": "KeyError", "service_id": "unknown", "browser": "unknown"}
+    before = sample("scrap_errors_total", **labels)
+    # Skip the retry and tracing wrappers
+    search = WebScrapService.search.__wrapped__.__wrapped__
+
+    with pytest.raises(ScrapingError):
+        await search(WebScrapService(), {})
+
+    assert sample("scrap_errors_total", **labels) == before + 1
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from src.services.page_waits import WaitCondition, settle, wait_for_signal
+
+DEFAULT = WaitCondition(kind="download", timeout=12000)
+
+
+class FakePage:
+    """Page double that fires a single event shortly after the action."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.main_frame = object()
+
+    async def wait_for_event(self, event, predicate=None, timeout=None):
+        await asyncio.sleep(self.delay)
+        return FakeDownload()
+
+    async def wait_for_load_state(self, state, timeout=None):
+        if timeout / 1000 < self.delay:
+            await asyncio.sleep(timeout / 1000)
+            raise PlaywrightTimeoutError(f"Timeout {timeout}ms exceeded.")
+        await asyncio.sleep(self.delay)
+
+
+class FakeDownload:
+    async def path(self):
+        return "/tmp/bill.pdf"
+
+
+def test_from_action_without_wait_key_uses_default():
+    assert WaitCondition.from_action({"element_type": "button"}, DEFAULT) is DEFAULT
+
+
+def test_from_action_accepts_signal_name_and_dict():
+    assert WaitCondition.from_action({"wait": "networkidle"}, DEFAULT) == (
+        WaitCondition(kind="networkidle", timeout=12000)
+    )
+    assert WaitCondition.from_action(
+        {"wait": {"for": "response", "url": "facturas", "timeout": 500}}, DEFAULT
+    ) == WaitCondition(kind="response", timeout=500, url="facturas")
+
+
+def test_timeouts_are_never_zero():
+    assert WaitCondition().timeout > 0
+    assert (
+        WaitCondition.from_action(
+            {"wait": "networkidle"}, WaitCondition(timeout=0)
+        ).timeout
+        == WaitCondition().timeout
+    )
+    assert WaitCondition.from_action(
+        {"wait": {"for": "load", "timeout": -1}}, DEFAULT
+    ) == WaitCondition(kind="load", timeout=WaitCondition().timeout)
+
+
+@pytest.mark.asyncio
+async def test_wait_for_signal_returns_as_soon_as_signal_arrives():
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    async with wait_for_signal(FakePage(delay=0.01), DEFAULT):
+        pass
+
+    assert loop.time() - start < 1
+
+
+@pytest.mark.asyncio
+async def test_settle_gives_up_after_timeout():
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await settle(FakePage(delay=5), WaitCondition(kind="networkidle", timeout=50))
+
+    assert loop.time() - start < 1
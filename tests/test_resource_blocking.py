@@ -0,0 +1,123 @@
+import pytest
+
+from src.services.resource_blocking import (
+    ResourceProfile,
+    ResourceStats,
+    apply_resource_profile,
+)
+
+
+class FakeRequest:
+    def __init__(self, resource_type, url):
+        self.resource_type = resource_type
+        self.url = url
+
+
+class FakeRoute:
+    def __init__(self, resource_type, url):
+        self.request = FakeRequest(resource_type, url)
+        self.outcome = None
+
+    async def abort(self, error_code=None):
+        self.outcome = "block"
+
+    async def fulfill(self, **kwargs):
+        self.outcome = "stub"
+
+    async def continue_(self):
+        self.outcome = "continue"
+
+
+class FakeResponse:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+class FakeContext:
+    def __init__(self):
+        self.handler = None
+        self.listeners = {}
+
+    async def route(self, url, handler):
+        self.handler = handler
+
+    def on(self, event, listener):
+        self.listeners[event] = listener
+
+
+def test_lean_profile_keeps_what_the_sequence_needs():
+    profile = ResourceProfile.from_config("lean")
+
+    assert profile.decide("document", "https://portal.test/") == "continue"
+    assert profile.decide("script", "https://portal.test/app.js") == "continue"
+    assert profile.decide("image", "https://portal.test/logo.png") == "block"
+    assert profile.decide("font", "https://portal.test/f.woff2") == "block"
+    assert (
+        profile.decide("script", "https://www.googletagmanager.com/gtm.js") == "block"
+    )
+    # Bills are never blocked, whatever the resource type reported
+    assert profile.decide("other", "https://portal.test/bill.pdf?id=3") == "continue"
+
+
+def test_custom_profile_extends_base_and_cannot_block_documents():
+    profile = ResourceProfile.from_config(
+        {
+            "base": "lean",
+            "block_types": ["stylesheet", "document"],
+            "block_urls": [r"chat\.widget"],
+            "allow_urls": [r"cdn\.portal\.test/captcha"],
+        }
+    )
+
+    assert profile.decide("stylesheet", "https://portal.test/a.css") == "block"
+    assert profile.decide("document", "https://portal.test/") == "continue"
+    assert profile.decide("script", "https://chat.widget/loader.js") == "block"
+    assert profile.decide("image", "https://cdn.portal.test/captcha.png") == "continue"
+
+
+def test_missing_or_unknown_profile_blocks_nothing():
+    assert not ResourceProfile.from_config(None).blocks_anything
+    assert not ResourceProfile.from_config("does-not-exist").blocks_anything
+
+
+@pytest.mark.asyncio
+async def test_routed_requests_update_job_stats():
+    context = FakeContext()
+    stats = ResourceStats()
+    await apply_resource_profile(context, ResourceProfile.from_config("strict"), stats)
+
+    routes = [
+        FakeRoute("document", "https://portal.test/"),
+        FakeRoute("image", "https://portal.test/banner.jpg"),
+        FakeRoute("stylesheet", "https://portal.test/site.css"),
+    ]
+    for route in routes:
+        await context.handler(route)
+
+    assert [route.outcome for route in routes] == ["continue", "block", "stub"]
+    assert stats.profile == "strict"
+    assert (stats.requests, stats.blocked, stats.stubbed) == (3, 1, 1)
+    assert stats.blocked_by_type == {"image": 1, "stylesheet": 1}
+    assert stats.bytes_saved_estimate > 0
+
+
+@pytest.mark.asyncio
+async def test_no_route_is_installed_without_profile():
+    context = FakeContext()
+    await apply_resource_profile(
+        context, ResourceProfile.from_config(None), ResourceStats()
+    )
+
+    assert context.handler is None
+
+
+@pytest.mark.asyncio
+async def test_received_bytes_are_measured_with_any_profile():
+    context = FakeContext()
+    stats = ResourceStats()
+    await apply_resource_profile(context, ResourceProfile.from_config(None), stats)
+
+    for headers in ({"content-length": "1200"}, {}, {"content-length": "300"}):
+        context.listeners["response"](FakeResponse(headers))
+
+    assert stats.bytes_received == 1500
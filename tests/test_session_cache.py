@@ -0,0 +1,93 @@
+import pytest
+
+from src.services.session_cache import SessionCache, get_session_cache_metrics
+
+STATE = {"cookies": [{"name": "sid", "value": "abc"}], "origins": []}
+
+
+class MemoryRedis:
+    """Minimal in-memory stand-in for the async Redis commands used."""
+
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+        self.expiry[key] = ex
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+class BrokenRedis:
+    async def get(self, key):
+        raise ConnectionError("Connection refused")
+
+    async def set(self, key, value, ex=None):
+        raise ConnectionError("Connection refused")
+
+
+@pytest.mark.asyncio
+async def test_store_and_load_round_trip_with_ttl():
+    client = MemoryRedis()
+    cache = SessionCache(client, ttl=600)
+
+    await cache.store("service-1", "0012345", STATE)
+
+    assert await cache.load("service-1", "0012345") == STATE
+    assert await cache.load("service-2", "0012345") is None
+    key = SessionCache.key("service-1", "0012345")
+    assert client.expiry[key] == 600
+    assert "0012345" not in key
+
+
+@pytest.mark.asyncio
+async def test_invalidate_drops_the_session():
+    cache = SessionCache(MemoryRedis(), ttl=600)
+    await cache.store("service-1", "0012345", STATE)
+
+    await cache.invalidate("service-1", "0012345")
+
+    assert await cache.load("service-1", "0012345") is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("raw", ['{"cookies": [{"name"', '"foreign"', b"\x80\x81"])
+async def test_undecodable_states_are_dropped_as_misses(raw):
+    before = get_session_cache_metrics()
+    client = MemoryRedis()
+    cache = SessionCache(client, ttl=600)
+    client.data[SessionCache.key("service-1", "0012345")] = raw
+
+    assert await cache.load("service-1", "0012345") is None
+
+    assert client.data == {}
+    assert get_session_cache_metrics()["misses"] == before["misses"] + 1
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_count_as_misses():
+    before = get_session_cache_metrics()
+    cache = SessionCache(BrokenRedis(), ttl=600)
+
+    await cache.store("service-1", "0012345", STATE)
+    assert await cache.load("service-1", "0012345") is None
+
+    after = get_session_cache_metrics()
+    assert after["errors"] == before["errors"] + 2
+    assert after["misses"] == before["misses"] + 1
+
+
+def test_hits_on_captcha_services_count_avoided_captchas():
+    before = get_session_cache_metrics()
+
+    SessionCache.record_hit(captcha=True)
+    SessionCache.record_hit(captcha=False)
+
+    after = get_session_cache_metrics()
+    assert after["hits"] == before["hits"] + 2
+    assert after["captchas_avoided"] == before["captchas_avoided"] + 1
@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from src.core.config import Config
+from src.services.site_limiter import PRIORITY_BATCH, PRIORITY_INTERACTIVE, SiteLimiter
+
+HOST = "portal.test"
+
+
+@pytest.fixture
+def limiter():
+    limiter = SiteLimiter(FakeAsyncRedis(decode_responses=True))
+    limiter.poll_interval = 0.01
+    return limiter
+
+
+@pytest.mark.asyncio
+async def test_slots_cap_concurrent_jobs(limiter):
+    running = 0
+    peak = 0
+
+    async def job():
+        nonlocal running, peak
+        async with limiter.slot(HOST, limit=2):
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+
+    await asyncio.gather(*(job() for _ in range(6)))
+
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_interactive_waiters_are_served_before_batch(limiter):
+    order = []
+    release = asyncio.Event()
+
+    async def holder():
+        async with limiter.slot(HOST, limit=1):
+            await release.wait()
+
+    async def waiter(name, priority):
+        async with limiter.slot(HOST, limit=1, priority=priority):
+            order.append(name)
+
+    hold = asyncio.create_task(holder())
+    await asyncio.sleep(0.02)
+    waiters = [asyncio.create_task(waiter("batch-1", PRIORITY_BATCH))]
+    await asyncio.sleep(0.02)
+    waiters.append(asyncio.create_task(waiter("batch-2", PRIORITY_BATCH)))
+    await asyncio.sleep(0.02)
+    waiters.append(asyncio.create_task(waiter("interactive", PRIORITY_INTERACTIVE)))
+    await asyncio.sleep(0.02)
+
+    release.set()
+    await asyncio.gather(hold, *waiters)
+
+    assert order == ["interactive", "batch-1", "batch-2"]
+
+
+@pytest.mark.asyncio
+async def test_held_slots_outlive_their_ttl(limiter, monkeypatch):
+    monkeypatch.setattr(Config, "SITE_SLOT_TTL", 0.15)
+    events = []
+
+    async def job(name, hold):
+        async with limiter.slot(HOST, limit=1):
+            events.append(f"{name} start")
+            await asyncio.sleep(hold)
+            events.append(f"{name} end")
+
+    first = asyncio.ensure_future(job("first", 0.5))
+    await asyncio.sleep(0.02)
+    await job("second", 0)
+    await first
+
+    assert events == ["first start", "first end", "second start", "second end"]
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_spaces_out_requests(limiter):
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    # Burst of 2, then one token every 50ms
+    for _ in range(4):
+        await limiter.throttle(HOST, rate=20, burst=2)
+
+    assert loop.time() - start >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_limiter_fails_open_without_redis():
+    class DownRedis:
+        async def eval(self, *args):
+            raise ConnectionError("Connection refused")
+
+        async def zrem(self, *args):
+            raise ConnectionError("Connection refused")
+
+    limiter = SiteLimiter(DownRedis())
+
+    async with limiter.slot(HOST, limit=1):
+        await limiter.throttle(HOST, rate=1, burst=1)
@@ -0,0 +1,106 @@
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from benchmarks.fixture_servers import FakeBackend
+from src.core.config import Config
+from src.services.http_client import MainServiceClient, close_shared_client
+from src.services.snapshot_cache import SnapshotCache, get_snapshot_cache_metrics
+
+
+class Loader:
+    def __init__(self, value=None):
+        self.calls = 0
+        self.value = value or {"id": 3, "bills_url": []}
+
+    async def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+class BrokenRedis:
+    async def get(self, key):
+        raise ConnectionError("Connection refused")
+
+
+@pytest.fixture
+def redis_client():
+    return FakeAsyncRedis(decode_responses=True)
+
+
+@pytest.mark.asyncio
+async def test_snapshots_are_shared_between_workers(redis_client):
+    loader = Loader()
+
+    first = await SnapshotCache(redis_client, ttl=60).get_or_load("a", loader)
+    second = await SnapshotCache(redis_client, ttl=60).get_or_load("a", loader)
+
+    assert first == second == loader.value
+    assert loader.calls == 1
+    assert 0 < await redis_client.ttl(SnapshotCache.key("a")) <= 60
+
+
+@pytest.mark.asyncio
+async def test_writes_make_stamped_snapshots_stale(redis_client):
+    cache = SnapshotCache(redis_client, ttl=60)
+    loader = Loader()
+    before = get_snapshot_cache_metrics()
+
+    await cache.get_or_load("a", loader, tags=["user-service:5"])
+    await cache.invalidate("unrelated")
+    await cache.get_or_load("a", loader, tags=["user-service:5"])
+    await cache.invalidate("user-service:5")
+    await cache.get_or_load("a", loader, tags=["user-service:5"])
+    await cache.get_or_load("a", loader, tags=["user-service:5"])
+
+    assert loader.calls == 2
+    assert get_snapshot_cache_metrics()["stale"] == before["stale"] + 1
+    assert await redis_client.ttl(SnapshotCache.version_key("user-service:5")) > 60
+
+
+@pytest.mark.asyncio
+async def test_derived_tags_are_stamped(redis_client):
+    cache = SnapshotCache(redis_client, ttl=60)
+    loader = Loader()
+
+    def tags_of(value):
+        return [f"scrapped-data:{value['id']}"]
+
+    await cache.get_or_load("a", loader, tags_of=tags_of)
+    await cache.invalidate("scrapped-data:3")
+    await cache.get_or_load("a", loader, tags_of=tags_of)
+
+    assert loader.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fall_back_to_the_backend():
+    loader = Loader()
+    before = get_snapshot_cache_metrics()
+
+    value = await SnapshotCache(BrokenRedis(), ttl=60).get_or_load("a", loader)
+
+    assert value == loader.value
+    assert get_snapshot_cache_metrics()["errors"] == before["errors"] + 1
+
+
+@pytest.mark.asyncio
+async def test_clients_share_reads_until_one_writes(redis_client, monkeypatch):
+    backend = FakeBackend().start()
+    monkeypatch.setattr(Config, "BACKEND_URL", backend.url)
+    monkeypatch.setattr(Config, "BACKEND_SNAPSHOT_CACHE_ENABLED", True)
+    backend.scrapped_data[5] = {"id": 1, "user_service_id": 5, "bills_url": []}
+    workers = [MainServiceClient(), MainServiceClient()]
+    for worker in workers:
+        worker.snapshot_cache = SnapshotCache(redis_client, ttl=60)
+
+    try:
+        await workers[0].get_scrapped_data(5)
+        await workers[1].get_scrapped_data(5)
+        await workers[0].update_scrapped_data(1, consumption_data={"kwh": 10})
+        data = await workers[1].get_scrapped_data(5)
+    finally:
+        await close_shared_client()
+        backend.stop()
+
+    assert backend.calls.count(("GET", "/scrapped-data/user-service/5")) == 2
+    assert data["consumption_data"] == {"kwh": 10}
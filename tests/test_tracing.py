@@ -0,0 +1,149 @@
+import asyncio
+import json
+
+import pytest
+
+from src.core import tracing
+from src.core.tracing import (
+    SpanContext,
+    SpanExporter,
+    attach,
+    current_traceparent,
+    detach,
+    span,
+    to_otlp,
+    traced,
+)
+
+
+class RecordingExporter(SpanExporter):
+    def __init__(self):
+        super().__init__("memory")
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+
+@pytest.fixture
+def exporter(monkeypatch):
+    recorder = RecordingExporter()
+    tracing.set_exporter(recorder)
+    monkeypatch.setattr(tracing.Config, "TRACE_SAMPLE_RATE", 1.0)
+    yield recorder
+    tracing.set_exporter(None)
+
+
+def test_traceparent_round_trip():
+    context = SpanContext("a" * 32, "b" * 16, True)
+
+    assert context.traceparent == f"00-{'a' * 32}-{'b' * 16}-01"
+    assert SpanContext.from_traceparent(context.traceparent) == context
+    assert SpanContext.from_traceparent("garbage") is None
+    assert SpanContext.from_traceparent(None) is None
+
+
+def test_nested_spans_share_the_trace(exporter):
+    with span("outer") as outer:
+        with span("inner", step=1) as inner:
+            assert current_traceparent() == inner.context.traceparent
+
+    assert current_traceparent() is None
+    assert [s.name for s in exporter.spans] == ["inner", "outer"]
+    assert inner.context.trace_id == outer.context.trace_id
+    assert inner.parent_id == outer.context.span_id
+    assert inner.attributes == {"step": 1}
+
+
+def test_errors_are_recorded_on_the_span(exporter):
+    with pytest.raises(ValueError):
+        with span("failing"):
+            raise ValueError("boom")
+
+    assert exporter.spans[0].error == "ValueError: boom"
+
+
+def test_remote_parent_is_continued(exporter):
+    token = attach(f"00-{'c' * 32}-{'d' * 16}-01")
+    try:
+        with span("celery.task") as task_span:
+            pass
+    finally:
+        detach(token)
+
+    assert task_span.context.trace_id == "c" * 32
+    assert task_span.parent_id == "d" * 16
+
+
+def test_unsampled_trace_is_not_exported(exporter):
+    token = attach(f"00-{'c' * 32}-{'d' * 16}-00")
+    try:
+        with span("skipped"):
+            assert current_traceparent().endswith("-00")
+    finally:
+        detach(token)
+
+    assert exporter.spans == []
+
+
+def test_sampling_is_off_without_an_exporter(monkeypatch):
+    tracing.set_exporter(SpanExporter("none"))
+    monkeypatch.setattr(tracing.Config, "TRACE_SAMPLE_RATE", 1.0)
+    try:
+        with span("root") as root:
+            pass
+    finally:
+        tracing.set_exporter(None)
+
+    assert not root.context.sampled
+
+
+@pytest.mark.asyncio
+async def test_concurrent_tasks_keep_their_own_parent(exporter):
+    @traced("child")
+    async def child():
+        await asyncio.sleep(0)
+        return current_traceparent()
+
+    async def job(name):
+        with span(name) as root:
+            await child()
+        return root
+
+    first, second = await asyncio.gather(job("first"), job("second"))
+
+    children = [s for s in exporter.spans if s.name == "child"]
+    assert {c.parent_id for c in children} == {
+        first.context.span_id,
+        second.context.span_id,
+    }
+
+
+def test_jsonl_exporter_writes_spans(tmp_path, monkeypatch):
+    path = tmp_path / "traces.jsonl"
+    exporter = SpanExporter("jsonl", path=str(path), interval=0.05)
+    tracing.set_exporter(exporter)
+    monkeypatch.setattr(tracing.Config, "TRACE_SAMPLE_RATE", 1.0)
+    try:
+        with span("written", service_id=3):
+            pass
+        exporter.flush()
+    finally:
+        tracing.set_exporter(None)
+
+    record = json.loads(path.read_text().splitlines()[0])
+    assert record["name"] == "written"
+    assert record["attributes"] == {"service_id": 3}
+    assert len(record["trace_id"]) == 32
+
+
+def test_otlp_encoding(exporter):
+    with span("encoded", retries=2):
+        pass
+
+    payload = to_otlp(exporter.spans)
+    encoded = payload["resourceSpans"][0]["scopeSpans"][0]["spans"][0]
+    assert encoded["name"] == "encoded"
+    assert encoded["parentSpanId"] == ""
+    assert encoded["attributes"] == [{"key": "retries", "value": {"intValue": "2"}}]
+    assert encoded["status"] == {"code": 1}
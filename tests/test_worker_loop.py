@@ -0,0 +1,74 @@
+import asyncio
+from contextvars import ContextVar
+
+import pytest
+
+from src.services.http_client import close_shared_client, get_shared_client
+from src.workers.worker_loop import WorkerLoop
+
+request_id: ContextVar[str] = ContextVar("request_id", default="")
+
+
+@pytest.fixture
+def worker_loop():
+    loop = WorkerLoop([close_shared_client])
+    yield loop
+    loop.stop()
+
+
+def test_tasks_share_the_loop_and_its_resources(worker_loop):
+    async def resources():
+        return asyncio.get_running_loop(), get_shared_client()
+
+    first = worker_loop.run(resources())
+    second = worker_loop.run(resources())
+
+    assert first == second
+    assert not first[1].is_closed
+
+
+def test_coroutines_see_the_callers_context(worker_loop):
+    async def read():
+        return request_id.get()
+
+    token = request_id.set("task-1")
+    try:
+        assert worker_loop.run(read()) == "task-1"
+    finally:
+        request_id.reset(token)
+
+
+def test_errors_reach_the_caller(worker_loop):
+    async def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        worker_loop.run(fail())
+    assert worker_loop.run(asyncio.sleep(0, result="ok")) == "ok"
+
+
+def test_stop_closes_resources_and_pending_tasks(worker_loop):
+    closed = []
+
+    async def closer():
+        closed.append("resource")
+
+    async def leave_background_task():
+        return get_shared_client(), asyncio.ensure_future(asyncio.sleep(60))
+
+    worker_loop.register_closer(closer)
+    client, background = worker_loop.run(leave_background_task())
+    worker_loop.stop()
+
+    assert client.is_closed
+    assert closed == ["resource"]
+    assert background.cancelled()
+    assert not worker_loop.running
+
+
+def test_loop_restarts_after_stop(worker_loop):
+    first = worker_loop.run(asyncio.sleep(0, result=1))
+    worker_loop.stop()
+
+    assert worker_loop.run(asyncio.sleep(0, result=2)) == 2
+    assert first == 1 and worker_loop.running